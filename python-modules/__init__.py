@@ -8,8 +8,18 @@ and advanced Google Workspace API integration.
 
 Modules:
 - scuba_compliance: CISA SCuBA baseline compliance checking
+- check_logic: Rule engine compiling baseline check_logic into predicates
 - gws_api: Enhanced Google Workspace API integration
 - compliance_dashboard: Advanced compliance reporting and visualization
+- report_exporter: Streaming multi-format compliance report export
+- gam_output: Streaming parser for GAM CSV/JSON output
+- gam_runner: Bounded, deadline-aware GAM command execution
+- rate_limit: Token bucket shared by Google API calls and GAM commands
+- instrumentation: Timing spans, Chrome traces and --profile support
+- activity_ingest: Incremental, batched ingestion of activity reports
+- account_sync: Bulk suspended-account discovery and lifecycle stage sync
+- bulk_verify: Parallel, resumable verification of account lists
+- bridge_daemon: Persistent worker process for the bash-to-Python bridge
 - config_manager: Python-based configuration validation and management
 """
 
@@ -17,13 +27,30 @@ __version__ = "3.0.0-hybrid"
 __author__ = "GWOMBAT Development Team"
 __email__ = "gwombat@your-domain.edu"
 
-# Package-level imports for convenience
-from .scuba_compliance import ScubaCompliance
-from .gws_api import GoogleWorkspaceAPI
-from .compliance_dashboard import ComplianceDashboard
+import importlib
+
+# Package-level names for convenience, imported on first access (PEP 562) so
+# that running one module via the bash bridge doesn't import the others
+_LAZY_ATTRIBUTES = {
+    'ScubaCompliance': 'scuba_compliance',
+    'GoogleWorkspaceAPI': 'gws_api',
+    'ComplianceDashboard': 'compliance_dashboard'
+}
 
 __all__ = [
     'ScubaCompliance',
     'GoogleWorkspaceAPI', 
     'ComplianceDashboard'
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
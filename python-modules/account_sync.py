@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Account Stage Sync for GWOMBAT
+Bulk discovery of suspended accounts and their lifecycle stages
+
+scan_suspended_accounts in database_functions.sh used to read GAM's suspended
+user listing line by line and call db_add_account for every account, one or
+more sqlite3 processes each. This module parses the listing once, classifies
+each account's OU path into a lifecycle stage, compares the result with the
+accounts table and writes only the accounts that changed, in one transaction.
+
+    python3 python-modules/account_sync.py suspended --db-path ./local-config/gwombat.db
+    python3 python-modules/account_sync.py suspended --dry-run --output json
+    python3 python-modules/account_sync.py suspended --input suspended_users.csv
+
+Accounts whose stage changed are updated in place (keeping their id, list
+memberships and verification history) and the move is recorded in
+stage_history.
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import subprocess
+from datetime import datetime
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from tempfile import TemporaryFile
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
+
+try:
+    from .gam_output import iter_users, UserRecord
+    from .instrumentation import Tracer, add_cli_arguments, cli_instrumentation
+except ImportError:
+    from gam_output import iter_users, UserRecord
+    from instrumentation import Tracer, add_cli_arguments, cli_instrumentation
+
+logger = logging.getLogger(__name__)
+
+SUSPENDED_USERS_COMMAND = ["print", "users", "query", "isSuspended=true",
+                           "fields", "primaryemail,familyname,givenname,orgunitpath"]
+
+# OU path substrings, checked in order, and the stage and summary group they mean
+OU_STAGES = (
+    ("Pending Deletion", "pending_deletion", "pending_deletion"),
+    ("Temporary Hold", "temporary_hold", "temporary_hold"),
+    ("Exit Row", "exit_row", "exit_row"),
+    ("Suspended", "recently_suspended", "recently_suspended")
+)
+
+# Suspended accounts outside the lifecycle OUs are most likely recent
+# suspensions that have not been moved yet
+DEFAULT_STAGE = ("recently_suspended", "other_suspended")
+
+# Summary groups: (heading, ANSI color, sample size)
+GROUPS = {
+    "recently_suspended": ("Recently Suspended", "\033[0;32m", 5),
+    "pending_deletion": ("Pending Deletion", "\033[1;33m", 5),
+    "temporary_hold": ("Temporary Hold", "\033[0;35m", 5),
+    "exit_row": ("Exit Row", "\033[0;31m", 5),
+    "other_suspended": ("Other Suspended Locations", "\033[0;36m", 3)
+}
+
+BLUE = "\033[0;34m"
+CYAN = "\033[0;36m"
+NC = "\033[0m"
+
+class AccountSyncError(RuntimeError):
+    """Raised when the suspended user listing cannot be retrieved"""
+
+@dataclass
+class SyncStats:
+    """Counts for one stage sync"""
+    listed: int = 0
+    inserted: int = 0
+    moved: int = 0
+    updated: int = 0  # Same stage, new display name or OU path
+    unchanged: int = 0
+    skipped: int = 0  # Rows without an email address
+    dry_run: bool = False
+    seconds: float = 0.0
+    groups: Dict[str, List[str]] = field(default_factory=dict)
+
+    def group_counts(self) -> Dict[str, int]:
+        return {group: len(emails) for group, emails in self.groups.items()}
+
+def classify_ou(ou_path: Optional[str]) -> Tuple[str, str]:
+    """
+    Lifecycle stage for an OU path
+
+    Returns:
+        Tuple of (stage, summary group)
+    """
+    ou_path = ou_path or ""
+    for needle, stage, group in OU_STAGES:
+        if needle in ou_path:
+            return stage, group
+    return DEFAULT_STAGE
+
+def iter_gam_users(gam_path: str, arguments: List[str]) -> Iterator[UserRecord]:
+    """
+    Stream "gam print users" records as GAM prints them
+
+    Raises:
+        AccountSyncError: If GAM cannot be run or exits with an error
+    """
+    with TemporaryFile() as error_file:
+        try:
+            process = subprocess.Popen([gam_path] + arguments, stdout=subprocess.PIPE, stderr=error_file,
+                                       universal_newlines=True, encoding="utf-8", errors="replace")
+        except OSError as e:
+            raise AccountSyncError(f"Cannot run GAM ({gam_path}): {e}")
+
+        try:
+            yield from iter_users(process.stdout)
+        finally:
+            process.stdout.close()
+            exit_code = process.wait()
+
+        if exit_code != 0:
+            error_file.seek(0)
+            message = error_file.read().decode("utf-8", errors="replace").strip().splitlines()
+            raise AccountSyncError(f"gam print users exited with {exit_code}"
+                                   + (f": {message[-1]}" if message else ""))
+
+class AccountStageSync:
+    """
+    Synchronizes the accounts table with GAM's view of suspended accounts
+
+    Usage:
+        sync = AccountStageSync(db_path, session_id)
+        stats = sync.sync(iter_gam_users(gam, SUSPENDED_USERS_COMMAND))
+    """
+
+    def __init__(self, db_path: str, session_id: str, tracer: Optional[Tracer] = None):
+        """
+        Initialize stage sync
+
+        Args:
+            db_path: GWOMBAT database with the account lifecycle schema
+            session_id: Session recorded with stage changes
+            tracer: Span collector for timing data (one is created if omitted)
+        """
+        self.db_path = Path(db_path)
+        self.session_id = session_id
+        self.tracer = tracer or Tracer("account_sync")
+
+    def _load_accounts(self, conn: sqlite3.Connection) -> Dict[str, Tuple[int, str, str, str]]:
+        """Current accounts by email: (id, current_stage, display_name, ou_path)"""
+        with self.tracer.span("load_accounts", "db"):
+            return {email: (account_id, stage, display_name or "", ou_path or "")
+                    for account_id, email, stage, display_name, ou_path in conn.execute(
+                        "SELECT id, email, current_stage, display_name, ou_path FROM accounts")}
+
+    def sync(self, users: Iterable[UserRecord], dry_run: bool = False) -> SyncStats:
+        """
+        Classify suspended users and apply the stage changes
+
+        The listing is read completely before anything is written, so a GAM
+        failure part way leaves the database untouched.
+
+        Args:
+            users: Suspended users from "gam print users"
+            dry_run: Compute the changes without writing them
+        """
+        stats = SyncStats(dry_run=dry_run, groups={group: [] for group in GROUPS})
+        started = time.perf_counter()
+
+        listed = {}
+        with self.tracer.span("classify", "parse"):
+            for user in users:
+                stats.listed += 1
+                if not user.primary_email:
+                    stats.skipped += 1
+                    continue
+                stage, group = classify_ou(user.org_unit_path)
+                stats.groups[group].append(user.primary_email)
+                listed[user.primary_email] = (stage, user.display_name, user.org_unit_path or "")
+
+        if dry_run and not self.db_path.exists():
+            stats.inserted = len(listed)
+            stats.seconds = round(time.perf_counter() - started, 3)
+            return stats
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            existing = self._load_accounts(conn)
+            inserts, moves, updates = [], [], []
+            for email, (stage, display_name, ou_path) in listed.items():
+                current = existing.get(email)
+                if current is None:
+                    inserts.append((email, stage, display_name, ou_path))
+                elif current[1] != stage:
+                    moves.append((current[0], current[1], stage, display_name, ou_path))
+                elif (current[2], current[3]) != (display_name, ou_path):
+                    updates.append((display_name, ou_path, current[0]))
+                else:
+                    stats.unchanged += 1
+
+            stats.inserted, stats.moved, stats.updated = len(inserts), len(moves), len(updates)
+            if not dry_run and (inserts or moves or updates):
+                with self.tracer.span("apply_changes", "db", inserted=len(inserts), moved=len(moves),
+                                      updated=len(updates)):
+                    with conn:
+                        self._apply(conn, inserts, moves, updates)
+        finally:
+            conn.close()
+            stats.seconds = round(time.perf_counter() - started, 3)
+        return stats
+
+    def _apply(self, conn: sqlite3.Connection, inserts: List[Tuple], moves: List[Tuple],
+               updates: List[Tuple]) -> None:
+        conn.executemany("""
+            INSERT INTO accounts (email, current_stage, display_name, ou_path, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, inserts)
+        conn.executemany("""
+            UPDATE accounts SET current_stage = ?, display_name = ?, ou_path = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, [(stage, display_name, ou_path, account_id)
+              for account_id, _, stage, display_name, ou_path in moves])
+        conn.executemany("""
+            INSERT INTO stage_history (account_id, from_stage, to_stage, operation_details, session_id)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(account_id, from_stage, stage, f"Suspended account scan: OU {ou_path}", self.session_id)
+              for account_id, from_stage, stage, _, ou_path in moves])
+        conn.executemany("""
+            UPDATE accounts SET display_name = ?, ou_path = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, updates)
+
+def print_summary(stats: SyncStats) -> None:
+    """Discovery results in the layout scan_suspended_accounts has always shown"""
+    print(f"{BLUE}=== Account Discovery Results ==={NC}")
+    print()
+    for group, (heading, color, sample) in GROUPS.items():
+        emails = stats.groups.get(group) or []
+        if not emails:
+            continue
+        print(f"{color}{heading} ({len(emails)} accounts):{NC}")
+        for email in emails[:sample]:
+            print(f"  {email}")
+        if len(emails) > sample:
+            print(f"{CYAN}  ... and {len(emails) - sample} more{NC}")
+        print()
+
+    total = sum(stats.group_counts().values())
+    print(f"{BLUE}Total suspended accounts found: {total}{NC}")
+    action = "Would insert" if stats.dry_run else "Inserted"
+    print(f"  {action}: {stats.inserted}  Moved: {stats.moved}  Updated: {stats.updated}  "
+          f"Unchanged: {stats.unchanged}")
+
+def main():
+    """Command-line interface for database_functions.sh"""
+    parser = argparse.ArgumentParser(description="Bulk sync suspended accounts and their lifecycle stages")
+    parser.add_argument("action", choices=["suspended"], help="Accounts to sync")
+    parser.add_argument("--db-path", default="./local-config/gwombat.db", help="Path to GWOMBAT database")
+    parser.add_argument("--session-id", default=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_account_sync",
+                        help="Session recorded with stage changes")
+    parser.add_argument("--gam-path", default="gam", help="Path to GAM executable")
+    parser.add_argument("--input", help="Saved 'gam print users' CSV to read instead of running GAM (- for stdin)")
+    parser.add_argument("--dry-run", action="store_true", help="Report the changes without writing them")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    add_cli_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    tracer = Tracer("account_sync")
+    stage_sync = AccountStageSync(args.db_path, args.session_id, tracer=tracer)
+
+    with cli_instrumentation(args, tracer):
+        input_file = None
+        if args.input:
+            input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+            users = iter_users(input_file)
+        else:
+            users = iter_gam_users(args.gam_path, SUSPENDED_USERS_COMMAND)
+
+        try:
+            stats = stage_sync.sync(users, dry_run=args.dry_run)
+        except (AccountSyncError, ValueError, OSError, sqlite3.Error) as e:
+            logger.error(f"Suspended account sync failed: {e}")
+            return 1
+        finally:
+            if input_file not in (None, sys.stdin):
+                input_file.close()
+
+    if args.output == "json":
+        result = asdict(stats)
+        result["groups"] = stats.group_counts()
+        print(json.dumps(result, indent=2))
+    elif stats.listed == 0:
+        print("\033[1;33mNo suspended users found\033[0m")
+    else:
+        print_summary(stats)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
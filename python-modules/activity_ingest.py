@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+"""
+Activity Ingestion for GWOMBAT
+Bulk loads login and admin activity reports into the security database
+
+security_reports.sh used to read "gam report" output in a bash loop, running
+sed/cut/tr and a sqlite3 process for every event. This module streams the
+report instead (from GAM, the Reports API, or a saved CSV), classifies events
+in batches with the same rules the bash loop used, and inserts them into
+login_activities / admin_activities / drive_activities / token_activities
+with one transaction per batch.
+
+Scans are incremental. Every event gets a stable event_id, unique in its
+table, and the newest ingested event time per application is kept in
+activity_ingest_state. The next scan fetches from that high-water mark (less
+a short overlap for events the Reports API publishes late) instead of the
+whole --days-back window, and events it has already stored are ignored.
+
+    python3 python-modules/activity_ingest.py login --days-back 7 --session-id "$SESSION_ID"
+    python3 python-modules/activity_ingest.py admin --source api --days-back 1
+    python3 python-modules/activity_ingest.py login --source csv --input logins.csv
+    python3 python-modules/activity_ingest.py drive --full
+
+By default the command prints the counts security_reports.sh displays,
+tab-separated: new, suspicious and failed logins for "login"; new actions and
+privilege changes for "admin"; new events for "drive" and "token".
+"""
+
+import re
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import logging
+import argparse
+import subprocess
+from datetime import datetime, timedelta
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from tempfile import TemporaryFile
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple, Callable, NamedTuple
+
+try:
+    from .gam_output import iter_records, lookup, parse_timestamp
+    from .instrumentation import Tracer, add_cli_arguments, cli_instrumentation
+except ImportError:
+    from gam_output import iter_records, lookup, parse_timestamp
+    from instrumentation import Tracer, add_cli_arguments, cli_instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Events inserted per transaction
+DEFAULT_BATCH_SIZE = 5000
+
+# Incremental scans re-fetch this much before the high-water mark, since the
+# Reports API can publish events some time after they happen
+DEFAULT_OVERLAP = timedelta(minutes=60)
+
+# Event ids looked up per query (below SQLite's bound parameter limit)
+LOOKUP_CHUNK = 500
+
+# Candidate schema locations, relative to this module
+SCHEMA_FILES = [
+    Path("..") / "shared-config" / "security_reports_schema.sql",
+    Path("..") / "security_reports_schema.sql"
+]
+
+# Private address ranges; logins from them score lower
+INTERNAL_IP = re.compile(r"^(10\.|192\.168\.|172\.(1[6-9]|2[0-9]|3[0-1])\.)")
+
+# Substrings of the event name, checked in order, for the admin activity type
+ADMIN_ACTIVITY_TYPES = (
+    (("CREATE_USER", "user_create"), "user_create"),
+    (("SUSPEND_USER", "user_suspend"), "user_suspend"),
+    (("DELETE_USER", "user_delete"), "user_delete"),
+    (("GRANT_ADMIN", "admin_grant"), "privilege_grant"),
+    (("REVOKE_ADMIN", "admin_revoke"), "privilege_revoke"),
+    (("SETTINGS", "settings"), "settings_change"),
+    (("GROUP", "group"), "group_management"),
+    (("OU", "org_unit"), "ou_management")
+)
+
+class ActivityIngestError(RuntimeError):
+    """Raised when an activity report cannot be retrieved"""
+
+@dataclass
+class ActivityReport:
+    """How one report application is read and stored"""
+    application: str  # Reports API application name
+    gam_report: str  # "gam report <name>"
+    table: str
+    # Report fields, with the GAM CSV columns / Reports API paths that hold them
+    aliases: Dict[str, Tuple[str, ...]]
+    # Field order of the columns the bash loop read positionally
+    positional: Tuple[str, ...]
+
+# Report-level fields every application has
+COMMON_ALIASES = {
+    "unique_qualifier": ("id.uniqueQualifier", "uniqueQualifier"),
+    "time": ("id.time", "time"),
+    "user_email": ("actor.email", "email", "user_email"),
+    "event_name": ("name", "events.0.name", "event_name"),
+    "ip_address": ("ipAddress", "ip_address")
+}
+
+REPORTS = {
+    "login": ActivityReport(
+        application="login",
+        gam_report="logins",
+        table="login_activities",
+        aliases=dict(COMMON_ALIASES,
+                     time=("id.time", "time", "login_time"),
+                     event_name=("name", "events.0.name", "event_type", "event_name"),
+                     user_agent=("user_agent", "userAgent")),
+        positional=("time", "user_email", "event_name", "ip_address", "user_agent")
+    ),
+    "admin": ActivityReport(
+        application="admin",
+        gam_report="admin",
+        table="admin_activities",
+        aliases=dict(COMMON_ALIASES,
+                     time=("id.time", "time", "activity_time"),
+                     user_email=("actor.email", "email", "admin_email"),
+                     target_user=("USER_EMAIL", "target_user")),
+        positional=("time", "user_email", "event_name", "target_user", "ip_address")
+    ),
+    "drive": ActivityReport(
+        application="drive",
+        gam_report="drive",
+        table="drive_activities",
+        aliases=dict(COMMON_ALIASES,
+                     doc_id=("doc_id",),
+                     doc_title=("doc_title",),
+                     visibility=("visibility",)),
+        positional=("time", "user_email", "event_name", "doc_id", "doc_title", "visibility", "ip_address")
+    ),
+    "token": ActivityReport(
+        application="token",
+        gam_report="token",
+        table="token_activities",
+        aliases=dict(COMMON_ALIASES,
+                     app_name=("app_name",),
+                     client_id=("client_id",),
+                     scopes=("scope",)),
+        positional=("time", "user_email", "event_name", "app_name", "client_id", "scopes", "ip_address")
+    )
+}
+
+# Events already stored (same event_id) are ignored
+INSERT_SQL = {
+    "login": """
+        INSERT OR IGNORE INTO login_activities (
+            event_id, user_email, login_time, login_type, ip_address, user_agent,
+            device_type, is_suspicious, risk_score, session_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "admin": """
+        INSERT OR IGNORE INTO admin_activities (
+            event_id, admin_email, activity_time, activity_type, target_user,
+            ip_address, privilege_level, session_id, action_details
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "drive": """
+        INSERT OR IGNORE INTO drive_activities (
+            event_id, user_email, activity_time, event_name, doc_id, doc_title,
+            visibility, ip_address, session_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "token": """
+        INSERT OR IGNORE INTO token_activities (
+            event_id, user_email, activity_time, event_name, app_name, client_id,
+            scopes, ip_address, session_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+}
+
+_SCHEMA_LOCK = threading.Lock()
+
+@dataclass
+class IngestStats:
+    """Counts for one ingestion run"""
+    application: str
+    events_read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    suspicious: int = 0
+    failed: int = 0
+    privilege_changes: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    fetched_since: Optional[str] = None  # Start of the fetched window (UTC)
+    high_water_mark: Optional[str] = None  # Newest ingested event time after the run (UTC)
+
+class ActivityEvent(NamedTuple):
+    """A classified report event, ready to insert"""
+    event_id: str
+    event_time: str
+    row: Tuple
+    counter: Optional[str]  # IngestStats counter the event adds to, if any
+
+def normalize_time(value: Any) -> str:
+    """
+    Report timestamp in UTC as "YYYY-MM-DD HH:MM:SS", the form SQLite's datetime() compares with
+
+    GAM set to a local time zone prints offsets (2024-06-01T12:00:00+02:00);
+    they are converted, so stored times, event ids and the high-water mark
+    are all UTC.
+    """
+    timestamp = parse_timestamp(value, to_utc=True)
+    if timestamp is not None:
+        return timestamp.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value or "").replace("T", " ", 1).split(".")[0]
+
+def classify_login(event_name: str, ip_address: str, user_agent: str) -> Tuple[str, str, int, int]:
+    """
+    Classify a login event
+
+    Returns:
+        Tuple of (login_type, device_type, is_suspicious, risk_score)
+    """
+    login_type, is_suspicious, risk_score = "successful", 0, 0
+    if "login_failure" in event_name or "failed" in event_name:
+        login_type, risk_score = "failed", 30
+    elif "suspicious" in event_name or "unusual" in event_name:
+        login_type, is_suspicious, risk_score = "suspicious", 1, 70
+
+    device_type = "unknown"
+    if "Mobile" in user_agent or "Android" in user_agent or "iPhone" in user_agent:
+        device_type = "mobile"
+    elif "Windows" in user_agent or "Macintosh" in user_agent or "Linux" in user_agent:
+        device_type = "desktop"
+
+    # Simple geographic risk: internal addresses lower, external slightly higher
+    risk_score += -10 if INTERNAL_IP.match(ip_address) else 10
+    return login_type, device_type, is_suspicious, max(0, min(100, risk_score))
+
+def classify_admin(event_name: str) -> Tuple[str, str]:
+    """
+    Classify an admin event
+
+    Returns:
+        Tuple of (activity_type, privilege_level)
+    """
+    activity_type = next((activity for needles, activity in ADMIN_ACTIVITY_TYPES
+                          if any(needle in event_name for needle in needles)), "other")
+    privilege_level = "super_admin" if "SUPER_ADMIN" in event_name else "admin"
+    return activity_type, privilege_level
+
+def _event_parameter(record: Dict[str, Any], name: str) -> Any:
+    """Value of a named parameter of a Reports API event"""
+    for event in record.get("events") or []:
+        for parameter in event.get("parameters") or []:
+            if parameter.get("name") == name:
+                return parameter.get("value", parameter.get("multiValue"))
+    return None
+
+def _field_getters(report: ActivityReport, first: Dict[str, Any]) -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """
+    Resolve report fields against the first record
+
+    Columns are found by name (GAM CSV headers, Reports API paths); if none
+    of them are, the columns are read by position as the bash loop did.
+    """
+    getters = {}
+    for name, aliases in report.aliases.items():
+        for alias in aliases:
+            key = next((key for key in first if key.lower() == alias.lower()), None)
+            if key is not None:
+                getters[name] = lambda record, key=key: record.get(key)
+                break
+            if "." in alias and lookup(first, alias) is not None:
+                getters[name] = lambda record, alias=alias: lookup(record, alias)
+                break
+        else:
+            if "events" in first:
+                getters[name] = lambda record, parameter=aliases[0]: _event_parameter(record, parameter)
+
+    if "user_email" not in getters or "time" not in getters:
+        keys = list(first)
+        return {name: (lambda record, index=index: list(record.values())[index]
+                       if index < len(record) else None)
+                for index, name in enumerate(report.positional) if index < len(keys)}
+    return getters
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+def event_id(application: str, values: Dict[str, str]) -> str:
+    """
+    Stable id for a report event
+
+    GAM and the Reports API report different columns for the same event, so
+    the id is built from its identity only: application, uniqueQualifier,
+    normalized time and event name. An event from the same application has
+    the same id whichever source stored it. Reports without a
+    uniqueQualifier fall back to a hash of every field.
+    """
+    if values.get("unique_qualifier"):
+        identity = {"application": application, "unique_qualifier": values["unique_qualifier"],
+                    "time": values.get("time", ""), "event_name": values.get("event_name", "")}
+    else:
+        identity = dict(values, application=application)
+    key = "\x1f".join(f"{name}={identity[name]}" for name in sorted(identity))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def event_rows(kind: str, records: Iterable[Dict[str, Any]], session_id: str,
+               stats: IngestStats) -> Iterator[ActivityEvent]:
+    """
+    Classify report records into table rows
+
+    Records without a user are skipped, as in the bash loop.
+    """
+    report = REPORTS[kind]
+    getters = None
+    for record in records:
+        stats.events_read += 1
+        if getters is None:
+            getters = _field_getters(report, record)
+        values = {name: _text(getter(record)) for name, getter in getters.items()}
+        user_email = values.get("user_email", "")
+        if not user_email:
+            continue
+
+        event_name = values.get("event_name", "")
+        ip_address = values.get("ip_address", "")
+        event_time = normalize_time(values.get("time"))
+        identifier = event_id(report.application, dict(values, time=event_time))
+
+        if kind == "login":
+            user_agent = values.get("user_agent", "")
+            login_type, device_type, is_suspicious, risk_score = classify_login(event_name, ip_address, user_agent)
+            counter = "suspicious" if is_suspicious else ("failed" if login_type == "failed" else None)
+            row = (identifier, user_email, event_time, login_type, ip_address, user_agent,
+                   device_type, is_suspicious, risk_score, session_id)
+        elif kind == "admin":
+            target_user = values.get("target_user", "")
+            activity_type, privilege_level = classify_admin(event_name)
+            counter = "privilege_changes" if activity_type in ("privilege_grant", "privilege_revoke") else None
+            raw_data = ",".join([values.get("time", ""), user_email, event_name, target_user, ip_address])
+            row = (identifier, user_email, event_time, activity_type, target_user, ip_address, privilege_level,
+                   session_id, json.dumps({"event_name": event_name, "raw_data": raw_data}))
+        elif kind == "drive":
+            counter = None
+            row = (identifier, user_email, event_time, event_name, values.get("doc_id", ""),
+                   values.get("doc_title", ""), values.get("visibility", ""), ip_address, session_id)
+        else:
+            counter = None
+            row = (identifier, user_email, event_time, event_name, values.get("app_name", ""),
+                   values.get("client_id", ""), values.get("scopes", ""), ip_address, session_id)
+        yield ActivityEvent(identifier, event_time, row, counter)
+
+def _batches(rows: Iterator[ActivityEvent], size: int) -> Iterator[List[ActivityEvent]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def iter_gam_report(gam_path: str, report: ActivityReport, start_date: datetime) -> Iterator[Dict[str, Any]]:
+    """
+    Stream "gam report" CSV records as GAM prints them
+
+    Args:
+        start_date: Start of the reporting window, in UTC
+
+    Raises:
+        ActivityIngestError: If GAM cannot be run or exits with an error
+    """
+    command = [gam_path, "report", report.gam_report, "start", start_date.strftime("%Y-%m-%dT%H:%M:%SZ")]
+    with TemporaryFile() as error_file:
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=error_file,
+                                       universal_newlines=True, encoding="utf-8", errors="replace")
+        except OSError as e:
+            raise ActivityIngestError(f"Cannot run GAM ({gam_path}): {e}")
+
+        try:
+            yield from iter_records(process.stdout)
+        finally:
+            process.stdout.close()
+            exit_code = process.wait()
+
+        if exit_code != 0:
+            error_file.seek(0)
+            message = error_file.read().decode("utf-8", errors="replace").strip().splitlines()
+            raise ActivityIngestError(f"gam report {report.gam_report} exited with {exit_code}"
+                                      + (f": {message[-1]}" if message else ""))
+
+def iter_api_report(report: ActivityReport, start_date: datetime, db_path: str,
+                    credentials_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream activities from the Reports API, page by page
+
+    Args:
+        start_date: Start of the reporting window, in UTC
+
+    Raises:
+        ActivityIngestError: If the API is not available or authenticated
+    """
+    try:
+        from .gws_api import GoogleWorkspaceAPI
+    except ImportError:
+        from gws_api import GoogleWorkspaceAPI
+
+    api = GoogleWorkspaceAPI(db_path, credentials_path)
+    if not api.is_authenticated():
+        raise ActivityIngestError("Google Workspace API is not available or not authenticated")
+    yield from api.iter_activities(report.application, start_date, datetime.utcnow())
+
+def find_schema_file() -> Optional[Path]:
+    """Location of security_reports_schema.sql, if present"""
+    return next((Path(__file__).parent / candidate for candidate in SCHEMA_FILES
+                 if (Path(__file__).parent / candidate).exists()), None)
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """
+    Bring the activity tables up to the current schema
+
+    Databases created before incremental ingestion have no event_id columns,
+    unique event indexes or activity_ingest_state table. The columns are
+    added here (the schema script cannot, as CREATE TABLE IF NOT EXISTS
+    leaves existing tables alone), then the schema script creates the rest.
+
+    Raises:
+        ActivityIngestError: If the schema is missing and the script cannot be found
+    """
+    expected = {f"idx_{report.table}_event" for report in REPORTS.values()} | {"activity_ingest_state"}
+    with _SCHEMA_LOCK:
+        present = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        if expected <= present:
+            return
+
+        for report in REPORTS.values():
+            if report.table in present:
+                columns = {row[1] for row in conn.execute(f"PRAGMA table_info({report.table})")}
+                if "event_id" not in columns:
+                    conn.execute(f"ALTER TABLE {report.table} ADD COLUMN event_id TEXT")
+
+        schema_path = find_schema_file()
+        if schema_path is None:
+            raise ActivityIngestError("Security reports schema file not found - cannot create activity tables")
+        with open(schema_path, "r") as f:
+            conn.executescript(f.read())
+        logger.info("Security reports schema updated for incremental activity ingestion")
+
+class ActivityIngester:
+    """
+    Writes classified activity events to the security database
+
+    Usage:
+        ingester = ActivityIngester(db_path, session_id)
+        start = ingester.fetch_start("login", days_back=7)
+        stats = ingester.ingest("login", iter_gam_report(gam, REPORTS["login"], start))
+        ingester.record_metrics(stats, days_back=7)
+    """
+
+    def __init__(self, db_path: str, session_id: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 tracer: Optional[Tracer] = None):
+        """
+        Initialize ingester
+
+        Args:
+            db_path: GWOMBAT database with the security reports schema
+            session_id: Session recorded on every inserted event
+            batch_size: Events inserted per transaction
+            tracer: Span collector for timing data (one is created if omitted)
+        """
+        self.db_path = Path(db_path)
+        self.session_id = session_id
+        self.batch_size = max(1, batch_size)
+        self.tracer = tracer or Tracer("activity_ingest")
+        self._schema_checked = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._schema_checked:
+            try:
+                ensure_schema(conn)
+            except Exception:
+                conn.close()
+                raise
+            self._schema_checked = True
+        return conn
+
+    def high_water_mark(self, kind: str) -> Optional[datetime]:
+        """Newest event time ingested for an application (UTC), or None before the first scan"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT last_event_time FROM activity_ingest_state WHERE application = ?",
+                               (REPORTS[kind].application,)).fetchone()
+        finally:
+            conn.close()
+        return parse_timestamp(row[0]) if row and row[0] else None
+
+    def fetch_start(self, kind: str, days_back: int, overlap: timedelta = DEFAULT_OVERLAP,
+                    full: bool = False) -> datetime:
+        """
+        Start of the window the next scan should fetch, in UTC
+
+        Args:
+            kind: Report to scan
+            days_back: Longest window to fetch
+            overlap: How far before the high-water mark to re-fetch, for late events
+            full: Ignore the high-water mark and fetch the whole window
+        """
+        window_start = datetime.utcnow() - timedelta(days=days_back)
+        mark = None if full else self.high_water_mark(kind)
+        return window_start if mark is None else max(window_start, mark - overlap)
+
+    def _new_events(self, conn: sqlite3.Connection, table: str,
+                    batch: List[ActivityEvent]) -> List[ActivityEvent]:
+        """Events of a batch that are not stored yet, without repeats"""
+        seen = set()
+        unique = []
+        for event in batch:
+            if event.event_id not in seen:
+                seen.add(event.event_id)
+                unique.append(event)
+
+        stored = set()
+        for index in range(0, len(unique), LOOKUP_CHUNK):
+            chunk = [event.event_id for event in unique[index:index + LOOKUP_CHUNK]]
+            stored.update(row[0] for row in conn.execute(
+                f"SELECT event_id FROM {table} WHERE event_id IN ({','.join('?' * len(chunk))})", chunk))
+        return [event for event in unique if event.event_id not in stored]
+
+    def _advance_high_water_mark(self, conn: sqlite3.Connection, kind: str,
+                                 newest: Optional[str], inserted: int) -> None:
+        application = REPORTS[kind].application
+        conn.execute("INSERT OR IGNORE INTO activity_ingest_state (application, events_ingested) VALUES (?, 0)",
+                     (application,))
+        conn.execute("""
+            UPDATE activity_ingest_state
+            SET last_event_time = CASE WHEN last_event_time IS NULL OR last_event_time < ?
+                                       THEN ? ELSE last_event_time END,
+                events_ingested = events_ingested + ?,
+                last_scan_time = CURRENT_TIMESTAMP,
+                session_id = ?
+            WHERE application = ?
+        """, (newest, newest, inserted, self.session_id, application))
+
+    def ingest(self, kind: str, records: Iterable[Dict[str, Any]]) -> IngestStats:
+        """
+        Classify and insert a stream of report records
+
+        Events already in the table are skipped and counted as duplicates.
+        Each batch is committed as it fills. The high-water mark is only
+        advanced once the source has ended successfully: GAM and the Reports
+        API list events newest first, so a mark taken from the batches of a
+        failed scan would skip the older events that were never fetched. If
+        the source fails part way, the batches already committed stay
+        written (the next scan sees them as duplicates) and the error is
+        raised.
+
+        Args:
+            kind: "login", "admin", "drive" or "token"
+            records: Report records (GAM CSV rows or Reports API activities)
+        """
+        table = REPORTS[kind].table
+        stats = IngestStats(application=kind)
+        started = time.perf_counter()
+        newest = None
+        conn = self._connect()
+        try:
+            for batch in _batches(event_rows(kind, records, self.session_id, stats), self.batch_size):
+                with self.tracer.span("insert_batch", "db", table=table, rows=len(batch)):
+                    with conn:
+                        new_events = self._new_events(conn, table, batch)
+                        inserted = conn.executemany(INSERT_SQL[kind], [event.row for event in new_events]).rowcount
+                batch_newest = max((event.event_time for event in batch if event.event_time), default=None)
+                if batch_newest and (newest is None or batch_newest > newest):
+                    newest = batch_newest
+                stats.inserted += max(0, inserted)
+                stats.duplicates += len(batch) - max(0, inserted)
+                for event in new_events:
+                    if event.counter:
+                        setattr(stats, event.counter, getattr(stats, event.counter) + 1)
+                stats.batches += 1
+            with conn:
+                self._advance_high_water_mark(conn, kind, newest, stats.inserted)
+            row = conn.execute("SELECT last_event_time FROM activity_ingest_state WHERE application = ?",
+                               (REPORTS[kind].application,)).fetchone()
+            stats.high_water_mark = row[0] if row else None
+        finally:
+            conn.close()
+            stats.seconds = round(time.perf_counter() - started, 3)
+        return stats
+
+    def record_metrics(self, stats: IngestStats, days_back: int) -> None:
+        """
+        Update the security_metrics rows the security dashboard shows
+
+        Counts cover every stored event in the last days_back days, not just
+        the events this (incremental) scan added.
+        """
+        since = (datetime.utcnow() - timedelta(days=days_back)).strftime("%Y-%m-%d %H:%M:%S")
+        conn = None
+        try:
+            conn = self._connect()
+            with conn:
+                if stats.application == "login":
+                    total, suspicious, failed = conn.execute("""
+                        SELECT COUNT(*), COALESCE(SUM(is_suspicious), 0), COALESCE(SUM(login_type = 'failed'), 0)
+                        FROM login_activities WHERE login_time >= ?
+                    """, (since,)).fetchone()
+                    metrics = [
+                        ("Total Logins Scanned", total, "authentication"),
+                        (f"Suspicious Logins ({days_back}d)", suspicious, "authentication"),
+                        (f"Failed Logins ({days_back}d)", failed, "authentication")
+                    ]
+                elif stats.application == "admin":
+                    total, privilege_changes = conn.execute("""
+                        SELECT COUNT(*), COALESCE(SUM(activity_type IN ('privilege_grant', 'privilege_revoke')), 0)
+                        FROM admin_activities WHERE activity_time >= ?
+                    """, (since,)).fetchone()
+                    metrics = [
+                        (f"Admin Actions ({days_back}d)", total, "admin"),
+                        (f"Privilege Changes ({days_back}d)", privilege_changes, "admin")
+                    ]
+                else:
+                    return
+
+                conn.executemany("""
+                    INSERT OR REPLACE INTO security_metrics (metric_name, metric_value, metric_category, session_id, status)
+                    VALUES (?, ?, ?, ?, 'current')
+                """, [(name, value, category, self.session_id) for name, value, category in metrics])
+        except (sqlite3.Error, ActivityIngestError) as e:
+            logger.error(f"Failed to update security metrics: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+
+def main():
+    """Command-line interface for security_reports.sh"""
+    parser = argparse.ArgumentParser(description="Incrementally ingest login/admin/drive/token activity reports")
+    parser.add_argument("report", choices=sorted(REPORTS), help="Activity report to ingest")
+    parser.add_argument("--db-path", default="./config/gwombat.db", help="Path to GWOMBAT database")
+    parser.add_argument("--session-id", default=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_activity_ingest",
+                        help="Session recorded on inserted events")
+    parser.add_argument("--days-back", type=int, default=7,
+                        help="Days of activity to fetch on the first scan (later scans start at the high-water mark)")
+    parser.add_argument("--overlap-minutes", type=int, default=int(DEFAULT_OVERLAP.total_seconds() // 60),
+                        help="Minutes before the high-water mark to re-fetch, for late-published events")
+    parser.add_argument("--full", action="store_true", help="Ignore the high-water mark and fetch all --days-back days")
+    parser.add_argument("--source", choices=["gam", "api", "csv"], default="gam",
+                        help="Read the report from GAM, the Reports API or a GAM CSV file (default: gam)")
+    parser.add_argument("--gam-path", default="gam", help="Path to GAM executable")
+    parser.add_argument("--credentials", default="./config/gws_credentials.json", help="Path to Google OAuth2 credentials")
+    parser.add_argument("--input", default="-", help="GAM CSV file for --source csv (default: stdin)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Events inserted per transaction")
+    parser.add_argument("--output", choices=["counts", "json"], default="counts", help="Output format")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    add_cli_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    report = REPORTS[args.report]
+    tracer = Tracer("activity_ingest")
+    ingester = ActivityIngester(args.db_path, args.session_id, args.batch_size, tracer=tracer)
+
+    with cli_instrumentation(args, tracer):
+        input_file = None
+        try:
+            start_date = ingester.fetch_start(args.report, args.days_back,
+                                              timedelta(minutes=max(0, args.overlap_minutes)), full=args.full)
+            if args.source == "gam":
+                records = iter_gam_report(args.gam_path, report, start_date)
+            elif args.source == "api":
+                records = iter_api_report(report, start_date, args.db_path, args.credentials)
+            else:
+                input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+                records = iter_records(input_file)
+
+            stats = ingester.ingest(args.report, records)
+            if args.source != "csv":
+                stats.fetched_since = start_date.strftime("%Y-%m-%d %H:%M:%S")
+        except (ActivityIngestError, ValueError, OSError, sqlite3.Error) as e:
+            logger.error(f"{report.table} ingestion failed: {e}")
+            return 1
+        finally:
+            if input_file not in (None, sys.stdin):
+                input_file.close()
+
+        ingester.record_metrics(stats, args.days_back)
+
+    if args.output == "json":
+        print(json.dumps(asdict(stats), indent=2))
+    elif args.report == "login":
+        print(f"{stats.inserted}\t{stats.suspicious}\t{stats.failed}")
+    elif args.report == "admin":
+        print(f"{stats.inserted}\t{stats.privilege_changes}")
+    else:
+        print(stats.inserted)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
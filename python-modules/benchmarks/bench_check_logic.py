@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled check_logic evaluation
+
+Evaluates thousands of synthetic baselines against a small set of cached GAM
+outputs (as in an assessment, where many baselines share a command) and
+compares compiled rules with the legacy lowercase substring scan.
+
+Usage:
+    python3 python-modules/benchmarks/bench_check_logic.py [--baselines 5000] [--outputs 50] [--rows 200]
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from check_logic import CompiledCheck, parse_output  # noqa: E402
+
+RULE_TEMPLATES = [
+    {"format": "csv", "rule": {"field": "enabled", "op": "eq", "value": True}},
+    {"format": "csv", "rows": "any", "rule": {"field": "domain", "op": "in", "value": ["example.edu", "example.org"]}},
+    {"format": "csv", "rule": {"all": [
+        {"field": "retentionDays", "op": "ge", "value": 30},
+        {"not": {"field": "owner", "op": "regex", "value": "@gmail\\.com$"}}
+    ]}},
+    {"format": "json", "rule": {"field": "settings.sharing.external", "op": "eq", "value": "restricted"}},
+    {"format": "key_value", "rule": {"field": "Enforce 2SV", "op": "eq", "value": "true"}},
+    {}  # expected_value substring match
+]
+
+def make_outputs(count: int, rows: int, rng: random.Random) -> list:
+    """Synthetic GAM outputs in the formats the rule templates parse"""
+    outputs = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            lines = ["primaryEmail,enabled,domain,retentionDays,owner"]
+            for r in range(rows):
+                lines.append(f"user{r}@example.edu,{rng.choice(['True', 'False'])},"
+                             f"{rng.choice(['example.edu', 'example.com'])},{rng.randint(1, 90)},"
+                             f"owner{r}@{rng.choice(['example.edu', 'gmail.com'])}")
+            outputs.append(("csv", "\n".join(lines)))
+        elif kind == 1:
+            outputs.append(("json", json.dumps({"settings": {"sharing": {
+                "external": rng.choice(["restricted", "allowed"])}}, "padding": "x" * rows * 20})))
+        else:
+            outputs.append(("key_value", "\n".join(
+                [f"Setting {n}: value {n}" for n in range(rows)] + [f"Enforce 2SV: {rng.choice(['true', 'false'])}"])))
+    return outputs
+
+def legacy_evaluate(expected_value: str, output: str) -> bool:
+    """The evaluation used before check_logic support"""
+    current_value = output.strip()
+    return bool(expected_value) and expected_value.lower() in current_value.lower()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark compiled check_logic evaluation")
+    parser.add_argument("--baselines", type=int, default=5000, help="Number of synthetic baselines")
+    parser.add_argument("--outputs", type=int, default=50, help="Number of distinct cached GAM outputs")
+    parser.add_argument("--rows", type=int, default=200, help="Records per GAM output")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    outputs = make_outputs(args.outputs, args.rows, rng)
+
+    # Each baseline gets a rule matching the format of its (shared) output
+    baselines = []
+    for i in range(args.baselines):
+        output_format, output = outputs[i % len(outputs)]
+        candidates = [t for t in RULE_TEMPLATES if t.get("format", output_format) == output_format]
+        baselines.append((rng.choice(candidates), "true", output))
+
+    start = time.perf_counter()
+    compiled = [(CompiledCheck.compile(logic, expected), output) for logic, expected, output in baselines]
+    compile_seconds = time.perf_counter() - start
+
+    rule_checks = [(check, output) for check, output in compiled if check.uses_rules]
+    substring_checks = [(check, output) for check, output in compiled if not check.uses_rules]
+
+    # One parse cache for the run, as an assessment uses
+    cache = {}
+    start = time.perf_counter()
+    rule_compliant = sum(1 for check, output in rule_checks if check.evaluate(output, cache).compliant)
+    rule_seconds = time.perf_counter() - start
+    records = sum(len(parse_output(check.output_format, output, cache)) for check, output in rule_checks)
+
+    start = time.perf_counter()
+    substring_compliant = sum(1 for check, output in substring_checks if check.evaluate(output, cache).compliant)
+    substring_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_compliant = sum(1 for check, output in substring_checks if legacy_evaluate(check.expected_value, output))
+    legacy_seconds = time.perf_counter() - start
+
+    def per_item(seconds: float, count: int) -> str:
+        return f"{seconds / count * 1e6:.1f} us/baseline" if count else "n/a"
+
+    print(f"Baselines: {args.baselines}, distinct outputs: {args.outputs}, records per output: {args.rows}")
+    print(f"Compile:                      {compile_seconds * 1000:8.1f} ms ({per_item(compile_seconds, len(compiled))})")
+    print(f"Rules ({len(rule_checks)} baselines):       {rule_seconds * 1000:8.1f} ms ({per_item(rule_seconds, len(rule_checks))}, "
+          f"{records / rule_seconds / 1e6 if rule_seconds else 0:.2f}M records/s), {rule_compliant} compliant")
+    print(f"Substring, compiled ({len(substring_checks)}): {substring_seconds * 1000:8.1f} ms "
+          f"({per_item(substring_seconds, len(substring_checks))}), {substring_compliant} compliant")
+    print(f"Substring, legacy ({len(substring_checks)}):   {legacy_seconds * 1000:8.1f} ms "
+          f"({per_item(legacy_seconds, len(substring_checks))}), {legacy_compliant} compliant")
+    print(f"Parse cache: {len(cache)} entries")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
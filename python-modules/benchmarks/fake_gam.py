@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Stub GAM executable for benchmarks
+
+Answers any GAM command with synthetic output after a configurable delay, so
+assessments can be timed without a live tenant. Output depends only on the
+command line (and FAKE_GAM_SEED), so repeated commands return the same data,
+as a real tenant would between two assessments.
+
+    print <entity> [fields a,b,c]   CSV with one column per field
+    report <application>            CSV of activity records
+    anything else                   "Key: value" lines
+
+Behaviour is set through the environment:
+    FAKE_GAM_LATENCY       Mean seconds per command (default 0.05)
+    FAKE_GAM_JITTER        Latency spread as a fraction of the mean (default 0.2)
+    FAKE_GAM_ROWS          Records per print/report command (default 100)
+    FAKE_GAM_FAILURE_RATE  Fraction of commands that fail with exit code 1 (default 0)
+    FAKE_GAM_SEED          Seed mixed into the generated output (default 0)
+
+Usage:
+    python-modules/scuba_compliance.py --gam-path python-modules/benchmarks/fake_gam.py
+"""
+
+import os
+import sys
+import time
+import random
+import zlib
+
+DEFAULT_FIELDS = {
+    "users": ["primaryEmail", "suspended", "isEnforcedIn2Sv", "orgUnitPath", "lastLoginTime"],
+    "groups": ["email", "name", "whoCanJoin", "allowExternalMembers"],
+    "admins": ["user", "role", "scope"],
+    "domains": ["domainName", "isPrimary", "verified"],
+    "resources": ["resourceEmail", "resourceName", "requiresApproval"],
+    "shareddrives": ["id", "name", "restrictions.domainUsersOnly"]
+}
+
+ACTIVITY_FIELDS = ["id.time", "id.uniqueQualifier", "actor.email", "ipAddress", "name"]
+
+SETTINGS = ["forwarding", "attachment scanning", "calendar sharing", "drive sharing",
+            "external warning", "2sv enforcement", "meet recording", "chat history"]
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+def _value(field: str, row: int, rng: random.Random) -> str:
+    """Synthetic value for a field, shaped by its name"""
+    name = field.lower()
+    if "email" in name or name in ("user", "actor.email"):
+        return f"user{row}@example.edu"
+    if name.startswith(("is", "allow", "requires", "suspended", "verified", "restrictions")):
+        return rng.choice(["True", "False"])
+    if "time" in name:
+        return f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00.000Z"
+    if "orgunit" in name or name == "scope":
+        return f"/Staff/Dept {row % 17}, Building {row % 5}"
+    if name == "ipaddress":
+        return f"10.{row % 256}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+    return f"{field} {row}"
+
+def _csv_line(values: list) -> str:
+    return ",".join(f'"{value}"' if "," in value or '"' in value else value for value in values)
+
+def render(argv: list, rows: int, seed: int) -> str:
+    """Output for a GAM command line"""
+    rng = random.Random(zlib.crc32(" ".join(argv).encode("utf-8")) ^ seed)
+    lowered = [arg.lower() for arg in argv]
+
+    if lowered[:1] == ["print"] and len(lowered) > 1:
+        fields = DEFAULT_FIELDS.get(lowered[1], ["id", "name", "value"])
+        if "fields" in lowered and lowered.index("fields") + 1 < len(argv):
+            fields = [f.split(":")[0] for f in argv[lowered.index("fields") + 1].split(",") if f]
+        lines = [_csv_line(fields)]
+        lines.extend(_csv_line([_value(f, row, rng) for f in fields]) for row in range(rows))
+        return "\n".join(lines) + "\n"
+
+    if lowered[:1] == ["report"]:
+        lines = [_csv_line(ACTIVITY_FIELDS)]
+        lines.extend(_csv_line([_value(f, row, rng) for f in ACTIVITY_FIELDS]) for row in range(rows))
+        return "\n".join(lines) + "\n"
+
+    lines = [f"{setting.title()}: {rng.choice(['enabled', 'disabled', 'restricted', 'true'])}"
+             for setting in SETTINGS]
+    lines.extend(f"Setting {n}: value {rng.randint(0, 1000)}" for n in range(max(0, rows // 10)))
+    return "\n".join(lines) + "\n"
+
+def main() -> int:
+    latency = _env_float("FAKE_GAM_LATENCY", 0.05)
+    jitter = _env_float("FAKE_GAM_JITTER", 0.2)
+    failure_rate = _env_float("FAKE_GAM_FAILURE_RATE", 0.0)
+    rows = int(_env_float("FAKE_GAM_ROWS", 100))
+    seed = int(_env_float("FAKE_GAM_SEED", 0))
+
+    if latency > 0:
+        time.sleep(max(0.0, random.gauss(latency, latency * jitter)))
+
+    if failure_rate > 0 and random.random() < failure_rate:
+        sys.stderr.write("ERROR: 503: Service Unavailable - fake GAM failure\n")
+        return 1
+
+    try:
+        sys.stdout.write(render(sys.argv[1:], rows, seed))
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # head/grep -m closed the pipe early, as with real GAM
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
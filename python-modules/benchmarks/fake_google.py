@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Fake Google Workspace API transport for benchmarks
+
+FakeGoogleHttp is an httplib2-compatible transport that answers Directory
+and Reports API requests from a synthetic tenant, with configurable latency
+and failure rate. Failures are 503 responses, so GoogleWorkspaceAPI's retry
+and backoff path is exercised as it would be against the real API.
+
+When google-api-python-client is installed, services are built from its
+bundled discovery documents with the fake transport, so requests go through
+the real client library. Without it, a small stand-in built from the same
+REST paths issues the requests instead.
+
+Usage:
+    tenant = FakeTenant(users=5000, activities=20000)
+    http = FakeGoogleHttp(tenant, latency=0.05)
+    api = GoogleWorkspaceAPI(db_path, credentials_path="/nonexistent")
+    attach_fake_transport(api, http)
+    api.get_comprehensive_security_snapshot()
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlencode, urlsplit, parse_qs, quote
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import gws_api  # noqa: E402
+
+# REST paths of the methods GoogleWorkspaceAPI uses, by (API, version)
+DISCOVERY_ROUTES = {
+    ("admin", "directory_v1"): ("https://admin.googleapis.com/admin/directory/v1/", "directory", {
+        "users": {"list": "users", "get": "users/{userKey}"},
+        "domains": {"list": "customer/{customer}/domains"},
+        "orgunits": {"list": "customer/{customerId}/orgunits"}
+    }),
+    ("admin", "reports_v1"): ("https://admin.googleapis.com/admin/reports/v1/", "reports", {
+        "activities": {"list": "activity/users/{userKey}/applications/{applicationName}"}
+    })
+}
+
+class FakeTenant:
+    """Synthetic Workspace tenant; records are generated from their index on demand"""
+
+    def __init__(self, users: int = 1000, activities: int = 5000, org_units: int = 25,
+                 domains: int = 3, seed: int = 1):
+        self.user_count = users
+        self.activity_count = activities
+        self.org_unit_count = org_units
+        self.domain_count = domains
+        self.seed = seed
+
+    def user(self, index: int) -> Dict[str, Any]:
+        rng = random.Random(self.seed * 1000003 + index)
+        return {
+            "primaryEmail": f"user{index}@example.edu",
+            "suspended": rng.random() < 0.05,
+            "isEnforcedIn2Sv": rng.random() < 0.9,
+            "isAdmin": index % 500 == 0,
+            "orgUnitPath": f"/Staff/Dept {index % self.org_unit_count}",
+            "lastLoginTime": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T09:00:00.000Z",
+            "creationTime": "2020-01-01T00:00:00.000Z"
+        }
+
+    def activity(self, application: str, index: int) -> Dict[str, Any]:
+        rng = random.Random(zlib.crc32(f"{self.seed}:{application}:{index}".encode("utf-8")))
+        return {
+            "kind": "admin#reports#activity",
+            "id": {"time": f"2024-06-01T{index % 24:02d}:{index % 60:02d}:00.000Z",
+                   "uniqueQualifier": str(index), "applicationName": application},
+            "actor": {"email": f"user{rng.randrange(max(1, self.user_count))}@example.edu"},
+            "ipAddress": f"10.0.{index % 256}.{rng.randint(1, 254)}",
+            "events": [{"type": application, "name": rng.choice(["login_success", "change_password",
+                                                                  "download", "authorize"])}]
+        }
+
+    def domains(self) -> List[Dict[str, Any]]:
+        return [{"domainName": f"example{n or ''}.edu", "isPrimary": n == 0, "verified": True}
+                for n in range(self.domain_count)]
+
+    def org_units(self) -> List[Dict[str, Any]]:
+        return [{"name": f"Dept {n}", "orgUnitPath": f"/Staff/Dept {n}", "parentOrgUnitPath": "/Staff"}
+                for n in range(self.org_unit_count)]
+
+class FakeResponse(dict):
+    """httplib2.Response stand-in: a header dict with a status"""
+
+    def __init__(self, status: int, headers: Optional[Dict[str, str]] = None):
+        super().__init__(headers or {})
+        self.status = status
+        self.reason = "OK" if status < 400 else "Service Unavailable"
+        self["status"] = str(status)
+        self.setdefault("content-type", "application/json; charset=UTF-8")
+
+class FakeGoogleHttp:
+    """
+    httplib2-compatible transport serving a FakeTenant
+
+    Thread-safe; counts requests and injected failures.
+    """
+
+    ROUTES = [
+        (re.compile(r"/admin/directory/v1/customer/[^/]+/domains$"), "_domains"),
+        (re.compile(r"/admin/directory/v1/customer/[^/]+/orgunits$"), "_org_units"),
+        (re.compile(r"/admin/directory/v1/users$"), "_users"),
+        (re.compile(r"/admin/directory/v1/users/([^/]+)$"), "_user"),
+        (re.compile(r"/admin/reports/v1/activity/users/[^/]+/applications/([^/]+)$"), "_activities")
+    ]
+
+    def __init__(self, tenant: FakeTenant, latency: float = 0.02, jitter: float = 0.2,
+                 failure_rate: float = 0.0):
+        self.tenant = tenant
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def request(self, uri: str, method: str = "GET", body: Any = None, headers: Any = None,
+                **kwargs) -> Tuple[FakeResponse, bytes]:
+        """Answer a request as httplib2.Http.request() would"""
+        if self.latency > 0:
+            time.sleep(max(0.0, random.gauss(self.latency, self.latency * self.jitter)))
+
+        failed = self.failure_rate > 0 and random.random() < self.failure_rate
+        with self._lock:
+            self.requests += 1
+            self.failures += int(failed)
+        if failed:
+            return self._error(503, "backendError", "Backend Error")
+
+        parts = urlsplit(uri)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        for pattern, handler in self.ROUTES:
+            match = pattern.search(parts.path)
+            if match:
+                payload = getattr(self, handler)(query, *match.groups())
+                return FakeResponse(200), json.dumps(payload).encode("utf-8")
+        return self._error(404, "notFound", f"No fake route for {parts.path}")
+
+    @staticmethod
+    def _error(status: int, reason: str, message: str) -> Tuple[FakeResponse, bytes]:
+        content = {"error": {"code": status, "message": message, "errors": [{"reason": reason}]}}
+        return FakeResponse(status), json.dumps(content).encode("utf-8")
+
+    @staticmethod
+    def _page(query: Dict[str, str], total: int, default_size: int) -> Tuple[range, Optional[str]]:
+        start = int(query.get("pageToken") or 0)
+        size = int(query.get("maxResults") or default_size)
+        end = min(total, start + size)
+        return range(start, end), (str(end) if end < total else None)
+
+    def _domains(self, query: Dict[str, str]) -> Dict[str, Any]:
+        return {"kind": "admin#directory#domains", "domains": self.tenant.domains()}
+
+    def _org_units(self, query: Dict[str, str]) -> Dict[str, Any]:
+        return {"kind": "admin#directory#org_units", "organizationUnits": self.tenant.org_units()}
+
+    def _users(self, query: Dict[str, str]) -> Dict[str, Any]:
+        indexes, next_token = self._page(query, self.tenant.user_count, 100)
+        response = {"kind": "admin#directory#users", "users": [self.tenant.user(i) for i in indexes]}
+        if next_token:
+            response["nextPageToken"] = next_token
+        return response
+
+    def _user(self, query: Dict[str, str], user_key: str) -> Dict[str, Any]:
+        index = re.search(r"\d+", user_key)
+        return self.tenant.user(int(index.group()) if index else 0)
+
+    def _activities(self, query: Dict[str, str], application: str) -> Dict[str, Any]:
+        indexes, next_token = self._page(query, self.tenant.activity_count, 1000)
+        response = {"kind": "admin#reports#activities",
+                    "items": [self.tenant.activity(application, i) for i in indexes]}
+        if next_token:
+            response["nextPageToken"] = next_token
+        return response
+
+class FakeHttpError(gws_api.HttpError):
+    """HttpError raised by the stand-in client, shaped like googleapiclient's"""
+
+    def __init__(self, resp: FakeResponse, content: bytes, uri: str = ""):
+        super().__init__(f"<HttpError {resp.status} when requesting {uri}>")
+        self.resp = resp
+        self.content = content
+        self.uri = uri
+
+class FakeRequest:
+    """Stand-in for googleapiclient.http.HttpRequest"""
+
+    def __init__(self, http: FakeGoogleHttp, uri: str, method_id: str, params: Dict[str, Any]):
+        self.http = http
+        self.uri = uri
+        self.methodId = method_id
+        self.params = params
+
+    def execute(self, http: Any = None, num_retries: int = 0) -> Dict[str, Any]:
+        resp, content = (http or self.http).request(self.uri, method="GET")
+        if resp.status >= 300:
+            raise FakeHttpError(resp, content, self.uri)
+        return json.loads(content.decode("utf-8"))
+
+class FakeResource:
+    """Stand-in for a discovery-built resource collection (e.g. service.users())"""
+
+    def __init__(self, http: FakeGoogleHttp, base_url: str, api_name: str, resource: str,
+                 methods: Dict[str, str]):
+        self._http = http
+        self._base_url = base_url
+        self._api_name = api_name
+        self._resource = resource
+        self._methods = methods
+
+    def __getattr__(self, method: str) -> Any:
+        if method.startswith("_") or method not in self._methods:
+            raise AttributeError(method)
+        path_template = self._methods[method]
+
+        def build_request(**kwargs) -> FakeRequest:
+            path_params = set(re.findall(r"{(\w+)}", path_template))
+            path = path_template.format(**{name: quote(str(kwargs.get(name, "")), safe="")
+                                           for name in path_params})
+            query = {key: value for key, value in kwargs.items() if key not in path_params}
+            uri = self._base_url + path + ("?" + urlencode(query) if query else "")
+            return FakeRequest(self._http, uri, f"{self._api_name}.{self._resource}.{method}", kwargs)
+        return build_request
+
+    def list_next(self, previous_request: FakeRequest, previous_response: Dict[str, Any]) -> Optional[FakeRequest]:
+        token = previous_response.get("nextPageToken")
+        if not token:
+            return None
+        return self.list(**dict(previous_request.params, pageToken=token))
+
+class FakeService:
+    """Stand-in for a discovery-built API client"""
+
+    def __init__(self, http: FakeGoogleHttp, service_name: str, version: str):
+        if (service_name, version) not in DISCOVERY_ROUTES:
+            raise KeyError(f"No fake routes for {service_name} {version}")
+        self._http = http
+        self._base_url, self._api_name, self._resources = DISCOVERY_ROUTES[(service_name, version)]
+
+    def __getattr__(self, resource: str) -> Any:
+        if resource.startswith("_") or resource not in self._resources:
+            raise AttributeError(resource)
+        return lambda: FakeResource(self._http, self._base_url, self._api_name, resource,
+                                    self._resources[resource])
+
+def build_fake_service(service_name: str, version: str, http: FakeGoogleHttp) -> Any:
+    """API client whose requests are answered by the fake transport"""
+    try:
+        from googleapiclient.discovery import build
+    except ImportError:
+        return FakeService(http, service_name, version)
+    return build(service_name, version, http=http, static_discovery=True, cache_discovery=False)
+
+def attach_fake_transport(api: "gws_api.GoogleWorkspaceAPI", http: FakeGoogleHttp) -> None:
+    """
+    Point a GoogleWorkspaceAPI at the fake transport
+
+    Marks the client authenticated and replaces its service registry with
+    services bound to the transport. The API client is treated as available
+    even if google-api-python-client is not installed, since the stand-in
+    client takes its place.
+    """
+    gws_api.GOOGLE_API_AVAILABLE = True
+    api.authenticated = True
+    api.services = gws_api.LazyServiceRegistry(
+        lambda name: build_fake_service(api.api_services[name].service_name,
+                                        api.api_services[name].version, http))
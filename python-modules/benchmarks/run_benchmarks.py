@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+SCuBA assessment benchmark suite
+
+Times the three heavy Python entry points against fakes, so no tenant is
+needed:
+
+    scuba   ScubaCompliance.run_full_assessment over synthetic baselines,
+            with fake_gam.py standing in for GAM
+    api     GoogleWorkspaceAPI.get_comprehensive_security_snapshot over the
+            fake Google API transport
+    export  ComplianceDashboard.export_compliance_report of the results of
+            several assessments, in each export format
+
+Each scenario runs in its own process, so its peak RSS is its own. For every
+scenario the suite reports throughput, p50/p99 latency (per baseline check,
+API call or export) and peak RSS, and can save the results as a baseline or
+compare against a saved one.
+
+Usage:
+    python3 python-modules/benchmarks/run_benchmarks.py --save-baseline bench-baseline.json
+    python3 python-modules/benchmarks/run_benchmarks.py --compare bench-baseline.json
+    python3 python-modules/benchmarks/run_benchmarks.py --scenarios scuba --baselines 2000 --gam-latency 0.2
+
+Exits 1 if a scenario fails or, with --compare, if any metric regressed by
+more than --tolerance.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+FAKE_GAM = BENCHMARK_DIR / "fake_gam.py"
+
+SCENARIOS = ("scuba", "api", "export")
+
+# Metric -> True if higher is better
+METRICS = {
+    "throughput": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "peak_rss_mb": False
+}
+
+# Arguments that change what a scenario measures; compared against the baseline's
+SETTINGS = ("iterations", "baselines", "distinct_commands", "gam_latency", "gam_rows", "gam_failure_rate",
+            "max_gam_processes", "api_users", "api_activities", "api_latency", "api_failure_rate",
+            "api_rate_limits", "export_history", "export_formats")
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def scenario_result(iterations: int, items: int, seconds: float, latencies: List[float],
+                    details: Dict[str, Any]) -> Dict[str, Any]:
+    p50, p99 = percentile(latencies, 50), percentile(latencies, 99)
+    return {
+        "iterations": iterations,
+        "items": items,
+        "seconds": round(seconds, 3),
+        "throughput": round(items / seconds, 2) if seconds > 0 else None,
+        "p50_ms": round(p50 * 1000, 3) if p50 is not None else None,
+        "p99_ms": round(p99 * 1000, 3) if p99 is not None else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "details": details
+    }
+
+def set_fake_gam_environment(args: argparse.Namespace, latency: Optional[float] = None) -> None:
+    """Configure fake_gam.py through the environment GAM processes inherit"""
+    os.environ.update({
+        "FAKE_GAM_LATENCY": str(args.gam_latency if latency is None else latency),
+        "FAKE_GAM_ROWS": str(args.gam_rows),
+        "FAKE_GAM_FAILURE_RATE": str(args.gam_failure_rate),
+        "FAKE_GAM_SEED": str(args.seed)
+    })
+
+def prepare_assessment_database(args: argparse.Namespace, db_path: Path) -> int:
+    """Create a database holding only synthetic baselines; returns the baseline count"""
+    from scuba_compliance import ScubaCompliance
+    from synthetic_baselines import populate
+
+    ScubaCompliance(str(db_path))
+    return populate(str(db_path), args.baselines, args.distinct_commands, args.seed)
+
+def run_scuba(args: argparse.Namespace, work_dir: Path) -> Dict[str, Any]:
+    """Full assessments over synthetic baselines with the fake GAM"""
+    from scuba_compliance import ScubaCompliance
+
+    db_path = work_dir / "scuba.db"
+    prepare_assessment_database(args, db_path)
+    set_fake_gam_environment(args)
+
+    engine = ScubaCompliance(str(db_path), gam_path=str(FAKE_GAM))
+    engine.config['max_gam_processes'] = args.max_gam_processes
+
+    latencies = []
+    elapsed = 0.0
+    gam_commands = 0
+    for _ in range(args.iterations):
+        mark = engine.tracer.mark()
+        started = time.perf_counter()
+        summary = engine.run_full_assessment()
+        elapsed += time.perf_counter() - started
+        latencies.extend(span.duration for span in engine.tracer.spans(mark) if span.category == "baseline_check")
+        gam_commands += summary.get("gam_runner", {}).get("executions", 0)
+
+    return scenario_result(args.iterations, len(latencies), elapsed, latencies, {
+        "baselines": len(engine.baselines),
+        "gam_commands": gam_commands,
+        "assessment_seconds": round(elapsed / max(1, args.iterations), 3)
+    })
+
+def run_api(args: argparse.Namespace, work_dir: Path) -> Dict[str, Any]:
+    """Security snapshots over the fake Google API transport"""
+    from scuba_compliance import ScubaCompliance
+    from gws_api import GoogleWorkspaceAPI
+    from fake_google import FakeTenant, FakeGoogleHttp, attach_fake_transport
+
+    db_path = work_dir / "api.db"
+    ScubaCompliance(str(db_path))
+
+    rate_limits = None if args.api_rate_limits else {name: 1e9 for name in GoogleWorkspaceAPI.RATE_LIMITS}
+    api = GoogleWorkspaceAPI(str(db_path), credentials_path=str(work_dir / "no_credentials.json"),
+                             token_path=str(work_dir / "no_token.json"), rate_limits=rate_limits)
+    http = FakeGoogleHttp(FakeTenant(users=args.api_users, activities=args.api_activities, seed=args.seed),
+                          latency=args.api_latency, failure_rate=args.api_failure_rate)
+    attach_fake_transport(api, http)
+
+    latencies = []
+    elapsed = 0.0
+    for _ in range(args.iterations):
+        mark = api.tracer.mark()
+        started = time.perf_counter()
+        snapshot = api.get_comprehensive_security_snapshot()
+        elapsed += time.perf_counter() - started
+        if snapshot.get("error"):
+            raise RuntimeError(f"Snapshot failed: {snapshot['error']}")
+        latencies.extend(span.duration for span in api.tracer.spans(mark) if span.category == "api_call")
+
+    return scenario_result(args.iterations, len(latencies), elapsed, latencies, {
+        "http_requests": http.requests,
+        "injected_failures": http.failures,
+        "snapshot_seconds": round(elapsed / max(1, args.iterations), 3),
+        "api_metrics": api.get_api_metrics()
+    })
+
+def run_export(args: argparse.Namespace, work_dir: Path) -> Dict[str, Any]:
+    """Report exports of the stored results of several assessments"""
+    import sqlite3
+    from scuba_compliance import ScubaCompliance
+    from compliance_dashboard import ComplianceDashboard
+
+    db_path = work_dir / "export.db"
+    prepare_assessment_database(args, db_path)
+
+    # Results to export; GAM latency is irrelevant here
+    set_fake_gam_environment(args, latency=0)
+    engine = ScubaCompliance(str(db_path), gam_path=str(FAKE_GAM))
+    for _ in range(args.export_history):
+        engine.run_full_assessment()
+
+    with sqlite3.connect(str(db_path)) as conn:
+        result_rows = conn.execute("SELECT COUNT(*) FROM scuba_compliance_results").fetchone()[0]
+
+    dashboard = ComplianceDashboard(str(db_path))
+    latencies = []
+    for iteration in range(args.iterations):
+        for export_format in args.export_formats:
+            output_path = work_dir / "reports" / f"report_{iteration}.{export_format}"
+            started = time.perf_counter()
+            if not dashboard.export_compliance_report(str(output_path), export_format, include_history=True):
+                raise RuntimeError(f"{export_format} export failed")
+            latencies.append(time.perf_counter() - started)
+
+    return scenario_result(args.iterations, result_rows * len(latencies), sum(latencies), latencies, {
+        "history_rows": result_rows,
+        "exports": len(latencies),
+        "formats": args.export_formats
+    })
+
+def run_scenario(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one scenario in this process"""
+    logging.disable(logging.INFO)
+    runners = {"scuba": run_scuba, "api": run_api, "export": run_export}
+
+    if args.work_dir:
+        work_dir = Path(args.work_dir) / name
+        work_dir.mkdir(parents=True, exist_ok=True)
+        return runners[name](args, work_dir)
+
+    with tempfile.TemporaryDirectory(prefix=f"gwombat-bench-{name}-") as temp_dir:
+        return runners[name](args, Path(temp_dir))
+
+def run_scenario_process(name: str) -> Dict[str, Any]:
+    """Run one scenario in a child process, so peak RSS is measured per scenario"""
+    command = [sys.executable, str(Path(__file__).resolve())] + sys.argv[1:] + ["--run-scenario", name]
+    process = subprocess.run(command, stdout=subprocess.PIPE, universal_newlines=True)
+    lines = process.stdout.strip().splitlines()
+    if process.returncode != 0 or not lines:
+        return {"error": f"exited with status {process.returncode}"}
+    try:
+        return json.loads(lines[-1])
+    except ValueError:
+        return {"error": f"unexpected output: {lines[-1][:200]}"}
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+            tolerance: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare results against a saved baseline
+
+    Returns:
+        {scenario: {metric: {"baseline", "current", "change", "regressed"}}};
+        change is the relative difference (0.1 = 10% higher)
+    """
+    comparison = {}
+    for scenario, result in results.items():
+        previous = baseline.get("results", {}).get(scenario)
+        if not previous or "error" in result:
+            continue
+        comparison[scenario] = {}
+        for metric, higher_is_better in METRICS.items():
+            before, after = previous.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            regressed = change < -tolerance if higher_is_better else change > tolerance
+            comparison[scenario][metric] = {"baseline": before, "current": after,
+                                            "change": round(change, 4), "regressed": regressed}
+    return comparison
+
+def print_results(results: Dict[str, Dict[str, Any]], comparison: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    def show(value: Any, width: int = 11) -> str:
+        return ("-" if value is None else f"{value:.1f}" if isinstance(value, float) else str(value)).rjust(width)
+
+    print("\n📊 SCuBA Benchmark Results")
+    print("=" * 64)
+    print(f"{'Scenario':<10}{'Items':>9}{'Items/s':>11}{'p50 ms':>11}{'p99 ms':>11}{'Peak RSS MB':>12}")
+    for scenario, result in results.items():
+        if "error" in result:
+            print(f"{scenario:<10} ✗ {result['error']}")
+            continue
+        print(f"{scenario:<10}{show(result['items'], 9)}{show(result['throughput'])}{show(result['p50_ms'])}"
+              f"{show(result['p99_ms'])}{show(result['peak_rss_mb'], 12)}")
+
+    if comparison is None:
+        return
+    print("\nCompared with baseline")
+    print("-" * 64)
+    for scenario, metrics in comparison.items():
+        changes = ", ".join(f"{metric} {entry['change'] * 100:+.1f}%{' ✗' if entry['regressed'] else ''}"
+                            for metric, entry in metrics.items())
+        print(f"{scenario:<10}{changes}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SCuBA assessment, API snapshot and report export")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=3, help="Runs of each scenario")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--work-dir", help="Keep scenario databases and reports here (default: temporary)")
+
+    scuba = parser.add_argument_group("scuba scenario")
+    scuba.add_argument("--baselines", type=int, default=500, help="Synthetic baselines to assess")
+    scuba.add_argument("--distinct-commands", type=int, default=50, help="Distinct GAM commands shared by baselines")
+    scuba.add_argument("--gam-latency", type=float, default=0.05, help="Mean fake GAM seconds per command")
+    scuba.add_argument("--gam-rows", type=int, default=100, help="Records per fake GAM print/report")
+    scuba.add_argument("--gam-failure-rate", type=float, default=0.0, help="Fraction of fake GAM commands that fail")
+    scuba.add_argument("--max-gam-processes", type=int, default=10)
+
+    api = parser.add_argument_group("api scenario")
+    api.add_argument("--api-users", type=int, default=2000, help="Users in the fake tenant")
+    api.add_argument("--api-activities", type=int, default=5000, help="Activities per Reports application")
+    api.add_argument("--api-latency", type=float, default=0.02, help="Mean fake API seconds per request")
+    api.add_argument("--api-failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    api.add_argument("--api-rate-limits", action="store_true",
+                     help="Apply the production per-service rate limits (default: unlimited)")
+
+    export = parser.add_argument_group("export scenario")
+    export.add_argument("--export-history", type=int, default=3, help="Assessments whose results are exported")
+    export.add_argument("--export-formats", nargs="+", default=["json", "ndjson", "csv"],
+                        choices=["json", "json-compact", "ndjson", "csv"])
+
+    parser.add_argument("--save-baseline", metavar="FILE", help="Save results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Compare results with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Relative change counted as a regression (default: 0.25)")
+    parser.add_argument("--output", choices=["table", "json"], default="table")
+    parser.add_argument("--run-scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        print(json.dumps(run_scenario(args.run_scenario, args)))
+        return 0
+
+    results = {}
+    for scenario in args.scenarios:
+        print(f"Running {scenario} benchmark...", file=sys.stderr)
+        results[scenario] = run_scenario_process(scenario)
+
+    settings = {name: getattr(args, name) for name in SETTINGS}
+    comparison = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("settings") != settings:
+            print("Warning: baseline was recorded with different settings", file=sys.stderr)
+        comparison = compare(results, baseline, args.tolerance)
+
+    if args.output == "json":
+        print(json.dumps({"results": results, "comparison": comparison}, indent=2))
+    else:
+        print_results(results, comparison)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "settings": settings,
+                "results": results
+            }, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}", file=sys.stderr)
+
+    failed = any("error" in result for result in results.values())
+    regressed = any(entry["regressed"] for metrics in (comparison or {}).values() for entry in metrics.values())
+    return 1 if failed or regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
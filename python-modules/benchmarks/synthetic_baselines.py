@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Synthetic SCuBA baselines for benchmarks
+
+Fills scuba_baselines with generated baselines shaped like the real ones:
+mostly GAM configuration checks (some with check_logic rules, some matching
+expected_value as a substring, some piping through grep/head/wc), plus audit
+log and manual review items. Baselines share a pool of distinct GAM commands,
+as real baselines do, so the per-assessment GAM cache behaves realistically.
+
+Usage:
+    python3 python-modules/benchmarks/synthetic_baselines.py --db-path /tmp/bench.db --count 1000
+"""
+
+import sys
+import json
+import random
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Iterator, Tuple
+
+SERVICES = ("gmail", "calendar", "drive", "meet", "chat", "groups", "classroom", "sites", "common_controls")
+CRITICALITY = ("low", "medium", "high", "critical")
+
+# (GAM command template, check_logic or None, expected_value); {n} varies the command
+COMMAND_TEMPLATES = [
+    ("gam print users query \"orgUnitPath='/Dept {n}'\" fields primaryEmail,isEnforcedIn2Sv,suspended",
+     {"format": "csv", "rows": "any", "rule": {"field": "isEnforcedIn2Sv", "op": "eq", "value": True}}, None),
+    ("gam print groups query \"name:team{n}*\" fields email,whoCanJoin,allowExternalMembers",
+     {"format": "csv", "rule": {"field": "allowExternalMembers", "op": "eq", "value": False}}, None),
+    ("gam print admins role role{n}",
+     {"format": "csv", "rows": "none", "rule": {"field": "user", "op": "regex", "value": "@gmail\\.com$"}}, None),
+    ("gam info domain setting{n}",
+     {"format": "key_value", "rule": {"field": "Forwarding", "op": "in", "value": ["restricted", "disabled"]}}, None),
+    ("gam info domain setting{n} | grep -i sharing", None, "restricted"),
+    ("gam print users query \"orgUnitPath='/Dept {n}'\" fields isEnforcedIn2Sv | grep -c True", None, "1"),
+    ("gam report login user all page{n} | head -20", None, "login"),
+    ("gam print shareddrives query \"name contains 'drive{n}'\" | wc -l", None, "0")
+]
+
+SCHEMA_HINT = "Run scuba_compliance.py once against the database (or apply shared-config/scuba_compliance_schema.sql) first"
+
+def generate_baselines(count: int, distinct_commands: int = 50, seed: int = 1) -> Iterator[Tuple]:
+    """
+    Yield scuba_baselines rows
+
+    Args:
+        count: Number of baselines
+        distinct_commands: Size of the GAM command pool shared by configuration baselines
+        seed: Random seed, so the same arguments produce the same baselines
+
+    Yields:
+        (service_name, baseline_id, baseline_title, baseline_description,
+        requirement_text, criticality_level, compliance_check_type,
+        gam_command, expected_value, check_logic, remediation_steps, is_enabled)
+    """
+    rng = random.Random(seed)
+    pool = []
+    for n in range(max(1, distinct_commands)):
+        template, check_logic, expected_value = COMMAND_TEMPLATES[n % len(COMMAND_TEMPLATES)]
+        pool.append((template.format(n=n), json.dumps(check_logic) if check_logic else None, expected_value))
+
+    for index in range(count):
+        service = SERVICES[index % len(SERVICES)]
+        roll = rng.random()
+        if roll < 0.8:
+            check_type = "configuration"
+            gam_command, check_logic, expected_value = rng.choice(pool)
+        elif roll < 0.9:
+            check_type, gam_command, check_logic, expected_value = "audit_log", None, None, "enabled"
+        else:
+            check_type, gam_command, check_logic, expected_value = "manual", None, None, None
+
+        baseline_id = f"GWS.BENCH.{service.upper()}.{index}v1"
+        yield (
+            service, baseline_id, f"Synthetic baseline {index}",
+            f"Synthetic {check_type} baseline for benchmarks",
+            f"The organization SHALL satisfy synthetic requirement {index}",
+            rng.choice(CRITICALITY), check_type, gam_command, expected_value, check_logic,
+            "No remediation - synthetic baseline", 1
+        )
+
+def populate(db_path: str, count: int, distinct_commands: int = 50, seed: int = 1,
+             replace_existing: bool = True) -> int:
+    """
+    Write synthetic baselines and enable every service
+
+    Args:
+        db_path: GWOMBAT database with the SCuBA schema applied
+        count: Number of baselines
+        distinct_commands: Size of the shared GAM command pool
+        seed: Random seed
+        replace_existing: Disable all existing baselines, so only the synthetic ones are assessed
+
+    Returns:
+        Number of enabled baselines
+    """
+    with sqlite3.connect(db_path) as conn:
+        try:
+            conn.execute("SELECT 1 FROM scuba_baselines LIMIT 1")
+        except sqlite3.OperationalError:
+            raise RuntimeError(f"{db_path} has no scuba_baselines table. {SCHEMA_HINT}")
+
+        if replace_existing:
+            conn.execute("UPDATE scuba_baselines SET is_enabled = 0")
+            conn.execute("DELETE FROM scuba_baselines WHERE baseline_id LIKE 'GWS.BENCH.%'")
+
+        conn.executemany("""
+            INSERT OR REPLACE INTO scuba_baselines (
+                service_name, baseline_id, baseline_title, baseline_description,
+                requirement_text, criticality_level, compliance_check_type,
+                gam_command, expected_value, check_logic, remediation_steps, is_enabled
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, generate_baselines(count, distinct_commands, seed))
+
+        conn.execute("UPDATE scuba_feature_config SET is_enabled = 1 WHERE feature_category = 'service'")
+        conn.commit()
+        return conn.execute("SELECT COUNT(*) FROM scuba_baselines WHERE is_enabled = 1").fetchone()[0]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic SCuBA baselines")
+    parser.add_argument("--db-path", required=True, help="Database to populate (schema is created if missing)")
+    parser.add_argument("--count", type=int, default=1000, help="Number of baselines")
+    parser.add_argument("--distinct-commands", type=int, default=50, help="Size of the shared GAM command pool")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep-existing", action="store_true", help="Leave existing baselines enabled")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from scuba_compliance import ScubaCompliance
+
+    # Constructing the engine applies the schema
+    ScubaCompliance(args.db_path)
+    enabled = populate(args.db_path, args.count, args.distinct_commands, args.seed,
+                       replace_existing=not args.keep_existing)
+    print(f"{enabled} baselines enabled in {args.db_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
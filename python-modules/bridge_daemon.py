@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Persistent Bridge Daemon for GWOMBAT
+Long-lived worker process for the bash-to-Python bridge
+
+Every bridge action used to start a fresh Python process that re-imported the
+modules, re-ran the schema bootstrap and reloaded baselines. This daemon keeps
+ScubaCompliance, ComplianceDashboard and GoogleWorkspaceAPI instances warm and
+serves requests over a Unix domain socket using a line-based JSON protocol:
+
+    request:  {"action": "dashboard", ...}\\n
+    response: {"ok": true, "exit_code": 0, "output": "...", "result": ...}\\n
+
+The same file is also the client used by scuba_compliance_bridge.sh, and only
+imports the standard library until the daemon is actually started.
+"""
+
+import io
+import os
+import sys
+import json
+import socket
+import signal
+import logging
+import threading
+import socketserver
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Client exit code meaning "daemon not reachable, fall back to one-shot mode"
+EXIT_UNAVAILABLE = 3
+
+DEFAULT_SOCKET_PATH = "./config/scuba_bridge.sock"
+
+def _import_module(name: str) -> Any:
+    """Import a sibling module whether running as a package or as a script"""
+    import importlib
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
+
+class BridgeWorker:
+    """
+    Warm GWOMBAT Python instances and the request handlers that use them
+
+    Instances are created on first use and reused for every later request.
+    Requests are handled one at a time, so instances are never shared
+    between concurrent callers.
+    """
+
+    def __init__(self, db_path: str, gam_path: str = "gam",
+                 credentials_path: str = "./config/gws_credentials.json"):
+        self.db_path = str(Path(db_path).resolve())
+        self.gam_path = gam_path
+        self.credentials_path = str(Path(credentials_path).resolve())
+        self._scuba = None
+        self._dashboard = None
+        self._gws_api = None
+        self.requests_served = 0
+
+    @property
+    def scuba(self) -> Any:
+        if self._scuba is None:
+            self._scuba = _import_module("scuba_compliance").ScubaCompliance(self.db_path, self.gam_path)
+        return self._scuba
+
+    @property
+    def dashboard(self) -> Any:
+        if self._dashboard is None:
+            self._dashboard = _import_module("compliance_dashboard").ComplianceDashboard(self.db_path)
+        return self._dashboard
+
+    @property
+    def gws_api(self) -> Any:
+        if self._gws_api is None:
+            self._gws_api = _import_module("gws_api").GoogleWorkspaceAPI(self.db_path, self.credentials_path)
+        return self._gws_api
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a request to its action handler, capturing printed output"""
+        action = request.get("action", "")
+        handler = getattr(self, f"_action_{action.replace('-', '_')}", None)
+        if handler is None:
+            return {"ok": False, "exit_code": 2, "error": f"Unknown action: {action}"}
+
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                try:
+                    result = handler(request, buffer)
+                finally:
+                    self._clear_spans()
+            self.requests_served += 1
+            exit_code = 0 if result is not False else 1
+            return {
+                "ok": exit_code == 0,
+                "exit_code": exit_code,
+                "output": buffer.getvalue(),
+                "result": result if isinstance(result, (dict, list)) else None
+            }
+        except Exception as e:
+            logger.error(f"Bridge action {action} failed: {e}")
+            return {"ok": False, "exit_code": 1, "output": buffer.getvalue(), "error": str(e)}
+
+    def _clear_spans(self) -> None:
+        """
+        Drop the timing spans of the warm instances
+
+        Each request saves its own metrics; without this the instances'
+        tracers would grow with every request until they hit max_spans and
+        silently stopped recording.
+        """
+        for instance in (self._scuba, self._dashboard, self._gws_api):
+            tracer = getattr(instance, "tracer", None)
+            if tracer is not None:
+                tracer.clear()
+
+    def _action_ping(self, request: Dict[str, Any], buffer: io.StringIO) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "db_path": self.db_path,
+            "requests_served": self.requests_served,
+            "warm": [name for name, instance in (("scuba", self._scuba), ("dashboard", self._dashboard),
+                                                 ("gws_api", self._gws_api)) if instance is not None]
+        }
+
+    def _action_reload(self, request: Dict[str, Any], buffer: io.StringIO) -> None:
+        """Drop all warm instances so the next request rebuilds them"""
+        self._scuba = None
+        self._dashboard = None
+        self._gws_api = None
+        print("Bridge daemon instances reloaded")
+
+    def _action_dashboard(self, request: Dict[str, Any], buffer: io.StringIO) -> None:
+        dashboard = self.dashboard
+        if _import_module("compliance_dashboard").RICH_AVAILABLE:
+            # Render with terminal styling into the captured output
+            from rich.console import Console
+            dashboard._console = Console(file=buffer, force_terminal=request.get("color", True),
+                                         width=request.get("columns"))
+        dashboard.display_compliance_dashboard()
+
+    def _action_summary(self, request: Dict[str, Any], buffer: io.StringIO) -> None:
+        summary = self.dashboard.generate_executive_summary()
+        print(json.dumps(summary, indent=2, default=str))
+
+    def _action_export(self, request: Dict[str, Any], buffer: io.StringIO) -> bool:
+        output_path = request.get("path")
+        if not output_path:
+            print("Error: path required for export action")
+            return False
+        return self.dashboard.export_compliance_report(output_path, request.get("format") or "json",
+                                                       start_date=request.get("start_date"),
+                                                       end_date=request.get("end_date"),
+                                                       services=request.get("services") or None,
+                                                       include_history=bool(request.get("include_history")))
+
+    def _action_assess(self, request: Dict[str, Any], buffer: io.StringIO) -> Dict[str, Any]:
+        scuba = self.scuba
+        # Baseline definitions may have changed since the last request; the
+        # reload is a single query, unlike constructing a new engine
+        scuba.baselines = scuba._load_baselines()
+        results = scuba.run_full_assessment(request.get("services") or None,
+                                            incremental=bool(request.get("incremental")))
+        _import_module("scuba_compliance").print_assessment_results(results, request.get("output") or "table")
+        return results
+
+    def _action_security_snapshot(self, request: Dict[str, Any], buffer: io.StringIO) -> Dict[str, Any]:
+        snapshot = self.gws_api.get_comprehensive_security_snapshot()
+        print(json.dumps(snapshot, indent=2, default=str))
+        return snapshot
+
+class _BridgeRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request line per connection"""
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        try:
+            request = json.loads(line.decode("utf-8"))
+        except ValueError as e:
+            response = {"ok": False, "exit_code": 2, "error": f"Invalid request: {e}"}
+        else:
+            if request.get("action") == "shutdown":
+                response = {"ok": True, "exit_code": 0, "output": "Bridge daemon stopping\n"}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                response = self.server.worker.handle(request)
+
+        self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+
+class BridgeServer(socketserver.UnixStreamServer):
+    """Unix socket server handling bridge requests sequentially"""
+
+    def __init__(self, socket_path: str, worker: BridgeWorker):
+        self.worker = worker
+        super().__init__(socket_path, _BridgeRequestHandler)
+
+def send_request(socket_path: str, request: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Send a request to a running daemon and return its response
+
+    Raises:
+        OSError: If the daemon is not reachable
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+
+    return json.loads(b"".join(chunks).decode("utf-8"))
+
+def is_running(socket_path: str) -> bool:
+    """Check whether a daemon is answering on socket_path"""
+    try:
+        return bool(send_request(socket_path, {"action": "ping"}, timeout=2).get("ok"))
+    except (OSError, ValueError):
+        return False
+
+def serve(socket_path: str, db_path: str, gam_path: str, credentials_path: str) -> int:
+    """Run the daemon until it receives a shutdown request or SIGTERM"""
+    if os.path.exists(socket_path):
+        if is_running(socket_path):
+            print(f"Bridge daemon already running on {socket_path}")
+            return 1
+        os.unlink(socket_path)  # Stale socket from a previous run
+
+    Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+    worker = BridgeWorker(db_path, gam_path, credentials_path)
+
+    # Socket is only accessible to the user running GWOMBAT
+    old_umask = os.umask(0o177)
+    try:
+        server = BridgeServer(socket_path, worker)
+    finally:
+        os.umask(old_umask)
+
+    def handle_sigterm(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    logger.info(f"Bridge daemon listening on {socket_path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        logger.info("Bridge daemon stopped")
+    return 0
+
+def main() -> int:
+    """Command-line interface for the bridge daemon and its client"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GWOMBAT Python Bridge Daemon")
+    parser.add_argument("command", choices=["serve", "call", "status", "stop"], help="Daemon command")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Path to the daemon's Unix socket")
+    parser.add_argument("--db-path", default="./config/gwombat.db", help="Path to GWOMBAT database (serve)")
+    parser.add_argument("--gam-path", default="gam", help="Path to GAM executable (serve)")
+    parser.add_argument("--credentials", default="./config/gws_credentials.json",
+                       help="Path to Google OAuth2 credentials (serve)")
+    parser.add_argument("--action", help="Action to request (call)")
+    parser.add_argument("--services", nargs="*", help="Services to assess or export (call assess/export)")
+    parser.add_argument("--output", choices=["json", "table"], help="Assessment output format (call assess)")
+    parser.add_argument("--incremental", action="store_true", help="Run an incremental assessment (call assess)")
+    parser.add_argument("--path", help="Report output path (call export)")
+    parser.add_argument("--format", help="Report format (call export)")
+    parser.add_argument("--start-date", help="Export history on or after this date (call export)")
+    parser.add_argument("--end-date", help="Export history on or before this date (call export)")
+    parser.add_argument("--include-history", action="store_true", help="Export all stored results (call export)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+    if args.command == "serve":
+        return serve(args.socket, args.db_path, args.gam_path, args.credentials)
+
+    if args.command == "status":
+        try:
+            response = send_request(args.socket, {"action": "ping"}, timeout=2)
+        except (OSError, ValueError):
+            print("Bridge daemon: not running")
+            return EXIT_UNAVAILABLE
+        info = response.get("result") or {}
+        print(f"Bridge daemon: running (pid {info.get('pid')}, {info.get('requests_served')} requests served)")
+        print(f"Database: {info.get('db_path')}")
+        print(f"Warm instances: {', '.join(info.get('warm') or []) or 'none'}")
+        return 0
+
+    if args.command == "stop":
+        request = {"action": "shutdown"}
+    else:
+        if not args.action:
+            print("Error: --action required for call")
+            return 2
+        request = {"action": args.action, "services": args.services, "output": args.output,
+                   "incremental": args.incremental,
+                   "path": args.path, "format": args.format, "start_date": args.start_date,
+                   "end_date": args.end_date, "include_history": args.include_history,
+                   "color": sys.stdout.isatty()}
+
+    try:
+        response = send_request(args.socket, request)
+    except (OSError, ValueError):
+        return EXIT_UNAVAILABLE
+
+    if response.get("output"):
+        sys.stdout.write(response["output"])
+    if response.get("error"):
+        print(f"Error: {response['error']}", file=sys.stderr)
+    return int(response.get("exit_code", 1))
+
+if __name__ == "__main__":
+    sys.exit(main())
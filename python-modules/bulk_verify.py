@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Bulk Account Verification for GWOMBAT
+Parallel, resumable verification of every account in a list
+
+bulk_verify_list in database_functions.sh called verify_account_state for
+one account at a time, each call running several GAM lookups and sqlite3
+processes. This module runs the same checks for many accounts at once:
+
+- a bounded pool of workers runs the GAM lookups, with an optional cap on
+  GAM commands started per second
+- results are written to verification_status in batches, one transaction
+  per batch
+- progress is checkpointed in operation_progress, so an interrupted run
+  resumes after the last account whose verification (and every one before
+  it) was recorded
+- throughput and an ETA are printed while the run is in progress
+
+    python3 python-modules/bulk_verify.py --list scan_20240601_pending_deletion --workers 8 --rate-limit 5
+    python3 python-modules/bulk_verify.py --list my_list --stage temporary_hold --no-resume
+"""
+
+import sys
+import json
+import time
+import shlex
+import sqlite3
+import logging
+import argparse
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional, Tuple, TextIO
+
+try:
+    from .gam_runner import GamRunner
+    from .instrumentation import Tracer, add_cli_arguments, cli_instrumentation
+except ImportError:
+    from gam_runner import GamRunner
+    from instrumentation import Tracer, add_cli_arguments, cli_instrumentation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 100
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 2.0
+
+# Checks run for each stage, in the order verify_account_state runs them
+STAGE_CHECKS = {
+    "recently_suspended": ("suspension_status",),
+    "pending_deletion": ("ou_placement", "lastname_marker", "file_markers"),
+    "temporary_hold": ("ou_placement", "lastname_marker"),
+    "exit_row": ("ou_placement",)
+}
+
+OU_MARKERS = {
+    "pending_deletion": "Pending Deletion",
+    "temporary_hold": "Temporary Hold",
+    "exit_row": "Exit Row"
+}
+
+LASTNAME_MARKERS = {
+    "pending_deletion": "PENDING DELETION",
+    "temporary_hold": "Suspended Account - Temporary Hold"
+}
+
+# "gam info user" keys for each field, first match wins
+INFO_KEYS = {
+    "ou_path": ("Org Unit Path",),
+    "last_name": ("Family Name", "Last Name"),
+    "suspended": ("Suspended", "Account Suspended", "Is Suspended")
+}
+
+# Candidate locations of the schema that defines operation_progress, relative to this module
+PROGRESS_SCHEMA_FILES = [
+    Path("..") / "shared-config" / "dashboard_schema.sql",
+    Path("..") / "dashboard_schema.sql"
+]
+
+class BulkVerifyError(RuntimeError):
+    """Raised when a list cannot be verified"""
+
+@dataclass
+class AccountVerification:
+    """Check results for one account"""
+    account_id: int
+    email: str
+    # (verification_type, status, details)
+    results: List[Tuple[str, str, str]] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        """At least one check verified, as verify_account_state reports success"""
+        return any(status == "verified" for _, status, _ in self.results)
+
+@dataclass
+class VerifyStats:
+    """Counts for one bulk verification run"""
+    list_name: str
+    stage: str
+    operation_id: str
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    resumed_from: int = 0  # Accounts already verified by an interrupted run
+    verified_this_run: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    status: str = "running"
+    failed_accounts: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.verified_this_run / self.seconds if self.seconds > 0 else 0.0
+
+def parse_user_info(output: str) -> Dict[str, str]:
+    """Fields verify_account_state reads from "gam info user" output"""
+    values = {}
+    for line in output.splitlines():
+        key, separator, value = line.partition(":")
+        if separator:
+            values.setdefault(key.strip(), value.strip())
+    return {name: next((values[key] for key in keys if key in values), "")
+            for name, keys in INFO_KEYS.items()}
+
+def verify_account(runner: GamRunner, account_id: int, email: str, stage: str) -> AccountVerification:
+    """
+    Run the stage checks for one account
+
+    Args:
+        runner: GAM runner (bounds concurrency and rate)
+        account_id: accounts.id of the account
+        email: Account email
+        stage: Expected lifecycle stage
+    """
+    verification = AccountVerification(account_id, email)
+    success, output, _ = runner.run(f"gam info user {shlex.quote(email)}")
+    if not success:
+        verification.results.append(("user_exists", "failed", "User not found in GAM"))
+        return verification
+
+    info = parse_user_info(output)
+    ou_path, last_name = info["ou_path"], info["last_name"]
+    for check in STAGE_CHECKS.get(stage, ()):
+        if check == "suspension_status":
+            if info["suspended"] == "True":
+                verification.results.append((check, "verified", "User correctly suspended"))
+            else:
+                verification.results.append((check, "failed", "User not suspended"))
+        elif check == "ou_placement":
+            if OU_MARKERS[stage] in ou_path:
+                verification.results.append((check, "verified", f"In correct OU: {ou_path}"))
+            else:
+                verification.results.append((check, "failed", f"Wrong OU: {ou_path}"))
+        elif check == "lastname_marker":
+            status = "verified" if LASTNAME_MARKERS[stage] in last_name else "failed"
+            verification.results.append((check, status, f"Lastname: {last_name}"))
+        elif check == "file_markers":
+            # Sample the first few files, as verify_account_state does
+            _, files, _ = runner.run(f"gam user {shlex.quote(email)} print filelist fields id,name | head -5")
+            marked = sum(1 for line in files.splitlines() if "PENDING DELETION" in line)
+            if marked:
+                verification.results.append((check, "verified", f"Sample files marked: {marked}"))
+            else:
+                verification.results.append((check, "failed", "No markers in sample files"))
+    return verification
+
+class ProgressReporter:
+    """Live progress line: position, pass/fail counts, throughput and ETA"""
+
+    def __init__(self, total: int, already_done: int, out: TextIO = sys.stderr):
+        self.total = total
+        self.already_done = already_done
+        self.out = out
+        self.interactive = hasattr(out, "isatty") and out.isatty()
+        self.started = time.monotonic()
+        self._last = 0.0
+
+    def update(self, done: int, passed: int, failed: int, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last < PROGRESS_INTERVAL:
+            return
+        self._last = now
+
+        elapsed = now - self.started
+        rate = (done - self.already_done) / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - done
+        eta = str(timedelta(seconds=int(remaining / rate))) if rate > 0 else "--:--:--"
+        percent = done * 100.0 / self.total if self.total else 100.0
+        line = (f"  [{done}/{self.total}] {percent:5.1f}% | passed {passed} failed {failed} | "
+                f"{rate:.1f} accounts/s | ETA {eta}")
+        self.out.write(f"\r{line}  " if self.interactive else f"{line}\n")
+        self.out.flush()
+
+    def finish(self) -> None:
+        if self.interactive:
+            self.out.write("\n")
+            self.out.flush()
+
+class BulkVerifier:
+    """
+    Verifies the accounts of a list in parallel and records the results
+
+    Usage:
+        runner = GamRunner(gam_path, max_processes=8, command_timeout=60, rate_limit=5)
+        verifier = BulkVerifier(db_path, runner, workers=8, session_id=session_id)
+        stats = verifier.run("scan_20240601_pending_deletion")
+    """
+
+    def __init__(self, db_path: str, runner: GamRunner, workers: int = DEFAULT_WORKERS,
+                 batch_size: int = DEFAULT_BATCH_SIZE, session_id: Optional[str] = None,
+                 tracer: Optional[Tracer] = None, progress_out: Optional[TextIO] = sys.stderr):
+        """
+        Initialize bulk verifier
+
+        Args:
+            db_path: GWOMBAT database with the account lifecycle schema
+            runner: GAM runner shared by all workers
+            workers: Accounts verified at once
+            batch_size: Accounts whose results are written per transaction
+            session_id: Session recorded on the progress row
+            tracer: Span collector for timing data (one is created if omitted)
+            progress_out: Stream for live progress (None to disable)
+        """
+        self.db_path = Path(db_path)
+        self.runner = runner
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.session_id = session_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_bulk_verify"
+        self.tracer = tracer or Tracer("bulk_verify")
+        self.progress_out = progress_out
+
+    def _ensure_progress_table(self, conn: sqlite3.Connection) -> None:
+        """Create operation_progress from the dashboard schema if this database lacks it"""
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'operation_progress'").fetchone():
+            return
+        schema_path = next((Path(__file__).parent / candidate for candidate in PROGRESS_SCHEMA_FILES
+                            if (Path(__file__).parent / candidate).exists()), None)
+        if schema_path is None:
+            raise BulkVerifyError("operation_progress table missing and dashboard schema file not found")
+        with open(schema_path, "r") as f:
+            conn.executescript(f.read())
+
+    def _target_stage(self, conn: sqlite3.Connection, list_name: str) -> str:
+        row = conn.execute("SELECT target_stage FROM account_lists WHERE name = ?", (list_name,)).fetchone()
+        if row is None or not row[0]:
+            raise BulkVerifyError(f"No target stage found for list {list_name}")
+        return row[0]
+
+    def _list_accounts(self, conn: sqlite3.Connection, list_name: str) -> List[Tuple[int, str]]:
+        return conn.execute("""
+            SELECT a.id, a.email
+            FROM accounts a
+            JOIN account_list_memberships alm ON a.id = alm.account_id
+            JOIN account_lists l ON alm.list_id = l.id
+            WHERE l.name = ?
+            ORDER BY a.id
+        """, (list_name,)).fetchall()
+
+    def _start_operation(self, conn: sqlite3.Connection, stats: VerifyStats, accounts: List[Tuple[int, str]],
+                         resume: bool) -> int:
+        """
+        Create or resume the progress row
+
+        Returns:
+            Number of leading accounts already verified by an interrupted run
+        """
+        row = conn.execute("""
+            SELECT status, current_item, completed_items, failed_items
+            FROM operation_progress WHERE operation_id = ?
+        """, (stats.operation_id,)).fetchone()
+
+        skip = 0
+        if resume and row and row[0] != "completed" and row[1]:
+            skip = next((index + 1 for index, (_, email) in enumerate(accounts) if email == row[1]), 0)
+            if skip:
+                stats.failed = row[3] or 0
+                stats.passed = (row[2] or 0) - stats.failed
+
+        with conn:
+            if skip:
+                conn.execute("""
+                    UPDATE operation_progress
+                    SET status = 'running', session_id = ?, total_items = ?, error_message = NULL, completion_time = NULL
+                    WHERE operation_id = ?
+                """, (self.session_id, len(accounts), stats.operation_id))
+            else:
+                conn.execute("""
+                    INSERT OR REPLACE INTO operation_progress (
+                        operation_id, session_id, operation_type, operation_name, total_items, status
+                    ) VALUES (?, ?, 'bulk_verify', ?, ?, 'running')
+                """, (stats.operation_id, self.session_id, f"Verify {stats.list_name} ({stats.stage})", len(accounts)))
+        return skip
+
+    def _write_batch(self, conn: sqlite3.Connection, stats: VerifyStats, results: List[AccountVerification],
+                     checkpoint: Optional[str], done: int, reporter_rate: float) -> None:
+        """Write a batch of results and the checkpoint in one transaction"""
+        remaining = stats.total - done
+        eta = (datetime.now() + timedelta(seconds=remaining / reporter_rate)).strftime("%Y-%m-%d %H:%M:%S") \
+            if reporter_rate > 0 else None
+        with self.tracer.span("write_batch", "db", accounts=len(results)):
+            with conn:
+                # Replace the account's earlier results for this stage, so a check
+                # that no longer applies (e.g. user_exists) does not linger
+                conn.executemany("DELETE FROM verification_status WHERE account_id = ? AND stage = ?",
+                                 [(result.account_id, stats.stage) for result in results])
+                conn.executemany("""
+                    INSERT INTO verification_status (account_id, stage, verification_type, status, details, verified_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, [(result.account_id, stats.stage, check, status, details)
+                      for result in results for check, status, details in result.results])
+                conn.executemany("UPDATE accounts SET last_verified_at = CURRENT_TIMESTAMP WHERE id = ?",
+                                 [(result.account_id,) for result in results])
+                conn.execute("""
+                    UPDATE operation_progress
+                    SET completed_items = ?, failed_items = ?, current_item = COALESCE(?, current_item),
+                        estimated_completion = ?
+                    WHERE operation_id = ?
+                """, (stats.passed + stats.failed, stats.failed, checkpoint, eta, stats.operation_id))
+        stats.batches += 1
+
+    def _finish_operation(self, conn: sqlite3.Connection, stats: VerifyStats, error: Optional[str] = None) -> None:
+        with conn:
+            conn.execute("""
+                UPDATE operation_progress
+                SET status = ?, error_message = ?, completion_time = CASE WHEN ? = 'completed' THEN CURRENT_TIMESTAMP END
+                WHERE operation_id = ?
+            """, (stats.status, error, stats.status, stats.operation_id))
+
+    def run(self, list_name: str, stage: Optional[str] = None, resume: bool = True) -> VerifyStats:
+        """
+        Verify every account in a list
+
+        Workers run the GAM checks; this thread writes their results. The
+        checkpoint only advances over a contiguous run of recorded accounts
+        (in account id order), so accounts finished out of order after the
+        checkpoint are verified again on resume rather than skipped.
+
+        Args:
+            list_name: Account list to verify
+            stage: Expected stage (default: the list's target stage)
+            resume: Continue an interrupted run of the same list and stage
+
+        Raises:
+            BulkVerifyError: If the list has no target stage or progress cannot be tracked
+            KeyboardInterrupt: After recording the results gathered so far and marking the run cancelled
+        """
+        started = time.perf_counter()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            stage = stage or self._target_stage(conn, list_name)
+            self._ensure_progress_table(conn)
+            accounts = self._list_accounts(conn, list_name)
+            stats = VerifyStats(list_name=list_name, stage=stage, operation_id=f"bulk_verify:{list_name}:{stage}",
+                                total=len(accounts))
+            if not accounts:
+                stats.status = "completed"
+                return stats
+
+            skip = self._start_operation(conn, stats, accounts, resume)
+            stats.resumed_from = skip
+            reporter = ProgressReporter(len(accounts), skip, self.progress_out) if self.progress_out else None
+
+            try:
+                self._verify(conn, stats, accounts, skip, reporter)
+                stats.status = "completed"
+                self._finish_operation(conn, stats)
+            except KeyboardInterrupt:
+                stats.status = "cancelled"
+                self._finish_operation(conn, stats, "Interrupted - rerun to resume")
+                raise
+            except Exception as e:
+                stats.status = "failed"
+                self._finish_operation(conn, stats, str(e))
+                raise
+            finally:
+                if reporter:
+                    reporter.finish()
+                stats.seconds = round(time.perf_counter() - started, 3)
+        finally:
+            conn.close()
+        return stats
+
+    def _verify(self, conn: sqlite3.Connection, stats: VerifyStats, accounts: List[Tuple[int, str]],
+                skip: int, reporter: Optional[ProgressReporter]) -> None:
+        queue = iter(range(skip, len(accounts)))
+        finished: Dict[int, bool] = {}  # Account index -> passed, for results past the checkpoint
+        next_index = skip  # First account not yet covered by the checkpoint
+        pending_results: List[AccountVerification] = []
+        checkpoint = None
+        run_started = time.monotonic()
+
+        def flush() -> None:
+            nonlocal pending_results, checkpoint
+            elapsed = time.monotonic() - run_started
+            rate = stats.verified_this_run / elapsed if elapsed > 0 else 0.0
+            self._write_batch(conn, stats, pending_results, checkpoint, next_index, rate)
+            pending_results, checkpoint = [], None
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk_verify") as executor:
+            futures = {}
+
+            def submit_next() -> None:
+                index = next(queue, None)
+                if index is not None:
+                    account_id, email = accounts[index]
+                    futures[executor.submit(self._verify_one, account_id, email, stats.stage)] = index
+
+            try:
+                # Keep a short queue ahead of the workers rather than submitting the whole list
+                for _ in range(self.workers * 2):
+                    submit_next()
+
+                while futures:
+                    done, _ = wait(list(futures), timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = futures.pop(future)
+                        result = future.result()
+                        pending_results.append(result)
+                        finished[index] = result.passed
+                        stats.verified_this_run += 1
+                        submit_next()
+
+                    # Advance the checkpoint over the contiguous run of recorded accounts
+                    while next_index in finished:
+                        if finished.pop(next_index):
+                            stats.passed += 1
+                        else:
+                            stats.failed += 1
+                            if len(stats.failed_accounts) < 20:
+                                stats.failed_accounts.append(accounts[next_index][1])
+                        checkpoint = accounts[next_index][1]
+                        next_index += 1
+
+                    if len(pending_results) >= self.batch_size:
+                        flush()
+                    if reporter:
+                        reporter.update(next_index + len(finished), stats.passed + sum(finished.values()),
+                                        stats.failed + len(finished) - sum(finished.values()))
+            except KeyboardInterrupt:
+                # Stop outstanding GAM commands; queued accounts then finish immediately
+                self.runner.cancel()
+                raise
+            finally:
+                if pending_results:
+                    flush()
+
+        if reporter:
+            reporter.update(next_index, stats.passed, stats.failed, force=True)
+
+    def _verify_one(self, account_id: int, email: str, stage: str) -> AccountVerification:
+        with self.tracer.span("verify_account", "gam"):
+            try:
+                return verify_account(self.runner, account_id, email, stage)
+            except Exception as e:
+                logger.error(f"Verification of {email} failed: {e}")
+                return AccountVerification(account_id, email, [("user_exists", "failed", f"Verification error: {e}")])
+
+def print_summary(stats: VerifyStats) -> None:
+    """Final counts in the layout bulk_verify_list has always shown"""
+    print("\033[0;34m=== Bulk Verification Complete ===\033[0m")
+    print(f"\033[0;32mPassed: {stats.passed}\033[0m")
+    print(f"\033[0;31mFailed: {stats.failed}\033[0m")
+    print(f"\033[0;36mTotal: {stats.total}\033[0m")
+    if stats.resumed_from:
+        print(f"Resumed after {stats.resumed_from} accounts verified by an earlier run")
+    print(f"Verified {stats.verified_this_run} accounts in {stats.seconds:.1f}s "
+          f"({stats.throughput:.1f} accounts/s)")
+    if stats.failed_accounts:
+        print("Failed accounts" + (" (first 20)" if stats.failed > len(stats.failed_accounts) else "") + ":")
+        for email in stats.failed_accounts:
+            print(f"  {email}")
+
+def main():
+    """Command-line interface for database_functions.sh"""
+    parser = argparse.ArgumentParser(description="Verify the accounts of a list in parallel")
+    parser.add_argument("--list", required=True, dest="list_name", help="Account list to verify")
+    parser.add_argument("--stage", help="Expected stage (default: the list's target stage)")
+    parser.add_argument("--db-path", default="./local-config/gwombat.db", help="Path to GWOMBAT database")
+    parser.add_argument("--session-id", help="Session recorded on the progress row")
+    parser.add_argument("--gam-path", default="gam", help="Path to GAM executable")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Accounts verified at once")
+    parser.add_argument("--rate-limit", type=float, default=0,
+                        help="Maximum GAM commands started per second (default: unlimited)")
+    parser.add_argument("--command-timeout", type=float, default=60, help="Seconds before a GAM command is killed")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Accounts whose results are written per transaction")
+    parser.add_argument("--no-resume", action="store_true", help="Start over instead of resuming an interrupted run")
+    parser.add_argument("--quiet", action="store_true", help="Do not print live progress")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    add_cli_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    tracer = Tracer("bulk_verify")
+    runner = GamRunner(args.gam_path, max_processes=args.workers, command_timeout=args.command_timeout,
+                       rate_limit=args.rate_limit or None)
+    verifier = BulkVerifier(args.db_path, runner, workers=args.workers, batch_size=args.batch_size,
+                            session_id=args.session_id, tracer=tracer,
+                            progress_out=None if args.quiet else sys.stderr)
+
+    with cli_instrumentation(args, tracer):
+        try:
+            stats = verifier.run(args.list_name, args.stage, resume=not args.no_resume)
+        except KeyboardInterrupt:
+            print("\nInterrupted - progress saved; run again to resume", file=sys.stderr)
+            return 130
+        except (BulkVerifyError, sqlite3.Error) as e:
+            logger.error(f"Bulk verification failed: {e}")
+            return 1
+        tracer.save_metrics(args.db_path, verifier.session_id)
+
+    if args.output == "json":
+        result = asdict(stats)
+        result["throughput"] = round(stats.throughput, 2)
+        result["gam_runner"] = runner.get_stats()
+        print(json.dumps(result, indent=2))
+    elif stats.total == 0:
+        print(f"\033[1;33mNo accounts found in list: {args.list_name}\033[0m")
+    else:
+        print_summary(stats)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
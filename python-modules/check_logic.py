@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Check Logic Rule Engine for GWOMBAT
+Compiles SCuBA baseline check_logic JSON into reusable predicates
+
+A baseline's check_logic is compiled once when baselines are loaded and then
+evaluated against GAM output for every assessment. Given a parse cache
+scoped to the assessment, output is parsed once per distinct GAM output
+(shared by every baseline that ran the same command), and rules compare
+extracted field values instead of scanning the raw text.
+
+check_logic format:
+
+    {
+        "format": "csv",            # text (default), lines, key_value, csv or json
+        "rows": "all",              # all (default), any or none of the records must match
+        "rule": {"all": [
+            {"field": "mfaEnforced", "op": "eq", "value": true},
+            {"field": "allowedDomains", "op": "in", "value": ["example.edu"]},
+            {"not": {"field": "owner", "op": "regex", "value": "@gmail\\.com$"}}
+        ]},
+        "ttl_seconds": 3600         # Used by incremental assessments, ignored here
+    }
+
+Leaf rules take a field (CSV column, JSON dotted path, key_value key, or
+"output"/"line" for text formats), an op and a value. Comparisons are case
+insensitive unless "case_sensitive" is true. Without a "rule", the baseline's
+expected_value is matched as a case-insensitive substring of the output,
+which is how baselines were evaluated before check_logic was supported.
+"""
+
+import re
+import csv
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+try:
+    from .gam_output import iter_records
+except ImportError:
+    from gam_output import iter_records
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ("text", "lines", "key_value", "csv", "json")
+ROW_QUANTIFIERS = ("all", "any", "none")
+
+class CheckLogicError(ValueError):
+    """Raised when a baseline's check_logic cannot be compiled"""
+
+@dataclass
+class CheckOutcome:
+    """Result of evaluating a compiled check against GAM output"""
+    compliant: bool
+    current_value: str
+    reason: Optional[str] = None  # Why the check failed, if it did
+
+# Records parsed from one GAM output
+Records = Tuple[Dict[str, Any], ...]
+
+# Predicate over one record
+RecordPredicate = Callable[[Dict[str, Any]], bool]
+
+# Parsed outputs of one assessment, keyed by (format, output)
+ParseCache = Dict[Tuple[str, str], Any]
+
+def parse_output(output_format: str, output: str, cache: Optional[ParseCache] = None) -> Records:
+    """
+    Parse GAM output into records
+
+    Baselines that share a GAM command receive the same output string, so
+    with a cache (one per assessment, dropped when it ends) it is parsed once
+    per assessment rather than once per baseline.
+    """
+    if cache is not None:
+        key = (output_format, output)
+        if key not in cache:
+            cache[key] = _parse_output(output_format, output)
+        return cache[key]
+    return _parse_output(output_format, output)
+
+def _parse_output(output_format: str, output: str) -> Records:
+    if output_format == "text":
+        return ({"output": output.strip()},)
+
+    if output_format == "lines":
+        return tuple({"line": line.strip()} for line in output.splitlines() if line.strip())
+
+    if output_format == "key_value":
+        record = {}
+        for line in output.splitlines():
+            key, separator, value = line.partition(":")
+            if not separator:
+                key, separator, value = line.partition("=")
+            if separator and key.strip():
+                record[key.strip()] = value.strip()
+        return (record,) if record else ()
+
+    if output_format in ("csv", "json"):
+        # Handles quoted commas, multi-line values and formatjson JSON columns
+        return tuple(iter_records(output, output_format))
+
+    raise CheckLogicError(f"Unknown output format: {output_format}")
+
+def _field_getter(field: str) -> Callable[[Dict[str, Any]], Any]:
+    """Build an accessor for a plain or dotted field path"""
+    if field is None:
+        raise CheckLogicError("Rule is missing 'field'")
+
+    def get_plain(record: Dict[str, Any]) -> Any:
+        return record.get(field)
+
+    parts = field.split(".")
+    if len(parts) == 1:
+        return get_plain
+
+    def get_path(record: Dict[str, Any]) -> Any:
+        # Exact key first, so CSV columns containing dots still work
+        if field in record:
+            return record[field]
+        value: Any = record
+        for part in parts:
+            if isinstance(value, dict):
+                value = value.get(part)
+            elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            else:
+                return None
+        return value
+
+    return get_path
+
+def _normalize(value: Any, case_sensitive: bool) -> Optional[str]:
+    """Normalize a field or rule value for string comparison"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    text = str(value).strip()
+    return text if case_sensitive else text.lower()
+
+def _to_number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _compile_leaf(rule: Dict[str, Any]) -> RecordPredicate:
+    """Compile a single field comparison"""
+    get = _field_getter(rule.get("field"))
+    op = rule.get("op", "eq")
+    expected = rule.get("value")
+    case_sensitive = bool(rule.get("case_sensitive", False))
+
+    if op == "exists":
+        want = expected is None or bool(expected)
+        return lambda record: (get(record) not in (None, "")) == want
+
+    if op in ("eq", "ne"):
+        target = _normalize(expected, case_sensitive)
+        negate = op == "ne"
+        return lambda record: (_normalize(get(record), case_sensitive) == target) != negate
+
+    if op in ("in", "not_in"):
+        if not isinstance(expected, (list, tuple)):
+            raise CheckLogicError(f"'{op}' requires a list value")
+        members = frozenset(_normalize(item, case_sensitive) for item in expected)
+        negate = op == "not_in"
+        return lambda record: (_normalize(get(record), case_sensitive) in members) != negate
+
+    if op in ("contains", "not_contains"):
+        needle = _normalize(expected, case_sensitive) or ""
+        negate = op == "not_contains"
+        return lambda record: (needle in (_normalize(get(record), case_sensitive) or "")) != negate
+
+    if op == "regex":
+        try:
+            pattern = re.compile(str(expected), 0 if case_sensitive else re.IGNORECASE)
+        except re.error as e:
+            raise CheckLogicError(f"Invalid regex '{expected}': {e}")
+        return lambda record: get(record) is not None and pattern.search(str(get(record))) is not None
+
+    comparisons = {
+        "gt": lambda a, b: a > b,
+        "ge": lambda a, b: a >= b,
+        "lt": lambda a, b: a < b,
+        "le": lambda a, b: a <= b
+    }
+    if op in comparisons:
+        threshold = _to_number(expected)
+        if threshold is None:
+            raise CheckLogicError(f"'{op}' requires a numeric value")
+        compare = comparisons[op]
+
+        def numeric(record: Dict[str, Any]) -> bool:
+            value = _to_number(get(record))
+            return value is not None and compare(value, threshold)
+        return numeric
+
+    raise CheckLogicError(f"Unknown operator: {op}")
+
+def _compile_rule(rule: Any) -> RecordPredicate:
+    """Compile a rule tree of all/any/not nodes and field comparisons"""
+    if not isinstance(rule, dict):
+        raise CheckLogicError(f"Rule must be an object, got {type(rule).__name__}")
+
+    if "all" in rule:
+        predicates = [_compile_rule(child) for child in rule["all"]]
+        return lambda record: all(predicate(record) for predicate in predicates)
+
+    if "any" in rule:
+        predicates = [_compile_rule(child) for child in rule["any"]]
+        return lambda record: any(predicate(record) for predicate in predicates)
+
+    if "not" in rule:
+        predicate = _compile_rule(rule["not"])
+        return lambda record: not predicate(record)
+
+    return _compile_leaf(rule)
+
+class CompiledCheck:
+    """
+    Predicate compiled from a baseline's check_logic
+
+    Usage:
+        check = CompiledCheck.compile(baseline.check_logic, baseline.expected_value)
+        outcome = check.evaluate(gam_stdout)
+    """
+
+    def __init__(self, output_format: str, rows: str, predicate: Optional[RecordPredicate],
+                 expected_value: Optional[str]):
+        self.output_format = output_format
+        self.rows = rows
+        self.predicate = predicate
+        self.expected_value = expected_value
+        self._expected_lower = expected_value.lower() if expected_value else None
+
+    @classmethod
+    def compile(cls, check_logic: Optional[Dict[str, Any]], expected_value: Optional[str] = None) -> "CompiledCheck":
+        """
+        Compile check_logic JSON (already decoded)
+
+        Raises:
+            CheckLogicError: If the check_logic is invalid
+        """
+        check_logic = check_logic or {}
+        if not isinstance(check_logic, dict):
+            raise CheckLogicError("check_logic must be a JSON object")
+
+        output_format = check_logic.get("format", "text")
+        if output_format not in OUTPUT_FORMATS:
+            raise CheckLogicError(f"Unknown output format: {output_format}")
+
+        rows = check_logic.get("rows", "all")
+        if rows not in ROW_QUANTIFIERS:
+            raise CheckLogicError(f"Unknown rows quantifier: {rows}")
+
+        predicate = _compile_rule(check_logic["rule"]) if "rule" in check_logic else None
+        return cls(output_format, rows, predicate, expected_value)
+
+    @property
+    def uses_rules(self) -> bool:
+        return self.predicate is not None
+
+    def evaluate(self, output: str, cache: Optional[ParseCache] = None) -> CheckOutcome:
+        """
+        Evaluate GAM output against the compiled check
+
+        Args:
+            output: GAM stdout
+            cache: Parse cache shared by the checks of one assessment
+        """
+        if self.predicate is None:
+            return self._evaluate_substring(output, cache)
+
+        try:
+            records = parse_output(self.output_format, output, cache)
+        except (ValueError, csv.Error) as e:
+            return CheckOutcome(False, output.strip()[:500], f"Could not parse GAM output as {self.output_format}: {e}")
+
+        if not records:
+            return CheckOutcome(False, "", "GAM output contained no records")
+
+        failing = [record for record in records if not self.predicate(record)]
+        if self.rows == "all":
+            compliant = not failing
+        elif self.rows == "any":
+            compliant = len(failing) < len(records)
+        else:
+            compliant = len(failing) == len(records)
+
+        current_value = self._describe(records, failing)
+        if compliant:
+            return CheckOutcome(True, current_value)
+
+        if self.rows == "all":
+            reason = f"{len(failing)} of {len(records)} records do not satisfy check_logic"
+        elif self.rows == "any":
+            reason = f"None of {len(records)} records satisfy check_logic"
+        else:
+            reason = f"{len(records) - len(failing)} of {len(records)} records match a prohibited condition"
+        return CheckOutcome(False, current_value, reason)
+
+    def _evaluate_substring(self, output: str, cache: Optional[ParseCache]) -> CheckOutcome:
+        """Legacy evaluation: expected_value as a case-insensitive substring"""
+        current_value = output.strip()
+        if self._expected_lower and self._expected_lower in _lowercase(current_value, cache):
+            return CheckOutcome(True, current_value)
+        return CheckOutcome(False, current_value,
+                            f"Expected '{self.expected_value}' but found '{current_value[:100]}...'")
+
+    def _describe(self, records: Records, failing: List[Dict[str, Any]]) -> str:
+        """Summarize the records behind an outcome for current_value"""
+        if self.output_format == "text":
+            return records[0]["output"]
+        sample = failing[0] if failing and self.rows == "all" else records[0]
+        return json.dumps({"records": len(records), "failing": len(failing), "sample": sample},
+                          default=str)
+
+def _lowercase(text: str, cache: Optional[ParseCache]) -> str:
+    """Lowercase GAM output once per distinct output and assessment"""
+    if cache is None:
+        return text.lower()
+    key = ("lowercase", text)
+    if key not in cache:
+        cache[key] = text.lower()
+    return cache[key]
+
+def compile_baseline_check(check_logic: Optional[Dict[str, Any]],
+                           expected_value: Optional[str]) -> Tuple[Optional[CompiledCheck], Optional[str]]:
+    """
+    Compile a baseline's check, returning (check, None) or (None, error message)
+    """
+    try:
+        return CompiledCheck.compile(check_logic, expected_value), None
+    except CheckLogicError as e:
+        return None, str(e)
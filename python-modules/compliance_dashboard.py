@@ -10,26 +10,45 @@ detailed gap analysis, remediation tracking, and executive reporting.
 import json
 import sqlite3
 import logging
+import importlib.util
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
 
-# Optional dependencies for enhanced visualization
 try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.progress import Progress, BarColumn, TextColumn
-    from rich.text import Text
-    from rich import box
-    RICH_AVAILABLE = True
+    from .instrumentation import Tracer, add_cli_arguments, cli_instrumentation
 except ImportError:
-    RICH_AVAILABLE = False
+    from instrumentation import Tracer, add_cli_arguments, cli_instrumentation
+
+# Optional dependency for enhanced visualization, imported only when the
+# interactive dashboard is displayed
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
 
 logger = logging.getLogger(__name__)
 
+def _import_sibling(name: str) -> Any:
+    """Import a sibling module whether running as a package or as a script"""
+    import importlib
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
+
+# Days of assessment history used for dashboard trend analysis
+DEFAULT_TREND_DAYS = 30
+
+# Longest trend window (days) served at each scuba_trend_rollups granularity;
+# longer windows use monthly buckets
+TREND_GRANULARITY_LIMITS = (("day", 31), ("week", 366))
+
+def trend_granularity(days: int) -> str:
+    """Pick the rollup granularity for a trend window of the given length"""
+    for granularity, max_days in TREND_GRANULARITY_LIMITS:
+        if days <= max_days:
+            return granularity
+    return "month"
+
 @dataclass
 class ComplianceSummary:
     """Summary statistics for compliance assessment"""
@@ -70,6 +89,15 @@ class RemediationItem:
     target_date: Optional[datetime]
     business_impact: str
 
+@dataclass
+class DashboardSnapshot:
+    """Dashboard data read in a single transaction"""
+    loaded_at: datetime  # Database time (UTC) when the snapshot was read
+    trend_days: int
+    latest_results: List[Dict[str, Any]]  # Latest result per enabled baseline
+    assessment_history: List[Dict[str, Any]]  # Assessments within trend_days
+    remediation_items: List[RemediationItem]
+
 class ComplianceDashboard:
     """
     Advanced compliance dashboard with gap analysis and remediation tracking
@@ -78,300 +106,399 @@ class ComplianceDashboard:
     management for GWOMBAT SCuBA compliance assessments.
     """
     
-    def __init__(self, db_path: str = "./config/gwombat.db"):
+    def __init__(self, db_path: str = "./config/gwombat.db", tracer: Optional[Tracer] = None):
         """
         Initialize compliance dashboard
         
         Args:
             db_path: Path to GWOMBAT database
+            tracer: Span collector for timing data (one is created if omitted)
         """
         self.db_path = Path(db_path)
         self.session_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_dashboard_{id(self)}"
+        self.tracer = tracer or Tracer("dashboard")
         
-        # Initialize console for rich output if available
-        self.console = Console() if RICH_AVAILABLE else None
+        # Rich console, created on first use
+        self._console = None
         
         logger.info("Compliance dashboard initialized")
 
-    def get_overall_compliance_summary(self) -> Optional[ComplianceSummary]:
+    def load_snapshot(self, trend_days: int = DEFAULT_TREND_DAYS) -> DashboardSnapshot:
+        """
+        Load all data needed to render or export the dashboard in one read transaction
+        
+        Args:
+            trend_days: Days of assessment history to include for trend analysis
+        
+        Returns:
+            DashboardSnapshot consistent as of a single point in time
+        
+        Raises:
+            sqlite3.Error: If the compliance tables cannot be read
+        """
+        with self.tracer.span("load_snapshot", "db", trend_days=trend_days):
+            return self._read_snapshot(trend_days)
+
+    def _read_snapshot(self, trend_days: int) -> DashboardSnapshot:
+        """Read a DashboardSnapshot inside a single read transaction"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("BEGIN")
+            
+            loaded_at = conn.execute("SELECT datetime('now')").fetchone()[0]
+            
+            latest_results = [dict(row) for row in conn.execute("""
+                SELECT
+                    l.service_name,
+                    l.baseline_id,
+                    l.baseline_title,
+                    l.criticality_level,
+                    l.compliance_status,
+                    l.confidence_level,
+                    l.risk_level,
+                    l.gap_description,
+                    l.current_value,
+                    l.expected_value,
+                    l.assessment_date,
+                    b.baseline_description,
+                    b.remediation_steps
+                FROM scuba_latest_compliance l
+                JOIN scuba_baselines b ON l.baseline_id = b.baseline_id
+            """)]
+            
+            assessment_history = [dict(row) for row in conn.execute("""
+                SELECT
+                    assessment_start,
+                    overall_compliance_percentage,
+                    critical_findings,
+                    baselines_assessed
+                FROM scuba_assessment_history
+                WHERE assessment_start >= datetime(?, ?)
+                ORDER BY assessment_start ASC
+            """, (loaded_at, f"-{int(trend_days)} days"))]
+            
+            remediation_items = [self._remediation_item(row) for row in conn.execute("""
+                SELECT
+                    id, baseline_id, gap_title, gap_description, remediation_priority,
+                    remediation_effort, status, assigned_to, target_date, business_impact
+                FROM scuba_remediation_items
+                ORDER BY CASE remediation_priority WHEN 'critical' THEN 1 WHEN 'high' THEN 2 WHEN 'medium' THEN 3 ELSE 4 END, target_date ASC
+            """)]
+            
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        
+        return DashboardSnapshot(
+            loaded_at=datetime.strptime(loaded_at, "%Y-%m-%d %H:%M:%S"),
+            trend_days=trend_days,
+            latest_results=latest_results,
+            assessment_history=assessment_history,
+            remediation_items=remediation_items
+        )
+
+    @staticmethod
+    def _remediation_item(row: sqlite3.Row) -> RemediationItem:
+        """Convert a scuba_remediation_items row to a RemediationItem"""
+        target_date = None
+        if row['target_date']:
+            try:
+                target_date = datetime.fromisoformat(row['target_date'])
+            except:
+                pass
+        
+        return RemediationItem(
+            id=row['id'],
+            baseline_id=row['baseline_id'],
+            title=row['gap_title'],
+            description=row['gap_description'],
+            priority=row['remediation_priority'],
+            effort=row['remediation_effort'],
+            status=row['status'],
+            assigned_to=row['assigned_to'],
+            target_date=target_date,
+            business_impact=row['business_impact']
+        )
+
+    def get_overall_compliance_summary(self, snapshot: Optional[DashboardSnapshot] = None) -> Optional[ComplianceSummary]:
         """Get overall compliance summary statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                # Get latest compliance results
-                cursor = conn.execute("""
-                    SELECT 
-                        COUNT(*) as total_baselines,
-                        SUM(CASE WHEN compliance_status = 'compliant' THEN 1 ELSE 0 END) as compliant_count,
-                        SUM(CASE WHEN compliance_status = 'non_compliant' THEN 1 ELSE 0 END) as non_compliant_count,
-                        SUM(CASE WHEN compliance_status = 'manual_review' THEN 1 ELSE 0 END) as manual_review_count,
-                        SUM(CASE WHEN compliance_status = 'unable_to_check' THEN 1 ELSE 0 END) as unable_to_check_count,
-                        SUM(CASE WHEN compliance_status = 'non_compliant' AND risk_level = 'critical' THEN 1 ELSE 0 END) as critical_gaps,
-                        SUM(CASE WHEN compliance_status = 'non_compliant' AND risk_level = 'high' THEN 1 ELSE 0 END) as high_gaps,
-                        SUM(CASE WHEN compliance_status = 'non_compliant' AND risk_level = 'medium' THEN 1 ELSE 0 END) as medium_gaps,
-                        SUM(CASE WHEN compliance_status = 'non_compliant' AND risk_level = 'low' THEN 1 ELSE 0 END) as low_gaps,
-                        MAX(assessment_date) as last_assessment
-                    FROM scuba_latest_compliance
-                    WHERE compliance_status IS NOT NULL
-                """)
-                
-                row = cursor.fetchone()
-                if not row or row['total_baselines'] == 0:
-                    return None
-                
-                # Calculate compliance percentage
-                assessable = row['compliant_count'] + row['non_compliant_count']
-                compliance_percentage = (row['compliant_count'] / assessable * 100) if assessable > 0 else 0
-                
-                return ComplianceSummary(
-                    total_baselines=row['total_baselines'],
-                    compliant_count=row['compliant_count'],
-                    non_compliant_count=row['non_compliant_count'],
-                    manual_review_count=row['manual_review_count'],
-                    unable_to_check_count=row['unable_to_check_count'],
-                    compliance_percentage=round(compliance_percentage, 1),
-                    critical_gaps=row['critical_gaps'],
-                    high_gaps=row['high_gaps'],
-                    medium_gaps=row['medium_gaps'],
-                    low_gaps=row['low_gaps'],
-                    last_assessment=datetime.fromisoformat(row['last_assessment']) if row['last_assessment'] else None
-                )
-                
+            snapshot = snapshot or self.load_snapshot()
+            
+            # Latest results that have been assessed at least once
+            assessed = [r for r in snapshot.latest_results if r['compliance_status'] is not None]
+            if not assessed:
+                return None
+            
+            def count(status: str, risk_level: Optional[str] = None) -> int:
+                return sum(1 for r in assessed if r['compliance_status'] == status
+                           and (risk_level is None or r['risk_level'] == risk_level))
+            
+            compliant_count = count('compliant')
+            non_compliant_count = count('non_compliant')
+            last_assessment = max((r['assessment_date'] for r in assessed if r['assessment_date']), default=None)
+            
+            # Calculate compliance percentage
+            assessable = compliant_count + non_compliant_count
+            compliance_percentage = (compliant_count / assessable * 100) if assessable > 0 else 0
+            
+            return ComplianceSummary(
+                total_baselines=len(assessed),
+                compliant_count=compliant_count,
+                non_compliant_count=non_compliant_count,
+                manual_review_count=count('manual_review'),
+                unable_to_check_count=count('unable_to_check'),
+                compliance_percentage=round(compliance_percentage, 1),
+                critical_gaps=count('non_compliant', 'critical'),
+                high_gaps=count('non_compliant', 'high'),
+                medium_gaps=count('non_compliant', 'medium'),
+                low_gaps=count('non_compliant', 'low'),
+                last_assessment=datetime.fromisoformat(last_assessment) if last_assessment else None
+            )
+        
         except Exception as e:
             logger.error(f"Error getting compliance summary: {e}")
             return None
 
-    def get_service_compliance_breakdown(self) -> List[ServiceCompliance]:
+    def get_service_compliance_breakdown(self, snapshot: Optional[DashboardSnapshot] = None) -> List[ServiceCompliance]:
         """Get compliance breakdown by service"""
         services = []
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            snapshot = snapshot or self.load_snapshot()
+            
+            by_service = {}
+            for r in snapshot.latest_results:
+                if r['compliance_status'] in ('compliant', 'non_compliant'):
+                    by_service.setdefault(r['service_name'], []).append(r)
+            
+            for service_name in sorted(by_service):
+                rows = by_service[service_name]
+                compliant_count = sum(1 for r in rows if r['compliance_status'] == 'compliant')
+                non_compliant_count = len(rows) - compliant_count
+                critical_issues = sum(1 for r in rows if r['compliance_status'] == 'non_compliant'
+                                      and r['risk_level'] == 'critical')
+                compliance_percentage = compliant_count / len(rows) * 100
                 
-                cursor = conn.execute("""
-                    SELECT 
-                        service_name,
-                        COUNT(*) as total_baselines,
-                        SUM(CASE WHEN compliance_status = 'compliant' THEN 1 ELSE 0 END) as compliant_count,
-                        SUM(CASE WHEN compliance_status = 'non_compliant' THEN 1 ELSE 0 END) as non_compliant_count,
-                        SUM(CASE WHEN compliance_status = 'non_compliant' AND risk_level = 'critical' THEN 1 ELSE 0 END) as critical_issues
-                    FROM scuba_latest_compliance
-                    WHERE compliance_status IN ('compliant', 'non_compliant')
-                    GROUP BY service_name
-                    ORDER BY service_name
-                """)
+                # Simple risk score calculation (0-100, higher = more risk)
+                risk_score = min(100, (non_compliant_count * 10) + (critical_issues * 25))
                 
-                for row in cursor.fetchall():
-                    assessable = row['compliant_count'] + row['non_compliant_count']
-                    compliance_percentage = (row['compliant_count'] / assessable * 100) if assessable > 0 else 0
-                    
-                    # Simple risk score calculation (0-100, higher = more risk)
-                    risk_score = min(100, (row['non_compliant_count'] * 10) + (row['critical_issues'] * 25))
-                    
-                    services.append(ServiceCompliance(
-                        service_name=row['service_name'],
-                        total_baselines=row['total_baselines'],
-                        compliant_count=row['compliant_count'],
-                        non_compliant_count=row['non_compliant_count'],
-                        compliance_percentage=round(compliance_percentage, 1),
-                        critical_issues=row['critical_issues'],
-                        risk_score=risk_score
-                    ))
-                    
+                services.append(ServiceCompliance(
+                    service_name=service_name,
+                    total_baselines=len(rows),
+                    compliant_count=compliant_count,
+                    non_compliant_count=non_compliant_count,
+                    compliance_percentage=round(compliance_percentage, 1),
+                    critical_issues=critical_issues,
+                    risk_score=risk_score
+                ))
+        
         except Exception as e:
             logger.error(f"Error getting service compliance breakdown: {e}")
         
         return services
 
-    def get_compliance_trends(self, days: int = 30) -> Dict[str, Any]:
-        """Get compliance trends over specified number of days"""
+    def get_compliance_trends(self, days: int = DEFAULT_TREND_DAYS,
+                              snapshot: Optional[DashboardSnapshot] = None) -> Dict[str, Any]:
+        """
+        Get compliance trends over specified number of days
+        
+        Windows covered by the snapshot (or short enough for daily buckets) are
+        computed from raw assessment history. Longer windows are computed from
+        the weekly or monthly trend rollups, aligned to bucket boundaries.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            compliance_trend = []
+            critical_trend = []
+            dates = []
+            granularity = None
+            
+            # A snapshot only holds its own trend window of history
+            if (snapshot is None or days > snapshot.trend_days) and trend_granularity(days) != "day":
+                granularity = trend_granularity(days)
+                buckets = self.get_trend_series(days, granularity)["buckets"]
+                if not buckets:
+                    return {"message": "No assessment history available"}
                 
-                # Get assessment history
-                cursor = conn.execute("""
-                    SELECT 
-                        assessment_start,
-                        overall_compliance_percentage,
-                        critical_findings,
-                        baselines_assessed
-                    FROM scuba_assessment_history
-                    WHERE assessment_start >= datetime('now', '-{} days')
-                    ORDER BY assessment_start ASC
-                """.format(days))
+                assessment_count = sum(bucket['assessment_count'] for bucket in buckets)
+                dates = [buckets[0]['first_assessment'], buckets[-1]['last_assessment']]
+                compliance_trend = [buckets[0]['first_compliance_percentage'], buckets[-1]['last_compliance_percentage']]
+                critical_trend = [buckets[0]['first_critical_findings'], buckets[-1]['last_critical_findings']]
+                if assessment_count < 2:
+                    del dates[1:], compliance_trend[1:], critical_trend[1:]
+            else:
+                if snapshot is None or days > snapshot.trend_days:
+                    snapshot = self.load_snapshot(trend_days=days)
                 
-                assessments = cursor.fetchall()
+                cutoff = (snapshot.loaded_at - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+                assessments = [a for a in snapshot.assessment_history if a['assessment_start'] >= cutoff]
                 
                 if not assessments:
                     return {"message": "No assessment history available"}
                 
                 # Calculate trends
-                compliance_trend = []
-                critical_trend = []
-                dates = []
-                
+                assessment_count = len(assessments)
                 for assessment in assessments:
                     dates.append(assessment['assessment_start'])
                     compliance_trend.append(assessment['overall_compliance_percentage'])
                     critical_trend.append(assessment['critical_findings'])
-                
-                # Calculate trend direction
-                if len(compliance_trend) >= 2:
-                    compliance_direction = "improving" if compliance_trend[-1] > compliance_trend[0] else "declining"
-                    critical_direction = "improving" if critical_trend[-1] < critical_trend[0] else "worsening"
-                else:
-                    compliance_direction = "stable"
-                    critical_direction = "stable"
-                
-                return {
-                    "assessment_count": len(assessments),
-                    "date_range": f"{dates[0]} to {dates[-1]}" if dates else None,
-                    "compliance_trend": {
-                        "direction": compliance_direction,
-                        "current": compliance_trend[-1] if compliance_trend else 0,
-                        "previous": compliance_trend[0] if compliance_trend else 0,
-                        "change": compliance_trend[-1] - compliance_trend[0] if len(compliance_trend) >= 2 else 0
-                    },
-                    "critical_findings_trend": {
-                        "direction": critical_direction,
-                        "current": critical_trend[-1] if critical_trend else 0,
-                        "previous": critical_trend[0] if critical_trend else 0,
-                        "change": critical_trend[-1] - critical_trend[0] if len(critical_trend) >= 2 else 0
-                    }
+            
+            # Calculate trend direction
+            if len(compliance_trend) >= 2:
+                compliance_direction = "improving" if compliance_trend[-1] > compliance_trend[0] else "declining"
+                critical_direction = "improving" if critical_trend[-1] < critical_trend[0] else "worsening"
+            else:
+                compliance_direction = "stable"
+                critical_direction = "stable"
+            
+            trends = {
+                "assessment_count": assessment_count,
+                "date_range": f"{dates[0]} to {dates[-1]}" if dates else None,
+                "compliance_trend": {
+                    "direction": compliance_direction,
+                    "current": compliance_trend[-1] if compliance_trend else 0,
+                    "previous": compliance_trend[0] if compliance_trend else 0,
+                    "change": compliance_trend[-1] - compliance_trend[0] if len(compliance_trend) >= 2 else 0
+                },
+                "critical_findings_trend": {
+                    "direction": critical_direction,
+                    "current": critical_trend[-1] if critical_trend else 0,
+                    "previous": critical_trend[0] if critical_trend else 0,
+                    "change": critical_trend[-1] - critical_trend[0] if len(critical_trend) >= 2 else 0
                 }
-                
+            }
+            if granularity:
+                trends["granularity"] = granularity
+            return trends
+        
         except Exception as e:
             logger.error(f"Error getting compliance trends: {e}")
             return {"error": str(e)}
 
-    def get_remediation_items(self, status_filter: Optional[str] = None, 
-                            priority_filter: Optional[str] = None) -> List[RemediationItem]:
-        """Get remediation items with optional filtering"""
-        items = []
+    def get_trend_series(self, days: int = 365, granularity: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get bucketed compliance history for trend charts
+        
+        Args:
+            days: Length of the trend window
+            granularity: 'day', 'week' or 'month' (chosen from the window if omitted)
+        
+        Returns:
+            Dictionary with the granularity and one entry per bucket overlapping the window
+        """
+        granularity = granularity or trend_granularity(days)
+        buckets = []
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.tracer.span("trend_series", "db", granularity=granularity), \
+                    sqlite3.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 
-                query = """
-                    SELECT 
-                        id, baseline_id, gap_title, gap_description, remediation_priority,
-                        remediation_effort, status, assigned_to, target_date, business_impact
-                    FROM scuba_remediation_items
-                    WHERE 1=1
-                """
-                params = []
-                
-                if status_filter:
-                    query += " AND status = ?"
-                    params.append(status_filter)
-                
-                if priority_filter:
-                    query += " AND remediation_priority = ?"
-                    params.append(priority_filter)
-                
-                query += " ORDER BY CASE remediation_priority WHEN 'critical' THEN 1 WHEN 'high' THEN 2 WHEN 'medium' THEN 3 ELSE 4 END, target_date ASC"
-                
-                cursor = conn.execute(query, params)
+                cursor = conn.execute("""
+                    SELECT
+                        bucket_start,
+                        assessment_count,
+                        ROUND(sum_compliance_percentage / assessment_count, 1) as average_compliance_percentage,
+                        min_compliance_percentage,
+                        max_compliance_percentage,
+                        first_compliance_percentage,
+                        last_compliance_percentage,
+                        max_critical_findings,
+                        first_critical_findings,
+                        last_critical_findings,
+                        first_assessment,
+                        last_assessment
+                    FROM scuba_trend_rollups
+                    WHERE granularity = ? AND bucket_end > date('now', ?)
+                    ORDER BY bucket_start ASC
+                """, (granularity, f"-{int(days)} days"))
                 
-                for row in cursor.fetchall():
-                    target_date = None
-                    if row['target_date']:
-                        try:
-                            target_date = datetime.fromisoformat(row['target_date'])
-                        except:
-                            pass
-                    
-                    items.append(RemediationItem(
-                        id=row['id'],
-                        baseline_id=row['baseline_id'],
-                        title=row['gap_title'],
-                        description=row['gap_description'],
-                        priority=row['remediation_priority'],
-                        effort=row['remediation_effort'],
-                        status=row['status'],
-                        assigned_to=row['assigned_to'],
-                        target_date=target_date,
-                        business_impact=row['business_impact']
-                    ))
-                    
+                buckets = [dict(row) for row in cursor.fetchall()]
+        
         except Exception as e:
-            logger.error(f"Error getting remediation items: {e}")
+            logger.error(f"Error getting compliance trend series: {e}")
         
-        return items
+        return {"granularity": granularity, "days": days, "buckets": buckets}
 
-    def get_critical_gaps_analysis(self) -> Dict[str, Any]:
+    def get_remediation_items(self, status_filter: Optional[str] = None,
+                            priority_filter: Optional[str] = None,
+                            snapshot: Optional[DashboardSnapshot] = None) -> List[RemediationItem]:
+        """Get remediation items with optional filtering"""
+        try:
+            snapshot = snapshot or self.load_snapshot()
+            
+            return [
+                item for item in snapshot.remediation_items
+                if (not status_filter or item.status == status_filter)
+                and (not priority_filter or item.priority == priority_filter)
+            ]
+        
+        except Exception as e:
+            logger.error(f"Error getting remediation items: {e}")
+            return []
+
+    def get_critical_gaps_analysis(self, snapshot: Optional[DashboardSnapshot] = None) -> Dict[str, Any]:
         """Get detailed analysis of critical compliance gaps"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                # Get critical compliance gaps
-                cursor = conn.execute("""
-                    SELECT 
-                        b.service_name,
-                        b.baseline_id,
-                        b.baseline_title,
-                        b.baseline_description,
-                        r.gap_description,
-                        r.current_value,
-                        r.expected_value,
-                        r.assessment_date,
-                        b.remediation_steps
-                    FROM scuba_latest_compliance l
-                    JOIN scuba_baselines b ON l.baseline_id = b.baseline_id
-                    LEFT JOIN scuba_compliance_results r ON l.baseline_id = r.baseline_id 
-                        AND r.assessment_date = l.assessment_date
-                    WHERE l.compliance_status = 'non_compliant' 
-                    AND l.risk_level = 'critical'
-                    ORDER BY b.service_name, b.baseline_id
-                """)
-                
-                critical_gaps = []
-                service_breakdown = {}
-                
-                for row in cursor.fetchall():
-                    gap_info = {
-                        "baseline_id": row['baseline_id'],
-                        "baseline_title": row['baseline_title'],
-                        "service_name": row['service_name'],
-                        "gap_description": row['gap_description'],
-                        "current_value": row['current_value'],
-                        "expected_value": row['expected_value'],
-                        "remediation_steps": row['remediation_steps'],
-                        "assessment_date": row['assessment_date']
-                    }
-                    
-                    critical_gaps.append(gap_info)
-                    
-                    # Service breakdown
-                    if row['service_name'] not in service_breakdown:
-                        service_breakdown[row['service_name']] = 0
-                    service_breakdown[row['service_name']] += 1
-                
-                return {
-                    "total_critical_gaps": len(critical_gaps),
-                    "critical_gaps": critical_gaps,
-                    "service_breakdown": service_breakdown,
-                    "analysis_date": datetime.now().isoformat()
+            snapshot = snapshot or self.load_snapshot()
+            
+            critical_gaps = []
+            service_breakdown = {}
+            
+            rows = sorted(
+                (r for r in snapshot.latest_results
+                 if r['compliance_status'] == 'non_compliant' and r['risk_level'] == 'critical'),
+                key=lambda r: (r['service_name'], r['baseline_id'])
+            )
+            
+            for row in rows:
+                gap_info = {
+                    "baseline_id": row['baseline_id'],
+                    "baseline_title": row['baseline_title'],
+                    "service_name": row['service_name'],
+                    "gap_description": row['gap_description'],
+                    "current_value": row['current_value'],
+                    "expected_value": row['expected_value'],
+                    "remediation_steps": row['remediation_steps'],
+                    "assessment_date": row['assessment_date']
                 }
                 
+                critical_gaps.append(gap_info)
+                
+                # Service breakdown
+                if row['service_name'] not in service_breakdown:
+                    service_breakdown[row['service_name']] = 0
+                service_breakdown[row['service_name']] += 1
+            
+            return {
+                "total_critical_gaps": len(critical_gaps),
+                "critical_gaps": critical_gaps,
+                "service_breakdown": service_breakdown,
+                "analysis_date": datetime.now().isoformat()
+            }
+        
         except Exception as e:
             logger.error(f"Error getting critical gaps analysis: {e}")
             return {"error": str(e)}
 
-    def generate_executive_summary(self) -> Dict[str, Any]:
+    def generate_executive_summary(self, snapshot: Optional[DashboardSnapshot] = None) -> Dict[str, Any]:
         """Generate executive-level compliance summary"""
         summary = {
             "report_date": datetime.now().isoformat(),
             "report_type": "Executive Compliance Summary"
         }
         
+        if snapshot is None:
+            try:
+                snapshot = self.load_snapshot()
+            except Exception as e:
+                logger.error(f"Error loading dashboard data: {e}")
+                summary["error"] = str(e)
+                return summary
+        
         # Overall compliance
-        overall = self.get_overall_compliance_summary()
+        overall = self.get_overall_compliance_summary(snapshot)
         if overall:
             summary["overall_compliance"] = {
                 "compliance_percentage": overall.compliance_percentage,
@@ -382,7 +509,7 @@ class ComplianceDashboard:
             }
         
         # Service breakdown
-        services = self.get_service_compliance_breakdown()
+        services = self.get_service_compliance_breakdown(snapshot)
         summary["service_compliance"] = [
             {
                 "service": svc.service_name,
@@ -394,19 +521,19 @@ class ComplianceDashboard:
         ]
         
         # Critical gaps
-        critical_analysis = self.get_critical_gaps_analysis()
+        critical_analysis = self.get_critical_gaps_analysis(snapshot)
         summary["critical_gaps_summary"] = {
             "total_critical_gaps": critical_analysis.get("total_critical_gaps", 0),
             "affected_services": list(critical_analysis.get("service_breakdown", {}).keys())
         }
         
         # Trends
-        trends = self.get_compliance_trends(30)
+        trends = self.get_compliance_trends(DEFAULT_TREND_DAYS, snapshot)
         summary["trends"] = trends
         
         # Remediation status
-        open_remediations = len(self.get_remediation_items(status_filter="open"))
-        in_progress_remediations = len(self.get_remediation_items(status_filter="in_progress"))
+        open_remediations = len(self.get_remediation_items(status_filter="open", snapshot=snapshot))
+        in_progress_remediations = len(self.get_remediation_items(status_filter="in_progress", snapshot=snapshot))
         
         summary["remediation_status"] = {
             "open_items": open_remediations,
@@ -415,12 +542,30 @@ class ComplianceDashboard:
         
         return summary
 
+    @property
+    def console(self) -> Optional[Any]:
+        """Rich console for dashboard output, or None if rich is unavailable"""
+        if self._console is None and RICH_AVAILABLE:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+
     def display_compliance_dashboard(self) -> None:
         """Display interactive compliance dashboard"""
+        try:
+            snapshot = self.load_snapshot()
+        except Exception as e:
+            logger.error(f"Error loading dashboard data: {e}")
+            return
+        
         if not RICH_AVAILABLE:
-            self._display_basic_dashboard()
+            self._display_basic_dashboard(snapshot)
             return
         
+        from rich.table import Table
+        from rich.panel import Panel
+        from rich import box
+        
         console = self.console
         console.clear()
         
@@ -431,7 +576,7 @@ class ComplianceDashboard:
         ))
         
         # Overall compliance summary
-        overall = self.get_overall_compliance_summary()
+        overall = self.get_overall_compliance_summary(snapshot)
         if overall:
             # Compliance percentage with color coding
             if overall.compliance_percentage >= 90:
@@ -459,7 +604,7 @@ class ComplianceDashboard:
             console.print()
         
         # Service compliance breakdown
-        services = self.get_service_compliance_breakdown()
+        services = self.get_service_compliance_breakdown(snapshot)
         if services:
             service_table = Table(title="Service Compliance Breakdown", box=box.ROUNDED)
             service_table.add_column("Service", style="cyan")
@@ -484,7 +629,7 @@ class ComplianceDashboard:
             console.print()
         
         # Critical gaps summary
-        critical_analysis = self.get_critical_gaps_analysis()
+        critical_analysis = self.get_critical_gaps_analysis(snapshot)
         if critical_analysis.get("total_critical_gaps", 0) > 0:
             console.print(Panel(
                 f"🚨 {critical_analysis['total_critical_gaps']} Critical Compliance Gaps Require Immediate Attention",
@@ -493,8 +638,8 @@ class ComplianceDashboard:
             console.print()
         
         # Remediation summary
-        open_items = self.get_remediation_items(status_filter="open")
-        in_progress_items = self.get_remediation_items(status_filter="in_progress")
+        open_items = self.get_remediation_items(status_filter="open", snapshot=snapshot)
+        in_progress_items = self.get_remediation_items(status_filter="in_progress", snapshot=snapshot)
         
         remediation_table = Table(title="Remediation Status", box=box.ROUNDED)
         remediation_table.add_column("Status", style="cyan")
@@ -512,14 +657,14 @@ class ComplianceDashboard:
         
         console.print(remediation_table)
 
-    def _display_basic_dashboard(self) -> None:
+    def _display_basic_dashboard(self, snapshot: DashboardSnapshot) -> None:
         """Display basic text-based dashboard when rich is not available"""
         print("\n" + "="*60)
         print("🔐 GWOMBAT SCuBA Compliance Dashboard")
         print("="*60)
         
         # Overall compliance
-        overall = self.get_overall_compliance_summary()
+        overall = self.get_overall_compliance_summary(snapshot)
         if overall:
             print(f"\nOverall Compliance: {overall.compliance_percentage:.1f}%")
             print(f"Total Baselines: {overall.total_baselines}")
@@ -531,7 +676,7 @@ class ComplianceDashboard:
                 print(f"Last Assessment: {overall.last_assessment.strftime('%Y-%m-%d %H:%M')}")
         
         # Service breakdown
-        services = self.get_service_compliance_breakdown()
+        services = self.get_service_compliance_breakdown(snapshot)
         if services:
             print(f"\nService Compliance Breakdown:")
             print("-" * 60)
@@ -541,80 +686,41 @@ class ComplianceDashboard:
                       f"Critical: {svc.critical_issues}")
         
         # Critical gaps
-        critical_analysis = self.get_critical_gaps_analysis()
+        critical_analysis = self.get_critical_gaps_analysis(snapshot)
         if critical_analysis.get("total_critical_gaps", 0) > 0:
             print(f"\n⚠️  {critical_analysis['total_critical_gaps']} Critical Compliance Gaps Require Attention")
         
         print("\n" + "="*60)
 
-    def export_compliance_report(self, output_path: str, format: str = "json") -> bool:
-        """Export comprehensive compliance report"""
+    def export_compliance_report(self, output_path: str, format: str = "json",
+                                 start_date: Optional[str] = None, end_date: Optional[str] = None,
+                                 services: Optional[List[str]] = None, include_history: bool = False) -> bool:
+        """
+        Export comprehensive compliance report
+        
+        Args:
+            output_path: Report file path (base path for per-section csv files)
+            format: json, json-compact, ndjson or csv
+            start_date: Only include history on or after this date (YYYY-MM-DD)
+            end_date: Only include history on or before this date (YYYY-MM-DD)
+            services: Only include these services
+            include_history: Also stream every stored result in the date range
+        
+        Returns:
+            True if the report was written
+        """
         try:
-            # Generate comprehensive report data
-            report_data = {
-                "metadata": {
-                    "report_generated": datetime.now().isoformat(),
-                    "report_type": "SCuBA Compliance Report",
-                    "gwombat_version": "3.0.0-hybrid"
-                },
-                "executive_summary": self.generate_executive_summary(),
-                "detailed_compliance": {
-                    "overall_summary": self.get_overall_compliance_summary(),
-                    "service_breakdown": self.get_service_compliance_breakdown(),
-                    "critical_gaps": self.get_critical_gaps_analysis(),
-                    "trends": self.get_compliance_trends(30)
-                },
-                "remediation": {
-                    "open_items": self.get_remediation_items(status_filter="open"),
-                    "in_progress_items": self.get_remediation_items(status_filter="in_progress"),
-                    "critical_priority": self.get_remediation_items(priority_filter="critical")
-                }
-            }
-            
-            # Convert dataclasses to dicts for JSON serialization
-            def convert_dataclass(obj):
-                if hasattr(obj, '__dict__'):
-                    result = {}
-                    for key, value in obj.__dict__.items():
-                        if isinstance(value, datetime):
-                            result[key] = value.isoformat()
-                        elif isinstance(value, list):
-                            result[key] = [convert_dataclass(item) for item in value]
-                        else:
-                            result[key] = value
-                    return result
-                return obj
-            
-            # Clean up dataclasses
-            for section in report_data["detailed_compliance"]:
-                if isinstance(report_data["detailed_compliance"][section], list):
-                    report_data["detailed_compliance"][section] = [
-                        convert_dataclass(item) for item in report_data["detailed_compliance"][section]
-                    ]
-                elif hasattr(report_data["detailed_compliance"][section], '__dict__'):
-                    report_data["detailed_compliance"][section] = convert_dataclass(
-                        report_data["detailed_compliance"][section]
-                    )
-            
-            for section in report_data["remediation"]:
-                report_data["remediation"][section] = [
-                    convert_dataclass(item) for item in report_data["remediation"][section]
-                ]
-            
-            # Write report
-            output_file = Path(output_path)
-            output_file.parent.mkdir(parents=True, exist_ok=True)
+            report_exporter = _import_sibling("report_exporter")
+            exporter = report_exporter.ComplianceReportExporter(
+                self, report_exporter.ExportFilter(start_date=start_date, end_date=end_date, services=services)
+            )
+            with self.tracer.span("export_report", "export", format=format, include_history=include_history):
+                written = exporter.export(output_path, format, include_history=include_history)
             
-            if format.lower() == "json":
-                with open(output_file, 'w') as f:
-                    json.dump(report_data, f, indent=2, default=str)
-            else:
-                logger.error(f"Unsupported output format: {format}")
-                return False
-            
-            logger.info(f"Compliance report exported to {output_file}")
+            for output_file in written:
+                logger.info(f"Compliance report exported to {output_file}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error exporting compliance report: {e}")
             return False
@@ -628,18 +734,36 @@ def main():
     parser.add_argument("--action", choices=["dashboard", "export", "summary"], 
                        default="dashboard", help="Action to perform")
     parser.add_argument("--output", help="Output file path for export")
-    parser.add_argument("--format", choices=["json"], default="json", help="Export format")
+    parser.add_argument("--format", choices=["json", "json-compact", "ndjson", "csv"], default="json",
+                       help="Export format (csv writes one file per report section)")
+    parser.add_argument("--start-date", help="Export history on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Export history on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--services", nargs="*", help="Export only these services")
+    parser.add_argument("--include-history", action="store_true",
+                       help="Include every stored compliance result in the export")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    add_cli_arguments(parser)
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    # Initialize dashboard
-    dashboard = ComplianceDashboard(args.db_path)
+    tracer = Tracer("dashboard")
+    with cli_instrumentation(args, tracer):
+        # Initialize dashboard
+        dashboard = ComplianceDashboard(args.db_path, tracer=tracer)
+        
+        # Perform requested action
+        with tracer.span(args.action, "cli"):
+            status = _run_action(dashboard, args)
+        
+        tracer.save_metrics(dashboard.db_path, dashboard.session_id)
     
-    # Perform requested action
+    return status
+
+def _run_action(dashboard: ComplianceDashboard, args) -> int:
+    """Perform the action requested on the command line"""
     if args.action == "dashboard":
         dashboard.display_compliance_dashboard()
     
@@ -648,7 +772,9 @@ def main():
             print("Error: --output required for export action")
             return 1
         
-        success = dashboard.export_compliance_report(args.output, args.format)
+        success = dashboard.export_compliance_report(args.output, args.format,
+                                                     start_date=args.start_date, end_date=args.end_date,
+                                                     services=args.services, include_history=args.include_history)
         if success:
             print(f"✓ Compliance report exported to {args.output}")
         else:
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+GAM Output Parser for GWOMBAT
+Streams GAM CSV and JSON output into records
+
+GAM prints lists as CSV, and with "formatjson" as CSV rows whose JSON column
+holds each object. Splitting that text on commas or newlines breaks on quoted
+values (display names, OU paths, descriptions). This module reads it with a
+real CSV/JSON decoder, one record at a time, so memory stays flat however
+large the domain is.
+
+Used by the compliance engine (check_logic) and, through the CLI, by the bash
+scripts that previously parsed GAM output with IFS=',' and awk:
+
+    $GAM print users fields primaryemail,orgunitpath | python3 python-modules/gam_output.py fields primaryEmail orgUnitPath
+    $GAM print users fields primaryemail,lastlogintime | python3 python-modules/gam_output.py count --older-than lastLoginTime 2024-01-01T00:00:00
+    $GAM print users | python3 python-modules/gam_output.py csv > users.csv
+"""
+
+import io
+import sys
+import csv
+import json
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Iterable, Iterator, IO, Union
+
+OUTPUT_FORMATS = ("csv", "json")
+
+# Column GAM uses for the object when "formatjson" is combined with CSV output
+JSON_COLUMN = "JSON"
+
+# Values GAM prints for timestamps that never happened
+NEVER_VALUES = frozenset(["", "never", "1970-01-01t00:00:00.000z", "1970-01-01t00:00:00z"])
+
+# Characters read per chunk when decoding a JSON stream
+JSON_CHUNK_SIZE = 65536
+
+# GAM writes some values (OU paths, notes) longer than the csv module's default limit
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+Source = Union[str, IO[str], Iterable[str]]
+
+def _lines(source: Source) -> Iterable[str]:
+    """Accept GAM output as a string, file object or iterable of lines"""
+    if isinstance(source, str):
+        return io.StringIO(source)
+    return source
+
+def iter_records(source: Source, output_format: str = "csv") -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from GAM output
+
+    Args:
+        source: GAM stdout as a string, file object or iterable of lines
+        output_format: "csv" (including CSV with a formatjson JSON column) or "json"
+
+    Returns:
+        Iterator of dictionaries, one per GAM row or JSON object. Nested JSON
+        is kept as nested dictionaries and lists.
+
+    Raises:
+        ValueError: If the output cannot be decoded in the requested format
+    """
+    if output_format == "csv":
+        return _iter_csv(_lines(source))
+    if output_format == "json":
+        return _iter_json(_lines(source))
+    raise ValueError(f"Unknown GAM output format: {output_format}")
+
+def _iter_csv(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Read CSV rows, expanding a formatjson JSON column into the record"""
+    reader = csv.reader(lines)
+    header = None
+    for row in reader:
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        if header is None:
+            header = [name.strip() for name in row]
+            continue
+
+        record = dict(zip(header, row))
+        embedded = record.get(JSON_COLUMN)
+        if embedded:
+            try:
+                data = json.loads(embedded)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON in GAM row {reader.line_num}: {e}")
+            if isinstance(data, dict):
+                del record[JSON_COLUMN]
+                for key, value in data.items():
+                    record.setdefault(key, value)
+        yield record
+
+def _iter_json(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Decode a JSON array, a single object, or concatenated/newline-delimited
+    objects without loading the whole stream
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(lines) if not hasattr(lines, "read") else iter(lambda: lines.read(JSON_CHUNK_SIZE), "")
+    buffer = ""
+    exhausted = False
+
+    while True:
+        # Skip whitespace and array punctuation between objects
+        position = 0
+        while position < len(buffer) and buffer[position] in " \t\r\n[],":
+            position += 1
+        buffer = buffer[position:]
+
+        if not buffer:
+            if exhausted:
+                return
+            try:
+                buffer = next(chunks)
+            except StopIteration:
+                exhausted = True
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer)
+        except ValueError:
+            # Object continues in the next chunk
+            if exhausted:
+                raise ValueError(f"Invalid JSON in GAM output near: {buffer[:80]!r}")
+            try:
+                buffer += next(chunks)
+            except StopIteration:
+                exhausted = True
+            continue
+
+        buffer = buffer[end:]
+        yield value if isinstance(value, dict) else {"value": value}
+
+def flatten(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Flatten nested dictionaries and lists into dotted keys
+
+    Example: {"name": {"givenName": "Ada"}, "emails": [{"address": "a@x"}]}
+    becomes {"name.givenName": "Ada", "emails.0.address": "a@x"}, matching
+    the column names GAM uses in its plain CSV output.
+    """
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            flat.update(flatten({str(index): item for index, item in enumerate(value)}, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+def lookup(record: Dict[str, Any], name: str) -> Any:
+    """
+    Get a field by GAM column name, ignoring case
+
+    GAM accepts field names in any case on the command line (primaryemail)
+    but prints them camel-cased (primaryEmail). Dotted names also reach into
+    nested formatjson objects.
+    """
+    if name in record:
+        return record[name]
+
+    wanted = name.lower()
+    for key, value in record.items():
+        if key.lower() == wanted:
+            return value
+
+    value: Any = record
+    for part in name.split("."):
+        if isinstance(value, dict):
+            matches = [key for key in value if key.lower() == part.lower()]
+            value = value[matches[0]] if matches else None
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
+
+def coerce_value(value: Any) -> Any:
+    """Convert GAM CSV text to bool, int or None where it is unambiguous"""
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if text == "":
+        return None
+    if text in ("True", "true"):
+        return True
+    if text in ("False", "false"):
+        return False
+    if text.isdigit() and (text == "0" or not text.startswith("0")):
+        return int(text)
+    return text
+
+def parse_timestamp(value: Any, to_utc: bool = False) -> Optional[datetime]:
+    """
+    Parse a GAM timestamp, returning None for blank or "Never" values
+
+    Accepts 2024-05-01T12:30:00.000Z, 2024-05-01T12:30:00+02:00,
+    2024-05-01 12:30:00 and 2024-05-01. By default time zone offsets are
+    dropped, as the bash scripts compared GAM times with local cutoffs as
+    plain text. With to_utc, a time that has an offset is converted to UTC
+    (times without one are taken as UTC already).
+
+    Returns:
+        A naive datetime
+    """
+    if value is None or str(value).strip().lower() in NEVER_VALUES:
+        return None
+    text = str(value).strip().replace(" ", "T")
+    offset = None
+    if text.endswith("Z"):
+        text = text[:-1]
+    for separator in ("+", "-"):
+        index = text.rfind(separator)
+        if index > 10:
+            text, offset = text[:index], text[index:]
+    text = text.split(".")[0]
+    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            timestamp = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if to_utc and offset:
+            digits = offset[1:].replace(":", "")
+            if not digits.isdigit() or len(digits) not in (2, 4):
+                return None
+            shift = timedelta(hours=int(digits[:2]), minutes=int(digits[2:] or 0))
+            timestamp = timestamp - shift if offset[0] == "+" else timestamp + shift
+        return timestamp
+    return None
+
+@dataclass
+class UserRecord:
+    """A user from "gam print users", with typed common fields"""
+    primary_email: str
+    given_name: Optional[str] = None
+    family_name: Optional[str] = None
+    org_unit_path: Optional[str] = None
+    suspended: Optional[bool] = None
+    is_admin: Optional[bool] = None
+    last_login_time: Optional[datetime] = None
+    creation_time: Optional[datetime] = None
+    extra: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    # GAM column names (plain CSV and formatjson) for each field
+    ALIASES = {
+        "primary_email": ("primaryEmail",),
+        "given_name": ("name.givenName", "givenName"),
+        "family_name": ("name.familyName", "familyName"),
+        "org_unit_path": ("orgUnitPath",),
+        "suspended": ("suspended", "isSuspended"),
+        "is_admin": ("isAdmin",),
+        "last_login_time": ("lastLoginTime",),
+        "creation_time": ("creationTime",)
+    }
+
+    @property
+    def display_name(self) -> str:
+        return " ".join(part for part in (self.given_name, self.family_name) if part)
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "UserRecord":
+        """Build a UserRecord from a parsed GAM row"""
+        values = {}
+        for attribute, aliases in cls.ALIASES.items():
+            for alias in aliases:
+                value = lookup(record, alias)
+                if value is not None:
+                    values[attribute] = value
+                    break
+
+        for attribute in ("last_login_time", "creation_time"):
+            values[attribute] = parse_timestamp(values.get(attribute))
+        for attribute in ("suspended", "is_admin"):
+            value = coerce_value(values.get(attribute))
+            values[attribute] = value if isinstance(value, bool) else None
+        for attribute in ("given_name", "family_name", "org_unit_path"):
+            if values.get(attribute) is not None:
+                values[attribute] = str(values[attribute]).strip() or None
+
+        values["primary_email"] = str(values.get("primary_email") or "").strip()
+        return cls(extra=record, **values)
+
+def iter_users(source: Source, output_format: str = "csv") -> Iterator[UserRecord]:
+    """Stream UserRecords from "gam print users" output, skipping rows without an email"""
+    for record in iter_records(source, output_format):
+        user = UserRecord.from_record(record)
+        if user.primary_email:
+            yield user
+
+def _cell(value: Any) -> str:
+    """Render a value as text"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, separators=(",", ":"))
+    return str(value)
+
+def _escape(text: str, separator: str) -> str:
+    """
+    Escape a cell so it stays on one line and in one field
+
+    Backslashes, tabs, carriage returns and newlines become the two-character
+    escapes backslash-backslash, backslash-t, backslash-r and backslash-n;
+    any other separator character becomes backslash-x and its hex code.
+    """
+    text = text.replace("\\", "\\\\").replace("\t", "\\t").replace("\r", "\\r").replace("\n", "\\n")
+    if separator and separator not in ("\t", "\r", "\n", "\\"):
+        text = text.replace(separator, "".join(f"\\x{ord(char):02x}" for char in separator))
+    return text
+
+def _write_fields(records: Iterator[Dict[str, Any]], names: List[str], header: bool, out: IO[str],
+                  separator: str = "\t") -> int:
+    """Write the selected fields as separated lines, trimmed of surrounding whitespace and escaped"""
+    count = 0
+    if header:
+        out.write(separator.join(names) + "\n")
+    for record in records:
+        out.write(separator.join(_escape(_cell(lookup(record, name)).strip(), separator) for name in names) + "\n")
+        count += 1
+    return count
+
+def _csv_row(flat: Dict[str, Any]) -> Dict[str, Any]:
+    """Render booleans as GAM does; other values are left to the csv module"""
+    return {key: _cell(value) if isinstance(value, bool) else value for key, value in flat.items()}
+
+def _write_csv(records: Iterator[Dict[str, Any]], out: IO[str], fieldnames: Optional[List[str]] = None) -> int:
+    """
+    Write records as normalized CSV with flattened columns
+
+    With fieldnames, exactly those columns are written as records stream
+    through. Otherwise the columns are the union of every record's columns
+    in first-seen order, so sparse formatjson objects lose nothing: records
+    are spooled to a temporary file while the header is collected, then
+    written out in a second pass.
+    """
+    count = 0
+    if fieldnames:
+        writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(_csv_row(flatten(record)))
+            count += 1
+        return count
+
+    columns: Dict[str, None] = {}
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        for record in records:
+            flat = _csv_row(flatten(record))
+            columns.update(dict.fromkeys(flat))
+            spool.write(json.dumps(flat, separators=(",", ":"), default=str) + "\n")
+            count += 1
+
+        if not count:
+            return 0
+        writer = csv.DictWriter(out, fieldnames=list(columns), lineterminator="\n")
+        writer.writeheader()
+        spool.seek(0)
+        for line in spool:
+            writer.writerow(json.loads(line))
+    return count
+
+def _count(records: Iterator[Dict[str, Any]], older_than: Optional[List[str]]) -> int:
+    """Count records, optionally only those whose timestamp field is before a cutoff or never set"""
+    if not older_than:
+        return sum(1 for _ in records)
+
+    name, cutoff_text = older_than
+    cutoff = parse_timestamp(cutoff_text)
+    if cutoff is None:
+        raise ValueError(f"Invalid cutoff timestamp: {cutoff_text}")
+
+    count = 0
+    for record in records:
+        timestamp = parse_timestamp(lookup(record, name))
+        if timestamp is None or timestamp < cutoff:
+            count += 1
+    return count
+
+def main():
+    """Command-line interface for bash scripts piping GAM output"""
+    parser = argparse.ArgumentParser(description="Parse GAM CSV/JSON output from stdin")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv", help="GAM output format (default: csv)")
+    parser.add_argument("--input", help="Read GAM output from a file instead of stdin")
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    fields_parser = subparsers.add_parser("fields", help="Print selected fields as separated lines")
+    fields_parser.add_argument("names", nargs="+", help="GAM field names (case-insensitive, dotted for nested)")
+    fields_parser.add_argument("--header", action="store_true", help="Print a header line")
+    fields_parser.add_argument("--separator", default="\t",
+                               help="Field separator (default: tab). Use a non-whitespace character such as "
+                                    "$'\\x1f' when fields can be empty, since bash read collapses runs of "
+                                    "whitespace separators")
+
+    count_parser = subparsers.add_parser("count", help="Count records")
+    count_parser.add_argument("--older-than", nargs=2, metavar=("FIELD", "TIMESTAMP"),
+                              help="Only count records whose FIELD is before TIMESTAMP or never set")
+
+    csv_parser = subparsers.add_parser("csv", help="Print normalized CSV with formatjson objects flattened")
+    csv_parser.add_argument("--fields", nargs="+", metavar="COLUMN",
+                            help="Write only these flattened columns, streaming without a temporary file "
+                                 "(default: every column any record has)")
+    subparsers.add_parser("json", help="Print one JSON object per line")
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    stream = open(args.input, newline="") if args.input else io.TextIOWrapper(sys.stdin.buffer, newline="")
+    out = sys.stdout
+
+    try:
+        records = iter_records(stream, args.format)
+
+        if args.command == "fields":
+            _write_fields(records, args.names, args.header, out, args.separator)
+        elif args.command == "count":
+            out.write(f"{_count(records, args.older_than)}\n")
+        elif args.command == "csv":
+            _write_csv(records, out, args.fields)
+        elif args.command == "json":
+            for record in records:
+                out.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+
+        return 0
+
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Consumer (head, a bash read loop) stopped early
+        return 0
+    finally:
+        if args.input:
+            stream.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Managed GAM Runner for GWOMBAT
+Bounded, deadline-aware execution of GAM commands
+
+Commands are tokenized with shlex, so quoted arguments (queries, OU paths)
+reach GAM intact, and may pipe GAM's output through a small set of text
+filters (grep, head, jq, ...) as the SCuBA baselines do. Every command runs
+in its own process group, so a timeout kills GAM together with any
+subprocesses it started.
+
+A runner is created per assessment:
+- at most ``max_processes`` GAM commands run at once
+- an optional assessment-wide deadline caps every command's timeout and
+  cancels whatever is still running when it passes
+- an optional rate cap limits how many commands start per second, so bulk
+  operations stay under the Google API quota GAM draws on
+- per-command latency and exit-code histograms are kept and can be written
+  to the performance_metrics table
+"""
+
+import os
+import time
+import shlex
+import signal
+import logging
+import threading
+import subprocess
+from tempfile import TemporaryFile
+from typing import Dict, List, Optional, Tuple, Any
+
+try:
+    from .rate_limit import TokenBucket
+except ImportError:
+    from rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Programs allowed after a "|" in a GAM command; GAM itself must come first
+PIPELINE_FILTERS = frozenset(["grep", "egrep", "fgrep", "head", "tail", "wc", "jq", "sort", "uniq", "cut", "tr"])
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Exit code reported for commands killed at their timeout or the deadline
+TIMEOUT_EXIT_CODE = -int(signal.SIGKILL)
+
+class GamCommandError(ValueError):
+    """Raised when a GAM command line cannot be turned into a safe pipeline"""
+
+def split_command(command: str) -> List[List[str]]:
+    """
+    Tokenize a command line into pipeline stages with shlex
+
+    Quotes are removed but quoted whitespace is kept, so ``query "name:a  b"``
+    yields the single argument ``name:a  b``. Stages are not validated.
+
+    Raises:
+        GamCommandError: If the command is malformed (unbalanced quotes, "||")
+    """
+    try:
+        lexer = shlex.shlex(command, posix=True, punctuation_chars="|")
+        lexer.whitespace_split = True
+        tokens = list(lexer)
+    except ValueError as e:
+        raise GamCommandError(f"Cannot parse GAM command: {e}")
+
+    stages = [[]]
+    for token in tokens:
+        if token == "|":
+            stages.append([])
+        elif set(token) == {"|"}:
+            raise GamCommandError(f"Unsupported operator '{token}' in GAM command")
+        else:
+            stages[-1].append(token)
+    return stages
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with exit-code counts"""
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.exit_codes: Dict[int, int] = {}
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float, exit_code: int) -> None:
+        index = len(LATENCY_BUCKETS)
+        for i, upper in enumerate(LATENCY_BUCKETS):
+            if seconds <= upper:
+                index = i
+                break
+        self.bucket_counts[index] += 1
+        self.exit_codes[exit_code] = self.exit_codes.get(exit_code, 0) + 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, count in enumerate(other.bucket_counts):
+            self.bucket_counts[i] += count
+        for exit_code, count in other.exit_codes.items():
+            self.exit_codes[exit_code] = self.exit_codes.get(exit_code, 0) + count
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+
+    def bucket_bound(self, index: int) -> float:
+        """Upper bound of a bucket; the overflow bucket reports the slowest observation"""
+        return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max_seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a percentile as the upper bound of the bucket containing it"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.bucket_counts):
+            seen += count
+            if seen >= target and count:
+                return min(self.bucket_bound(index), self.max_seconds)
+        return self.max_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total_seconds, 3),
+            "p50_seconds": round(self.percentile(0.5), 3),
+            "p95_seconds": round(self.percentile(0.95), 3),
+            "max_seconds": round(self.max_seconds, 3),
+            "exit_codes": {str(code): count for code, count in sorted(self.exit_codes.items())}
+        }
+
+class GamRunner:
+    """
+    Run GAM commands with bounded concurrency and an overall deadline
+
+    Usage:
+        runner = GamRunner("gam", max_processes=4, command_timeout=30, deadline_seconds=1800)
+        success, stdout, stderr = runner.run("gam print users query 'orgUnitPath=/Staff'")
+        runner.cancel()  # Kill anything still running
+    """
+
+    def __init__(self, gam_path: str = "gam", max_processes: int = 4, command_timeout: float = 30,
+                 deadline_seconds: Optional[float] = None, rate_limit: Optional[float] = None):
+        """
+        Initialize GAM runner
+
+        Args:
+            gam_path: Path to GAM executable
+            max_processes: Maximum GAM commands running at once
+            command_timeout: Per-command timeout in seconds
+            deadline_seconds: Seconds from now after which no command may run (None or 0 = no deadline)
+            rate_limit: Maximum commands started per second (None or 0 = unlimited)
+        """
+        self.gam_path = gam_path
+        self.max_processes = max(1, int(max_processes))
+        self.command_timeout = command_timeout
+        self.deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        self._slots = threading.BoundedSemaphore(self.max_processes)
+        self._rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self._lock = threading.Lock()
+        self._running: Dict[int, subprocess.Popen] = {}
+        self._cancelled = False
+        self._active_commands = 0
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.stats = {"executions": 0, "timeouts": 0, "deadline_exceeded": 0, "rejected": 0, "peak_running": 0,
+                      "rate_limited_seconds": 0.0}
+
+    def parse_command(self, command: str) -> List[List[str]]:
+        """
+        Tokenize a command into pipeline stages
+
+        The first stage is GAM (prepended if missing); later stages must be
+        one of PIPELINE_FILTERS. No shell is involved.
+
+        Raises:
+            GamCommandError: If the command is empty, malformed or pipes into a disallowed program
+        """
+        stages = split_command(command)
+
+        if any(not stage for stage in stages):
+            raise GamCommandError("Empty stage in GAM command")
+
+        first = stages[0]
+        if first[0] in (self.gam_path, "gam"):
+            first[0] = self.gam_path
+        else:
+            first.insert(0, self.gam_path)
+
+        for stage in stages[1:]:
+            if os.path.basename(stage[0]) not in PIPELINE_FILTERS:
+                raise GamCommandError(f"Pipeline stage not allowed: {stage[0]}")
+
+        return stages
+
+    def label(self, stages: List[List[str]]) -> str:
+        """Histogram key for a command: the command line without the GAM path"""
+        return " | ".join(" ".join(stage) for stage in [stages[0][1:]] + stages[1:])
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None without a deadline"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def run(self, command: str) -> Tuple[bool, str, str]:
+        """
+        Execute a GAM command
+
+        Args:
+            command: GAM command line, optionally piped through filters
+
+        Returns:
+            Tuple of (success, stdout, stderr)
+        """
+        try:
+            stages = self.parse_command(command)
+        except GamCommandError as e:
+            with self._lock:
+                self.stats["rejected"] += 1
+            logger.error(f"Rejected GAM command '{command}': {e}")
+            return (False, "", str(e))
+
+        remaining = self.remaining()
+        if self._cancelled or (remaining is not None and remaining <= 0):
+            return self._deadline_result(command)
+
+        if self._rate_limiter is not None:
+            waited = self._rate_limiter.acquire()
+            if waited:
+                with self._lock:
+                    self.stats["rate_limited_seconds"] += waited
+            remaining = self.remaining()
+            if self._cancelled or (remaining is not None and remaining <= 0):
+                return self._deadline_result(command)
+
+        if not self._slots.acquire(timeout=remaining):
+            return self._deadline_result(command)
+
+        try:
+            timeout = self.command_timeout
+            remaining = self.remaining()
+            if remaining is not None:
+                if remaining <= 0 or self._cancelled:
+                    return self._deadline_result(command)
+                timeout = min(timeout, remaining) if timeout else remaining
+
+            with self._lock:
+                self._active_commands += 1
+                self.stats["peak_running"] = max(self.stats["peak_running"], self._active_commands)
+
+            logger.debug(f"Executing GAM command: {stages}")
+            start = time.perf_counter()
+            try:
+                exit_code, stdout, stderr = self._run_pipeline(stages, timeout)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self._active_commands -= 1
+        finally:
+            self._slots.release()
+
+        with self._lock:
+            self.stats["executions"] += 1
+            self.histograms.setdefault(self.label(stages), LatencyHistogram()).record(elapsed, exit_code)
+
+        if exit_code == TIMEOUT_EXIT_CODE:
+            hit_deadline = self._cancelled or (self.remaining() is not None and self.remaining() <= 0)
+            with self._lock:
+                self.stats["deadline_exceeded" if hit_deadline else "timeouts"] += 1
+            message = "Assessment deadline exceeded" if hit_deadline else "Command timed out"
+            logger.error(f"GAM command {'cancelled' if hit_deadline else 'timed out'}: {command}")
+            return (False, stdout, message)
+
+        return (exit_code == 0, stdout, stderr)
+
+    def _deadline_result(self, command: str) -> Tuple[bool, str, str]:
+        with self._lock:
+            self.stats["deadline_exceeded"] += 1
+        logger.warning(f"Skipping GAM command after assessment deadline: {command}")
+        return (False, "", "Assessment deadline exceeded")
+
+    def _run_pipeline(self, stages: List[List[str]], timeout: Optional[float]) -> Tuple[int, str, str]:
+        """
+        Run the pipeline, killing every stage's process group on timeout
+
+        Exit status follows the shell (the last stage), except that GAM failing
+        fails the command even when piped, so an API error is not mistaken for
+        an empty result, and grep finding no lines (exit 1) is a valid answer.
+
+        Returns:
+            Tuple of (exit code, stdout, stderr)
+        """
+        processes = []
+        error_files = []
+        try:
+            previous_stdout = None
+            for index, stage in enumerate(stages):
+                error_file = TemporaryFile()
+                error_files.append(error_file)
+                process = subprocess.Popen(
+                    stage,
+                    stdin=previous_stdout if previous_stdout is not None else subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=error_file,
+                    start_new_session=True
+                )
+                if previous_stdout is not None:
+                    # Let the previous stage see SIGPIPE if this one exits early
+                    previous_stdout.close()
+                previous_stdout = process.stdout
+                processes.append(process)
+                self._track(process)
+
+            try:
+                stdout, _ = processes[-1].communicate(timeout=timeout)
+                for process in processes[:-1]:
+                    process.wait(timeout=self._remaining_timeout(timeout))
+            except subprocess.TimeoutExpired:
+                for process in processes:
+                    self._kill(process)
+                stdout = b""
+                exit_code = TIMEOUT_EXIT_CODE
+            else:
+                exit_code = self._pipeline_exit_code(stages, processes)
+
+            stderr = b""
+            for error_file in error_files:
+                error_file.seek(0)
+                stderr += error_file.read()
+
+            return (exit_code, stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace"))
+
+        except OSError as e:
+            for process in processes:
+                self._kill(process)
+            logger.error(f"GAM command execution failed: {e}")
+            return (127, "", str(e))
+        finally:
+            for process in processes:
+                self._untrack(process)
+            for error_file in error_files:
+                error_file.close()
+
+    def _remaining_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return max(0.0, min(timeout, remaining) if timeout else remaining)
+
+    @staticmethod
+    def _pipeline_exit_code(stages: List[List[str]], processes: List[subprocess.Popen]) -> int:
+        gam_exit = processes[0].returncode
+        if len(processes) > 1 and gam_exit not in (0, -int(signal.SIGPIPE)):
+            return gam_exit
+
+        exit_code = processes[-1].returncode
+        if exit_code == 1 and len(stages) > 1 and os.path.basename(stages[-1][0]) in ("grep", "egrep", "fgrep"):
+            return 0
+        return exit_code
+
+    def _track(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._running[process.pid] = process
+            cancelled = self._cancelled
+        if cancelled:
+            self._kill(process)
+
+    def _untrack(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._running.pop(process.pid, None)
+
+    @staticmethod
+    def _kill(process: subprocess.Popen) -> None:
+        """Kill a process and everything in its process group"""
+        if process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"GAM process {process.pid} did not exit after SIGKILL")
+
+    def cancel(self) -> None:
+        """Kill all running commands and refuse new ones"""
+        with self._lock:
+            self._cancelled = True
+            running = list(self._running.values())
+        for process in running:
+            self._kill(process)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return execution statistics and the combined latency histogram"""
+        with self._lock:
+            stats = dict(self.stats)
+            combined = LatencyHistogram()
+            for histogram in self.histograms.values():
+                combined.merge(histogram)
+        stats["max_processes"] = self.max_processes
+        stats["rate_limited_seconds"] = round(stats["rate_limited_seconds"], 3)
+        stats["latency"] = combined.to_dict()
+        return stats
+
+    def metric_rows(self, session_id: str) -> List[Tuple]:
+        """
+        Histogram rows for the performance_metrics table
+
+        Per distinct command:
+        - gam_command: total seconds, executions and success (no failures)
+        - gam_latency_bucket: operation_name "<command> le=<bound>", executions in the bucket
+        - gam_exit_code: operation_name "<command> exit=<code>", executions with that code
+
+        Returns:
+            Tuples of (operation_type, operation_name, duration_seconds,
+            items_processed, throughput_per_second, session_id, success)
+        """
+        rows = []
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+        for label, histogram in histograms:
+            failures = sum(count for code, count in histogram.exit_codes.items() if code != 0)
+            rows.append(("gam_command", label, histogram.total_seconds, histogram.count,
+                         histogram.count / histogram.total_seconds if histogram.total_seconds else None,
+                         session_id, 0 if failures else 1))
+            for index, count in enumerate(histogram.bucket_counts):
+                if count:
+                    bound = histogram.bucket_bound(index)
+                    name = f"{label} le={LATENCY_BUCKETS[index]:g}" if index < len(LATENCY_BUCKETS) else f"{label} le=inf"
+                    rows.append(("gam_latency_bucket", name, bound, count, None, session_id, 1))
+            for exit_code, count in sorted(histogram.exit_codes.items()):
+                rows.append(("gam_exit_code", f"{label} exit={exit_code}", 0.0, count, None, session_id,
+                             1 if exit_code == 0 else 0))
+        return rows
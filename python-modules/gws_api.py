@@ -8,26 +8,65 @@ GAM commands with direct API access for more sophisticated compliance checking.
 """
 
 import json
+import time
+import random
+import importlib.util
+import socket
 import logging
 import sqlite3
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Union, Iterator, Iterable, Tuple
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
 import os
 
-# Google API imports (optional - graceful degradation if not available)
 try:
-    from googleapiclient.discovery import build
-    from google.auth.transport.requests import Request
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.errors import HttpError
-    GOOGLE_API_AVAILABLE = True
+    from .instrumentation import Tracer, add_cli_arguments, cli_instrumentation
+    from .rate_limit import TokenBucket
 except ImportError:
-    GOOGLE_API_AVAILABLE = False
+    from instrumentation import Tracer, add_cli_arguments, cli_instrumentation
+    from rate_limit import TokenBucket
+
+# Google API client libraries are optional (graceful degradation if not
+# available) and are only imported when a GoogleWorkspaceAPI is constructed
+GOOGLE_API_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("googleapiclient", "google_auth_oauthlib", "google_auth_httplib2", "httplib2")
+)
+if not GOOGLE_API_AVAILABLE:
     logging.warning("Google API client libraries not available - API features will be disabled")
 
+class HttpError(Exception):
+    """Placeholder until the Google API client is imported"""
+
+class UnknownApiNameOrVersion(Exception):
+    """Placeholder until the Google API client is imported"""
+
+def _import_google_client() -> bool:
+    """Import the Google API client libraries into module globals on first use"""
+    global GOOGLE_API_AVAILABLE, build, build_from_document, UnknownApiNameOrVersion
+    global Request, Credentials, InstalledAppFlow, HttpError, google_auth_httplib2, httplib2
+    
+    if 'build' in globals():
+        return True
+    
+    try:
+        from googleapiclient.discovery import build, build_from_document
+        from googleapiclient.errors import UnknownApiNameOrVersion
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from googleapiclient.errors import HttpError
+        import google_auth_httplib2
+        import httplib2
+        return True
+    except ImportError as e:
+        GOOGLE_API_AVAILABLE = False
+        logging.warning(f"Google API client libraries not available - API features will be disabled ({e})")
+        return False
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -38,6 +77,55 @@ class APIServiceConfig:
     scopes: List[str]
     enabled: bool = True
 
+class LazyServiceRegistry(dict):
+    """
+    Mapping of API service name to client, built on first access
+    
+    Lets callers keep using ``services['admin']`` while only the services an
+    action actually touches pay for discovery and client construction.
+    """
+    
+    def __init__(self, builder: Any):
+        super().__init__()
+        self._builder = builder
+        self._lock = threading.Lock()
+
+    def __missing__(self, name: str) -> Any:
+        with self._lock:
+            if not dict.__contains__(self, name):
+                dict.__setitem__(self, name, self._builder(name))
+            return dict.__getitem__(self, name)
+
+# Rate limiters are shared by every GoogleWorkspaceAPI instance in the process
+# that uses the same rate for a service, since quota is enforced per project
+# rather than per client object. Keying on the rate as well means creating a
+# client never loosens or tightens the limit another live client relies on.
+_RATE_LIMITERS: Dict[Tuple[str, float], TokenBucket] = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+def get_rate_limiter(service_name: str, rate: float) -> TokenBucket:
+    """Return the process-wide rate limiter for an API service at a given rate"""
+    key = (service_name, float(rate))
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(key)
+        if limiter is None:
+            limiter = TokenBucket(rate)
+            _RATE_LIMITERS[key] = limiter
+        return limiter
+
+class CollectorTimeout(RuntimeError):
+    """Raised in a snapshot collector's thread once its time budget has run out"""
+
+@dataclass
+class APICallMetrics:
+    """Per-service API call, retry and throttling counters"""
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    throttled_responses: int = 0
+    rate_limited_seconds: float = 0.0  # Time spent waiting on the token bucket
+    backoff_seconds: float = 0.0  # Time spent sleeping between retries
+
 class GoogleWorkspaceAPI:
     """
     Enhanced Google Workspace API integration for GWOMBAT
@@ -59,9 +147,38 @@ class GoogleWorkspaceAPI:
         'https://www.googleapis.com/auth/calendar.readonly'
     ]
     
+    # Gmail settings collected per user, mapped to their settings() getter
+    GMAIL_SETTINGS = {
+        'auto_forwarding': 'getAutoForwarding',
+        'imap': 'getImap',
+        'pop': 'getPop',
+        'vacation': 'getVacation'
+    }
+    
+    # Maximum sub-requests the Gmail API accepts in one batch request
+    GMAIL_BATCH_LIMIT = 100
+    
+    # Default request rates (requests/second) per API service, kept below
+    # the published per-project quotas
+    RATE_LIMITS = {
+        'admin': 20.0,
+        'reports': 5.0,
+        'drive': 15.0,
+        'gmail': 25.0,
+        'calendar': 10.0
+    }
+    
+    # HTTP statuses and 403 reasons that are worth retrying
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+    RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded', 'quotaExceeded')
+    
     def __init__(self, db_path: str = "./config/gwombat.db", 
                  credentials_path: str = "./config/gws_credentials.json",
-                 token_path: str = "./config/gws_token.json"):
+                 token_path: str = "./config/gws_token.json",
+                 max_retries: int = 5,
+                 rate_limits: Optional[Dict[str, float]] = None,
+                 discovery_cache_dir: Optional[str] = None,
+                 tracer: Optional[Tracer] = None):
         """
         Initialize Google Workspace API integration
         
@@ -69,11 +186,19 @@ class GoogleWorkspaceAPI:
             db_path: Path to GWOMBAT database
             credentials_path: Path to Google OAuth2 credentials file
             token_path: Path to store/load OAuth2 tokens
+            max_retries: Retries for throttled or transient API errors
+            rate_limits: Per-service request rate overrides (requests/second)
+            discovery_cache_dir: Directory for cached discovery documents
+                (defaults to a discovery_cache directory next to the token)
+            tracer: Span collector for timing data (one is created if omitted)
         """
         self.db_path = Path(db_path)
         self.credentials_path = Path(credentials_path)
         self.token_path = Path(token_path)
+        self.discovery_cache_dir = (Path(discovery_cache_dir) if discovery_cache_dir
+                                    else self.token_path.parent / "discovery_cache")
         self.session_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_gws_api_{id(self)}"
+        self.tracer = tracer or Tracer("gws_api")
         
         # API service configurations
         self.api_services = {
@@ -84,11 +209,22 @@ class GoogleWorkspaceAPI:
             'calendar': APIServiceConfig('calendar', 'v3', [self.SCOPES[8]])
         }
         
-        # Initialize services
-        self.services = {}
+        # Rate limiting and retry configuration
+        self.max_retries = max_retries
+        self.backoff_base = 1.0
+        self.backoff_max = 64.0
+        limits = dict(self.RATE_LIMITS, **(rate_limits or {}))
+        self.rate_limiters = {name: get_rate_limiter(name, rate) for name, rate in limits.items()}
+        self.api_metrics = {name: APICallMetrics() for name in limits}
+        self._metrics_lock = threading.Lock()
+        
+        # API clients are built lazily on first access
+        self.services = LazyServiceRegistry(self._build_service)
         self.authenticated = False
+        self._credentials = None
+        self._thread_local = threading.local()
         
-        if GOOGLE_API_AVAILABLE:
+        if GOOGLE_API_AVAILABLE and _import_google_client():
             self._authenticate()
         else:
             logger.warning("Google API client not available - using GAM fallback mode")
@@ -121,13 +257,8 @@ class GoogleWorkspaceAPI:
                 with open(self.token_path, 'w') as token:
                     token.write(creds.to_json())
             
-            # Build API services
-            self.services['admin'] = build('admin', 'directory_v1', credentials=creds)
-            self.services['reports'] = build('admin', 'reports_v1', credentials=creds)
-            self.services['drive'] = build('drive', 'v3', credentials=creds)
-            self.services['gmail'] = build('gmail', 'v1', credentials=creds)
-            self.services['calendar'] = build('calendar', 'v3', credentials=creds)
-            
+            # API services are built on first use (see _build_service)
+            self._credentials = creds
             self.authenticated = True
             logger.info("Google Workspace API authentication successful")
             return True
@@ -141,6 +272,251 @@ class GoogleWorkspaceAPI:
         """Check if API authentication is successful"""
         return self.authenticated and GOOGLE_API_AVAILABLE
 
+    def _build_service(self, name: str) -> Any:
+        """
+        Build an API client without network discovery
+        
+        Uses the discovery documents bundled with google-api-python-client.
+        If a document is not bundled, it is fetched once and cached in
+        discovery_cache_dir so later constructions build from the local copy.
+        """
+        if name not in self.api_services:
+            raise KeyError(f"Unknown API service: {name}")
+        
+        config = self.api_services[name]
+        try:
+            return build(config.service_name, config.version, credentials=self._credentials,
+                         static_discovery=True, cache_discovery=False)
+        except UnknownApiNameOrVersion:
+            pass
+        
+        cache_file = self.discovery_cache_dir / f"{config.service_name}.{config.version}.json"
+        if cache_file.exists():
+            with open(cache_file, 'r') as f:
+                return build_from_document(f.read(), credentials=self._credentials)
+        
+        logger.info(f"Fetching discovery document for {config.service_name} {config.version}")
+        service = build(config.service_name, config.version, credentials=self._credentials,
+                        static_discovery=False, cache_discovery=False)
+        try:
+            self.discovery_cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump(service._rootDesc, f)
+        except Exception as e:
+            logger.warning(f"Unable to cache discovery document {cache_file}: {e}")
+        return service
+
+    def _thread_http(self) -> Any:
+        """
+        Return an authorized HTTP transport owned by the calling thread
+        
+        httplib2 transports are not thread-safe, so requests made from
+        concurrent collectors each execute over their thread's own transport.
+        """
+        http = getattr(self._thread_local, 'http', None)
+        if http is None and self._credentials is not None:
+            http = google_auth_httplib2.AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._thread_local.http = http
+        return http
+
+    def _execute(self, request: Any, service_name: str, cost: int = 1, http: Any = None) -> Any:
+        """
+        Execute an API request with rate limiting and retries
+        
+        Waits on the service's token bucket before each attempt and retries
+        429, 5xx and rate-limit 403 responses (and transient network errors)
+        with exponential backoff and full jitter, honouring Retry-After.
+        
+        Args:
+            request: HttpRequest or BatchHttpRequest to execute
+            service_name: API service the request belongs to ('admin', 'reports', ...)
+            cost: Tokens to take from the rate limiter (sub-requests in a batch)
+            http: Transport override; defaults to the calling thread's transport
+        """
+        method = getattr(request, 'methodId', None) or type(request).__name__
+        with self.tracer.span(f"{service_name}.{method}", "api_call", cost=cost) as span_args:
+            return self._execute_with_retries(request, service_name, cost, http, span_args)
+
+    def _execute_with_retries(self, request: Any, service_name: str, cost: int, http: Any,
+                              span_args: Dict[str, Any]) -> Any:
+        """Retry loop behind _execute; records attempts in the call's span"""
+        limiter = self.rate_limiters.get(service_name)
+        metrics = self.api_metrics.setdefault(service_name, APICallMetrics())
+        attempt = 0
+        
+        while True:
+            self._check_deadline()
+            span_args['attempts'] = attempt + 1
+            waited = limiter.acquire(cost) if limiter else 0.0
+            self._check_deadline()
+            with self._metrics_lock:
+                metrics.calls += 1
+                metrics.rate_limited_seconds += waited
+            
+            try:
+                response = request.execute(http=http or self._thread_http())
+                if limiter:
+                    limiter.reward()
+                return response
+            except Exception as e:
+                throttled, retryable, retry_after = self._classify_error(e)
+                if throttled and limiter:
+                    limiter.penalize()
+                
+                if not retryable or attempt >= self.max_retries:
+                    with self._metrics_lock:
+                        metrics.failures += 1
+                        metrics.throttled_responses += int(throttled)
+                    raise
+                
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                if retry_after:
+                    delay = max(delay, retry_after)
+                deadline = getattr(self._thread_local, 'deadline', None)
+                if deadline is not None:
+                    delay = min(delay, max(0.0, deadline - time.monotonic()))
+                attempt += 1
+                with self._metrics_lock:
+                    metrics.retries += 1
+                    metrics.throttled_responses += int(throttled)
+                    metrics.backoff_seconds += delay
+                
+                logger.debug(f"Retrying {service_name} request in {delay:.1f}s "
+                             f"(attempt {attempt}/{self.max_retries}): {e}")
+                time.sleep(delay)
+
+    def _check_deadline(self) -> None:
+        """
+        Stop a snapshot collector whose time budget has run out
+        
+        Called before every request (so between pages of a listing) in the
+        thread running the collector.
+        
+        Raises:
+            CollectorTimeout: If the calling thread's collector deadline has passed
+        """
+        deadline = getattr(self._thread_local, 'deadline', None)
+        if deadline is not None and time.monotonic() >= deadline:
+            self._thread_local.timed_out = True
+            raise CollectorTimeout("Snapshot collector time budget exhausted")
+
+    def _classify_error(self, error: Exception) -> Tuple[bool, bool, Optional[float]]:
+        """
+        Classify a request error
+        
+        Returns:
+            Tuple of (throttled, retryable, Retry-After seconds or None)
+        """
+        if isinstance(error, (socket.timeout, ConnectionError, TimeoutError)):
+            return False, True, None
+        
+        if not GOOGLE_API_AVAILABLE or not isinstance(error, HttpError):
+            return False, False, None
+        
+        status = getattr(error.resp, 'status', None)
+        try:
+            status = int(status)
+        except (TypeError, ValueError):
+            return False, False, None
+        
+        content = error.content.decode('utf-8', 'replace') if isinstance(error.content, bytes) else str(error.content)
+        rate_limited_403 = status == 403 and any(reason in content for reason in self.RATE_LIMIT_REASONS)
+        throttled = status == 429 or rate_limited_403
+        retryable = throttled or status in self.RETRYABLE_STATUSES
+        
+        retry_after = None
+        try:
+            header = error.resp.get('retry-after')
+            retry_after = float(header) if header else None
+        except (AttributeError, TypeError, ValueError):
+            pass
+        
+        return throttled, retryable, retry_after
+
+    def get_api_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-service call, retry and throttling metrics"""
+        with self._metrics_lock:
+            return {
+                name: dict(
+                    calls=m.calls,
+                    retries=m.retries,
+                    failures=m.failures,
+                    throttled_responses=m.throttled_responses,
+                    rate_limited_seconds=round(m.rate_limited_seconds, 3),
+                    backoff_seconds=round(m.backoff_seconds, 3),
+                    current_rate=self.rate_limiters[name].rate if name in self.rate_limiters else None
+                )
+                for name, m in self.api_metrics.items()
+                if m.calls
+            }
+
+    def _iter_pages(self, service_name: str, collection: Any, items_key: str,
+                    **list_kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Yield items from every page of a list() call
+        
+        Follows nextPageToken via the collection's list_next(), holding only
+        one page in memory at a time.
+        
+        Args:
+            service_name: API service the collection belongs to
+            collection: API resource collection (e.g. service.users())
+            items_key: Response key holding the page's items
+            **list_kwargs: Arguments for the initial list() request
+        """
+        request = collection.list(**list_kwargs)
+        while request is not None:
+            response = self._execute(request, service_name)
+            for item in response.get(items_key, []):
+                yield item
+            request = collection.list_next(request, response)
+
+    def iter_users(self, fields: str = "primaryEmail,isEnforcedIn2Sv,suspended",
+                   query: Optional[str] = None, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all users in the domain, page by page
+        
+        Args:
+            fields: User fields to request for each user
+            query: Optional Directory API user search query
+            page_size: Users per page (API maximum is 500)
+        """
+        if not self.is_authenticated():
+            return
+        
+        list_kwargs = {
+            'customer': 'my_customer',
+            'maxResults': page_size,
+            'fields': f'nextPageToken,users({fields})'
+        }
+        if query:
+            list_kwargs['query'] = query
+        
+        yield from self._iter_pages('admin', self.services['admin'].users(), 'users', **list_kwargs)
+
+    def iter_activities(self, application: str, start_date: datetime, end_date: datetime,
+                        page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over Reports API activities for an application, page by page
+        
+        Args:
+            application: Reports application name ('admin', 'login', 'drive', 'token', ...)
+            start_date: Start of the reporting window
+            end_date: End of the reporting window
+            page_size: Activities per page (API maximum is 1000)
+        """
+        if not self.is_authenticated():
+            return
+        
+        yield from self._iter_pages(
+            'reports', self.services['reports'].activities(), 'items',
+            userKey='all',
+            applicationName=application,
+            startTime=start_date.isoformat() + 'Z',
+            endTime=end_date.isoformat() + 'Z',
+            maxResults=page_size
+        )
+
     def get_domain_info(self) -> Optional[Dict[str, Any]]:
         """Get domain configuration information"""
         if not self.is_authenticated():
@@ -148,7 +524,7 @@ class GoogleWorkspaceAPI:
         
         try:
             service = self.services['admin']
-            domains = service.domains().list(customer='my_customer').execute()
+            domains = self._execute(service.domains().list(customer='my_customer'), 'admin')
             
             return {
                 'domains': domains.get('domains', []),
@@ -170,7 +546,7 @@ class GoogleWorkspaceAPI:
         
         try:
             service = self.services['admin']
-            org_units = service.orgunits().list(customerId='my_customer').execute()
+            org_units = self._execute(service.orgunits().list(customerId='my_customer'), 'admin')
             
             return {
                 'organizational_units': org_units.get('organizationUnits', []),
@@ -188,7 +564,7 @@ class GoogleWorkspaceAPI:
         
         try:
             service = self.services['admin']
-            user = service.users().get(userKey=user_email).execute()
+            user = self._execute(service.users().get(userKey=user_email), 'admin')
             
             # Extract security-relevant information
             security_info = {
@@ -223,28 +599,28 @@ class GoogleWorkspaceAPI:
             
             # Auto-forwarding settings
             try:
-                forwarding = service.users().settings().getAutoForwarding(userId=user_email).execute()
+                forwarding = self._execute(service.users().settings().getAutoForwarding(userId=user_email), 'gmail')
                 settings['auto_forwarding'] = forwarding
             except HttpError:
                 settings['auto_forwarding'] = None
             
             # IMAP settings
             try:
-                imap = service.users().settings().getImap(userId=user_email).execute()
+                imap = self._execute(service.users().settings().getImap(userId=user_email), 'gmail')
                 settings['imap'] = imap
             except HttpError:
                 settings['imap'] = None
             
             # POP settings
             try:
-                pop = service.users().settings().getPop(userId=user_email).execute()
+                pop = self._execute(service.users().settings().getPop(userId=user_email), 'gmail')
                 settings['pop'] = pop
             except HttpError:
                 settings['pop'] = None
             
             # Vacation responder
             try:
-                vacation = service.users().settings().getVacation(userId=user_email).execute()
+                vacation = self._execute(service.users().settings().getVacation(userId=user_email), 'gmail')
                 settings['vacation'] = vacation
             except HttpError:
                 settings['vacation'] = None
@@ -258,6 +634,74 @@ class GoogleWorkspaceAPI:
             logger.error(f"Error retrieving Gmail settings for {user_email}: {e}")
             return None
 
+    def iter_gmail_settings(self, user_emails: Iterable[str], batch_size: int = GMAIL_BATCH_LIMIT,
+                            http: Any = None) -> Iterator[Dict[str, Any]]:
+        """
+        Collect Gmail security settings for many users using batch requests
+        
+        All four settings for up to ``batch_size / 4`` users are fetched in a
+        single HTTP round trip. Results are yielded per user, in input order,
+        as each batch completes. A failed sub-request sets that setting to
+        None and records the error under the user's 'errors' key.
+        
+        Args:
+            user_emails: Users to collect settings for
+            batch_size: Sub-requests per batch (capped at GMAIL_BATCH_LIMIT)
+            http: Optional HTTP transport for executing batches (e.g. a
+                googleapiclient.http.HttpMockSequence in tests)
+        """
+        if not self.is_authenticated():
+            return
+        
+        service = self.services['gmail']
+        users_per_batch = max(1, min(batch_size, self.GMAIL_BATCH_LIMIT) // len(self.GMAIL_SETTINGS))
+        
+        pending = []
+        for user_email in user_emails:
+            pending.append(user_email)
+            if len(pending) >= users_per_batch:
+                yield from self._execute_gmail_settings_batch(service, pending, http)
+                pending = []
+        
+        if pending:
+            yield from self._execute_gmail_settings_batch(service, pending, http)
+
+    def _execute_gmail_settings_batch(self, service: Any, user_emails: List[str],
+                                      http: Any = None) -> List[Dict[str, Any]]:
+        """Execute one Gmail settings batch request and return per-user results"""
+        results = [{'user_email': user_email, 'errors': {}} for user_email in user_emails]
+        
+        def handle_response(request_id: str, response: Any, exception: Optional[Exception]) -> None:
+            index, setting = request_id.split(':', 1)
+            entry = results[int(index)]
+            if exception is not None:
+                entry[setting] = None
+                entry['errors'][setting] = str(exception)
+            else:
+                entry[setting] = response
+        
+        batch = service.new_batch_http_request(callback=handle_response)
+        settings_api = service.users().settings()
+        for index, user_email in enumerate(user_emails):
+            for setting, getter in self.GMAIL_SETTINGS.items():
+                batch.add(getattr(settings_api, getter)(userId=user_email),
+                          request_id=f"{index}:{setting}")
+        
+        try:
+            self._execute(batch, 'gmail', cost=len(user_emails) * len(self.GMAIL_SETTINGS), http=http)
+        except HttpError as e:
+            logger.error(f"Gmail settings batch for {len(user_emails)} users failed: {e}")
+            for entry in results:
+                for setting in self.GMAIL_SETTINGS:
+                    if setting not in entry:
+                        entry[setting] = None
+                        entry['errors'][setting] = str(e)
+        
+        retrieved_at = datetime.now().isoformat()
+        for entry in results:
+            entry['retrieved_at'] = retrieved_at
+        return results
+
     def get_drive_sharing_settings(self, user_email: str) -> Optional[Dict[str, Any]]:
         """Get Drive sharing settings and recent sharing activity"""
         if not self.is_authenticated():
@@ -267,14 +711,14 @@ class GoogleWorkspaceAPI:
             service = self.services['drive']
             
             # Get user's drive about info
-            about = service.about().get(fields='user,storageQuota').execute()
+            about = self._execute(service.about().get(fields='user,storageQuota'), 'drive')
             
             # Get recent files with sharing info (limited for privacy)
-            files_result = service.files().list(
+            files_result = self._execute(service.files().list(
                 q="visibility='anyoneWithLink' or visibility='anyoneCanFind'",
                 pageSize=10,
                 fields="files(id,name,shared,sharingUser,permissions)"
-            ).execute()
+            ), 'drive')
             
             sharing_info = {
                 'user_email': user_email,
@@ -295,16 +739,7 @@ class GoogleWorkspaceAPI:
             return None
         
         try:
-            service = self.services['reports']
-            
-            activities = service.activities().list(
-                userKey='all',
-                applicationName='admin',
-                startTime=start_date.isoformat() + 'Z',
-                endTime=end_date.isoformat() + 'Z'
-            ).execute()
-            
-            return activities.get('items', [])
+            return list(self.iter_activities('admin', start_date, end_date))
             
         except HttpError as e:
             logger.error(f"Error retrieving admin activity report: {e}")
@@ -316,39 +751,69 @@ class GoogleWorkspaceAPI:
             return None
         
         try:
-            service = self.services['reports']
-            
-            activities = service.activities().list(
-                userKey='all',
-                applicationName='login',
-                startTime=start_date.isoformat() + 'Z',
-                endTime=end_date.isoformat() + 'Z'
-            ).execute()
-            
-            return activities.get('items', [])
+            return list(self.iter_activities('login', start_date, end_date))
             
         except HttpError as e:
             logger.error(f"Error retrieving login activity report: {e}")
             return None
 
+    def ingest_activity_report(self, application: str, days_back: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Ingest new Reports API activity into the security reports tables
+        
+        Only events newer than the application's stored high-water mark are
+        fetched (see activity_ingest), so repeated snapshots do not download
+        the same day of activity again.
+        
+        Args:
+            application: 'login', 'admin', 'drive' or 'token'
+            days_back: Window to fetch when the application has never been ingested
+            
+        Returns:
+            Ingestion counts and the fetched window, or None on failure
+        """
+        if not self.is_authenticated():
+            return None
+        
+        try:
+            from .activity_ingest import ActivityIngester, ActivityIngestError
+        except ImportError:
+            from activity_ingest import ActivityIngester, ActivityIngestError
+        
+        ingester = ActivityIngester(str(self.db_path), self.session_id, tracer=self.tracer)
+        try:
+            start_date = ingester.fetch_start(application, days_back)
+            end_date = datetime.utcnow()
+            stats = ingester.ingest(application, self.iter_activities(application, start_date, end_date))
+        except HttpError as e:
+            logger.error(f"Error retrieving {application} activity report: {e}")
+            return None
+        except (ActivityIngestError, sqlite3.Error) as e:
+            logger.error(f"Failed to ingest {application} activity: {e}")
+            return None
+        
+        stats.fetched_since = start_date.strftime('%Y-%m-%d %H:%M:%S')
+        ingester.record_metrics(stats, days_back)
+        result = asdict(stats)
+        result['fetched_until'] = end_date.strftime('%Y-%m-%d %H:%M:%S')
+        result['retrieved_at'] = datetime.now().isoformat()
+        return result
+
     def check_2sv_enforcement(self) -> Optional[Dict[str, Any]]:
         """Check 2-Step Verification enforcement status"""
         if not self.is_authenticated():
             return None
         
         try:
-            service = self.services['admin']
-            
-            # Get users and check 2SV status
-            users_result = service.users().list(
-                customer='my_customer',
-                maxResults=500,
-                fields='users(primaryEmail,isEnforcedIn2Sv,suspended)'
-            ).execute()
-            
-            users = users_result.get('users', [])
-            total_users = len([u for u in users if not u.get('suspended', False)])
-            enforced_users = len([u for u in users if u.get('isEnforcedIn2Sv', False) and not u.get('suspended', False)])
+            # Count active and 2SV-enforced users in a single streaming pass
+            total_users = 0
+            enforced_users = 0
+            for user in self.iter_users(fields='isEnforcedIn2Sv,suspended'):
+                if user.get('suspended', False):
+                    continue
+                total_users += 1
+                if user.get('isEnforcedIn2Sv', False):
+                    enforced_users += 1
             
             return {
                 'total_active_users': total_users,
@@ -364,7 +829,8 @@ class GoogleWorkspaceAPI:
     def save_api_data(self, data_type: str, data: Dict[str, Any]) -> None:
         """Save API data to database for compliance analysis"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.tracer.span("save_api_data", "db", data_type=data_type), \
+                    sqlite3.connect(self.db_path) as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO gws_api_data (
                         data_type, data_content, retrieved_at, session_id
@@ -380,9 +846,86 @@ class GoogleWorkspaceAPI:
         except Exception as e:
             logger.error(f"Failed to save API data: {e}")
 
-    def get_comprehensive_security_snapshot(self) -> Dict[str, Any]:
-        """Get comprehensive security snapshot using API calls"""
+    def _run_collectors(self, collectors: Dict[str, Any], concurrent: bool,
+                        collector_timeout: float) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Run independent data collectors, optionally in parallel
+        
+        Each collector gets its own deadline, collector_timeout seconds after
+        it starts. The deadline is checked before every API request the
+        collector makes, so a collector that runs out of time stops at its
+        next page, and nothing it would have fetched or written afterwards
+        happens. Returns once every collector has stopped: at most
+        collector_timeout plus one in-flight request.
+        
+        Args:
+            collectors: Mapping of collector name to zero-argument callable
+            concurrent: Run collectors on a thread pool instead of one by one
+            collector_timeout: Time budget of each collector in seconds (0 = unlimited)
+            
+        Returns:
+            Tuple of (results by name, timing by name). Results are None for
+            collectors that failed or timed out.
+        """
+        results = {}
+        timings = {}
+        
+        def timed(name: str, collector: Any) -> Tuple[Any, Dict[str, Any]]:
+            started = time.perf_counter()
+            self._thread_local.deadline = time.monotonic() + collector_timeout if collector_timeout else None
+            self._thread_local.timed_out = False
+            error = None
+            try:
+                value = collector()
+            except CollectorTimeout:
+                value = None
+            except Exception as e:
+                logger.error(f"Snapshot collector {name} failed: {e}")
+                value, error = None, str(e)
+            finally:
+                self._thread_local.deadline = None
+            
+            timing = {'seconds': round(time.perf_counter() - started, 3)}
+            if self._thread_local.timed_out:
+                # Collectors may swallow the error; whatever they returned is partial
+                logger.warning(f"Snapshot collector {name} timed out after {collector_timeout}s")
+                value = None
+                timing['status'] = 'timeout'
+            elif error is not None:
+                timing.update(status='error', error=error)
+            else:
+                timing['status'] = 'ok' if value else 'empty'
+            self.tracer.add_span(name, "collector", started, time.perf_counter() - started,
+                                 timing['status'] in ('ok', 'empty'),
+                                 {'status': timing['status']})
+            return value, timing
+        
+        if not concurrent:
+            for name, collector in collectors.items():
+                results[name], timings[name] = timed(name, collector)
+            return results, timings
+        
+        with ThreadPoolExecutor(max_workers=len(collectors), thread_name_prefix="gws-snapshot") as executor:
+            futures = {name: executor.submit(timed, name, collector)
+                       for name, collector in collectors.items()}
+            for name, future in futures.items():
+                results[name], timings[name] = future.result()
+        
+        return results, timings
+
+    def get_comprehensive_security_snapshot(self, concurrent: bool = True,
+                                            collector_timeout: float = 120.0) -> Dict[str, Any]:
+        """
+        Get comprehensive security snapshot using API calls
+        
+        Args:
+            concurrent: Issue the independent collectors in parallel, so the
+                snapshot takes as long as the slowest call rather than the sum
+            collector_timeout: Time budget of each collector in seconds; a collector
+                that runs out stops before its next API request
+        """
         logger.info("Collecting comprehensive security snapshot via API")
+        trace_mark = self.tracer.mark()
         
         snapshot = {
             'collection_time': datetime.now().isoformat(),
@@ -396,43 +939,58 @@ class GoogleWorkspaceAPI:
         
         # Collect various security-related data
         try:
+            # Activity since the last snapshot (at most the last 24 hours) goes
+            # straight into the security reports tables
+            collectors = {
+                'domain_info': self.get_domain_info,
+                'org_structure': self.get_org_unit_structure,
+                '2sv_enforcement': self.check_2sv_enforcement,
+                'admin_activity': lambda: self.ingest_activity_report('admin', days_back=1),
+                'login_activity': lambda: self.ingest_activity_report('login', days_back=1)
+            }
+            
+            collection_start = time.perf_counter()
+            collected, timings = self._run_collectors(collectors, concurrent, collector_timeout)
+            snapshot['collection_mode'] = 'concurrent' if concurrent else 'sequential'
+            snapshot['collection_seconds'] = round(time.perf_counter() - collection_start, 3)
+            snapshot['collector_latency'] = timings
+            snapshot['api_metrics'] = self.get_api_metrics()
+            
             # Domain information
-            domain_info = self.get_domain_info()
+            domain_info = collected.get('domain_info')
             if domain_info:
                 snapshot['domain_info'] = domain_info
                 self.save_api_data('domain_info', domain_info)
             
             # Organizational structure
-            org_structure = self.get_org_unit_structure()
+            org_structure = collected.get('org_structure')
             if org_structure:
                 snapshot['org_structure'] = org_structure
                 self.save_api_data('org_structure', org_structure)
             
             # 2SV enforcement status
-            twosv_status = self.check_2sv_enforcement()
+            twosv_status = collected.get('2sv_enforcement')
             if twosv_status:
                 snapshot['2sv_enforcement'] = twosv_status
                 self.save_api_data('2sv_enforcement', twosv_status)
             
-            # Recent admin activity (last 24 hours)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=1)
-            admin_activity = self.get_admin_activity_report(start_date, end_date)
+            # Recent admin activity
+            admin_activity = collected.get('admin_activity')
             if admin_activity:
                 snapshot['recent_admin_activity'] = {
-                    'activity_count': len(admin_activity),
-                    'date_range': f"{start_date.isoformat()} to {end_date.isoformat()}"
+                    'activity_count': admin_activity['inserted'],
+                    'date_range': f"{admin_activity['fetched_since']} to {admin_activity['fetched_until']} UTC"
                 }
-                self.save_api_data('admin_activity', {'activities': admin_activity})
+                self.save_api_data('admin_activity', admin_activity)
             
-            # Recent login activity (last 24 hours)
-            login_activity = self.get_login_activity_report(start_date, end_date)
+            # Recent login activity
+            login_activity = collected.get('login_activity')
             if login_activity:
                 snapshot['recent_login_activity'] = {
-                    'activity_count': len(login_activity),
-                    'date_range': f"{start_date.isoformat()} to {end_date.isoformat()}"
+                    'activity_count': login_activity['inserted'],
+                    'date_range': f"{login_activity['fetched_since']} to {login_activity['fetched_until']} UTC"
                 }
-                self.save_api_data('login_activity', {'activities': login_activity})
+                self.save_api_data('login_activity', login_activity)
             
             logger.info("Security snapshot collection completed successfully")
             
@@ -440,8 +998,39 @@ class GoogleWorkspaceAPI:
             logger.error(f"Error collecting security snapshot: {e}")
             snapshot['error'] = str(e)
         
+        # Per-call API latency, collector and database time for this snapshot
+        self.tracer.save_metrics(self.db_path, self.session_id, since=trace_mark)
+        
         return snapshot
 
+def benchmark_startup(db_path: str, credentials_path: str) -> Dict[str, Any]:
+    """
+    Time GoogleWorkspaceAPI construction and first use of each service
+    
+    The first ("cold") run pays for any discovery document fetches and
+    caching; the second ("warm") run shows the cost every later CLI
+    invocation pays.
+    """
+    results = {}
+    for run in ("cold", "warm"):
+        started = time.perf_counter()
+        api = GoogleWorkspaceAPI(db_path, credentials_path)
+        construct_seconds = time.perf_counter() - started
+        
+        service_build_seconds = {}
+        if api.is_authenticated():
+            for name in api.api_services:
+                started = time.perf_counter()
+                api.services[name]
+                service_build_seconds[name] = round(time.perf_counter() - started, 4)
+        
+        results[run] = {
+            'construct_seconds': round(construct_seconds, 4),
+            'service_build_seconds': service_build_seconds,
+            'authenticated': api.is_authenticated()
+        }
+    return results
+
 def main():
     """Command-line interface for Google Workspace API module"""
     import argparse
@@ -449,56 +1038,99 @@ def main():
     parser = argparse.ArgumentParser(description="GWOMBAT Google Workspace API Integration")
     parser.add_argument("--db-path", default="./config/gwombat.db", help="Path to GWOMBAT database")
     parser.add_argument("--credentials", default="./config/gws_credentials.json", help="Path to Google OAuth2 credentials")
-    parser.add_argument("--action", choices=["test-auth", "security-snapshot", "domain-info"], 
+    parser.add_argument("--action", choices=["test-auth", "security-snapshot", "domain-info", "gmail-settings",
+                                             "startup-benchmark"], 
                        default="test-auth", help="Action to perform")
+    parser.add_argument("--users-file", help="File of user emails, one per line (for gmail-settings)")
+    parser.add_argument("--sequential", action="store_true", help="Run snapshot collectors one at a time")
+    parser.add_argument("--collector-timeout", type=float, default=120.0,
+                       help="Time budget of each snapshot collector in seconds")
     parser.add_argument("--output", choices=["json", "table"], default="table", help="Output format")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    add_cli_arguments(parser)
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    # Initialize API integration
-    gws_api = GoogleWorkspaceAPI(args.db_path, args.credentials)
-    
-    # Perform requested action
-    if args.action == "test-auth":
-        if gws_api.is_authenticated():
-            print("✓ Google Workspace API authentication successful")
+    tracer = Tracer("gws_api")
+    with cli_instrumentation(args, tracer):
+        if args.action == "startup-benchmark":
+            results = benchmark_startup(args.db_path, args.credentials)
+            if args.output == "json":
+                print(json.dumps(results, indent=2))
+            else:
+                print("\n⏱  Google Workspace API Startup Benchmark")
+                print("=" * 45)
+                for run in ("cold", "warm"):
+                    print(f"{run.title()} construction: {results[run]['construct_seconds'] * 1000:8.1f} ms")
+                    for name, seconds in results[run]['service_build_seconds'].items():
+                        print(f"  first use of {name.ljust(10)} {seconds * 1000:8.1f} ms")
+            return
+        
+        # Initialize API integration
+        gws_api = GoogleWorkspaceAPI(args.db_path, args.credentials, tracer=tracer)
+        
+        # Perform requested action
+        if args.action == "test-auth":
+            if gws_api.is_authenticated():
+                print("✓ Google Workspace API authentication successful")
+                domain_info = gws_api.get_domain_info()
+                if domain_info:
+                    print(f"Primary domain: {domain_info['primary_domain']}")
+            else:
+                print("✗ Google Workspace API authentication failed")
+                print("Please ensure credentials file is present and valid")
+        
+        elif args.action == "security-snapshot":
+            snapshot = gws_api.get_comprehensive_security_snapshot(
+                concurrent=not args.sequential, collector_timeout=args.collector_timeout)
+            if args.output == "json":
+                print(json.dumps(snapshot, indent=2))
+            else:
+                print("\n🔒 Google Workspace Security Snapshot")
+                print("=" * 45)
+                print(f"Collection Time: {snapshot['collection_time']}")
+                print(f"API Available: {snapshot['api_available']}")
+                if snapshot.get('domain_info'):
+                    print(f"Primary Domain: {snapshot['domain_info']['primary_domain']}")
+                if snapshot.get('2sv_enforcement'):
+                    print(f"2SV Enforcement: {snapshot['2sv_enforcement']['enforcement_percentage']:.1f}%")
+                if snapshot.get('collector_latency'):
+                    print(f"Collection Time: {snapshot['collection_seconds']:.2f}s ({snapshot['collection_mode']})")
+                    for name, timing in snapshot['collector_latency'].items():
+                        print(f"  {name.ljust(16)} {timing['seconds']:6.2f}s  {timing['status']}")
+        
+        elif args.action == "domain-info":
             domain_info = gws_api.get_domain_info()
             if domain_info:
-                print(f"Primary domain: {domain_info['primary_domain']}")
-        else:
-            print("✗ Google Workspace API authentication failed")
-            print("Please ensure credentials file is present and valid")
-    
-    elif args.action == "security-snapshot":
-        snapshot = gws_api.get_comprehensive_security_snapshot()
-        if args.output == "json":
-            print(json.dumps(snapshot, indent=2))
-        else:
-            print("\n🔒 Google Workspace Security Snapshot")
-            print("=" * 45)
-            print(f"Collection Time: {snapshot['collection_time']}")
-            print(f"API Available: {snapshot['api_available']}")
-            if snapshot.get('domain_info'):
-                print(f"Primary Domain: {snapshot['domain_info']['primary_domain']}")
-            if snapshot.get('2sv_enforcement'):
-                print(f"2SV Enforcement: {snapshot['2sv_enforcement']['enforcement_percentage']:.1f}%")
-    
-    elif args.action == "domain-info":
-        domain_info = gws_api.get_domain_info()
-        if domain_info:
-            if args.output == "json":
-                print(json.dumps(domain_info, indent=2))
+                if args.output == "json":
+                    print(json.dumps(domain_info, indent=2))
+                else:
+                    print("\n🌐 Domain Information")
+                    print("=" * 25)
+                    print(f"Primary Domain: {domain_info['primary_domain']}")
+                    print(f"Verified Domains: {', '.join(domain_info['verified_domains'])}")
             else:
-                print("\n🌐 Domain Information")
-                print("=" * 25)
-                print(f"Primary Domain: {domain_info['primary_domain']}")
-                print(f"Verified Domains: {', '.join(domain_info['verified_domains'])}")
-        else:
-            print("Unable to retrieve domain information")
+                print("Unable to retrieve domain information")
+        
+        elif args.action == "gmail-settings":
+            if not args.users_file:
+                print("Error: --users-file required for gmail-settings action")
+                return
+            
+            with open(args.users_file) as f:
+                user_emails = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            
+            # One JSON object per user, emitted as each batch completes
+            for settings in gws_api.iter_gmail_settings(user_emails):
+                if args.output == "json":
+                    print(json.dumps(settings), flush=True)
+                else:
+                    forwarding = (settings.get('auto_forwarding') or {}).get('enabled')
+                    print(f"{settings['user_email']}: auto-forwarding={forwarding} "
+                          f"errors={len(settings['errors'])}", flush=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
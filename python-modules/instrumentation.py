@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Timing Instrumentation for GWOMBAT
+Lightweight spans for the Python modules, with optional profiling
+
+ScubaCompliance, GoogleWorkspaceAPI and ComplianceDashboard each own a
+Tracer and wrap their interesting work in spans:
+
+    with self.tracer.span("load_snapshot", "db"):
+        ...
+
+A span costs two perf_counter() calls and a list append. Completed spans are
+aggregated per (category, name) into the performance_metrics table, and can
+be written as a Chrome trace (chrome://tracing or https://ui.perfetto.dev)
+to see where an assessment or dashboard render spent its time, thread by
+thread.
+
+Every CLI accepts:
+    --profile          Print a cProfile summary to stderr when the command finishes
+    --trace FILE       Write the command's spans as a Chrome trace
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Spans kept per tracer; later spans are counted but not stored
+MAX_SPANS = 100000
+
+# Functions listed in --profile output
+DEFAULT_PROFILE_LIMIT = 30
+
+# Insert statement for the rows produced by Tracer.metric_rows() and GamRunner.metric_rows()
+PERFORMANCE_METRICS_SQL = """
+    INSERT INTO performance_metrics (
+        operation_type, operation_name, duration_seconds, items_processed,
+        throughput_per_second, session_id, success
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+@dataclass
+class Span:
+    """A completed timed operation"""
+    name: str
+    category: str
+    start: float  # perf_counter() seconds
+    duration: float  # seconds
+    thread_id: int
+    thread_name: str
+    success: bool = True
+    args: Dict[str, Any] = field(default_factory=dict)
+
+class Tracer:
+    """
+    Collects timing spans for one component
+
+    Usage:
+        tracer = Tracer("scuba")
+        with tracer.span("gmail.1.1", "baseline_check") as span_args:
+            span_args["status"] = "compliant"
+        tracer.save_metrics(db_path, session_id)
+        tracer.write_chrome_trace("assessment.trace.json")
+    """
+
+    def __init__(self, component: str, max_spans: int = MAX_SPANS):
+        """
+        Initialize tracer
+
+        Args:
+            component: Prefix for operation_type in performance_metrics (e.g. "scuba")
+            max_spans: Maximum spans kept in memory
+        """
+        self.component = component
+        self.max_spans = max_spans
+        self.origin = time.perf_counter()
+        self.dropped = 0
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args) -> Iterator[Dict[str, Any]]:
+        """
+        Time the enclosed block
+
+        Yields the span's args dictionary so the block can attach details;
+        setting args["success"] = False marks the span failed. An exception
+        also marks it failed and is re-raised.
+        """
+        start = time.perf_counter()
+        success = True
+        try:
+            yield args
+        except BaseException as e:
+            success = False
+            args["error"] = str(e) or type(e).__name__
+            raise
+        finally:
+            success = success and args.get("success", True) is not False
+            self.add_span(name, category, start, time.perf_counter() - start, success, args)
+
+    def add_span(self, name: str, category: str, start: float, duration: float,
+                 success: bool = True, args: Optional[Dict[str, Any]] = None) -> None:
+        """Record a span timed by the caller"""
+        thread = threading.current_thread()
+        span = Span(name, category, start, duration, thread.ident or 0, thread.name, success, args or {})
+        with self._lock:
+            if len(self._spans) < self.max_spans:
+                self._spans.append(span)
+            else:
+                self.dropped += 1
+
+    def mark(self) -> int:
+        """Position to pass as ``since`` to only consider spans recorded after now"""
+        with self._lock:
+            return len(self._spans)
+
+    def clear(self) -> None:
+        """
+        Drop all recorded spans
+
+        Long-lived processes (the bridge daemon) reuse one tracer for every
+        request and call this once a request's metrics are saved, so spans
+        neither accumulate nor hit max_spans. Marks taken before are void.
+        """
+        with self._lock:
+            self._spans = []
+            self.dropped = 0
+
+    def spans(self, since: int = 0) -> List[Span]:
+        with self._lock:
+            return self._spans[since:]
+
+    def summary(self, since: int = 0) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate spans per category
+
+        Returns:
+            {category: {"count", "total_seconds", "max_seconds", "failures"}}
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans(since):
+            entry = totals.setdefault(span.category, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+                                                      "failures": 0})
+            entry["count"] += 1
+            entry["total_seconds"] += span.duration
+            entry["max_seconds"] = max(entry["max_seconds"], span.duration)
+            entry["failures"] += 0 if span.success else 1
+        for entry in totals.values():
+            entry["total_seconds"] = round(entry["total_seconds"], 3)
+            entry["max_seconds"] = round(entry["max_seconds"], 3)
+        return totals
+
+    def metric_rows(self, session_id: str, since: int = 0) -> List[Tuple]:
+        """
+        performance_metrics rows, one per (category, name)
+
+        operation_type is "<component>.<category>" (e.g. "scuba.baseline_check"),
+        duration_seconds the total time, items_processed the span count and
+        success 0 if any span failed.
+
+        Returns:
+            Tuples of (operation_type, operation_name, duration_seconds,
+            items_processed, throughput_per_second, session_id, success)
+        """
+        grouped: Dict[Tuple[str, str], List[Span]] = {}
+        for span in self.spans(since):
+            grouped.setdefault((span.category, span.name), []).append(span)
+
+        rows = []
+        for (category, name), spans in sorted(grouped.items()):
+            total = sum(span.duration for span in spans)
+            rows.append((f"{self.component}.{category}", name, total, len(spans),
+                         len(spans) / total if total > 0 else None, session_id,
+                         1 if all(span.success for span in spans) else 0))
+        return rows
+
+    def save_metrics(self, db_path: Any, session_id: str, since: int = 0) -> None:
+        """
+        Write aggregated spans to performance_metrics
+
+        Args:
+            db_path: GWOMBAT database path
+            session_id: Session the spans belong to
+            since: Only include spans recorded after this mark()
+        """
+        rows = self.metric_rows(session_id, since)
+        if not rows:
+            return
+
+        try:
+            with sqlite3.connect(db_path) as conn:
+                conn.executemany(PERFORMANCE_METRICS_SQL, rows)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to save {self.component} timing metrics: {e}")
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Spans in Chrome trace event format (complete "X" events, microseconds)"""
+        pid = os.getpid()
+        events = []
+        thread_names = {}
+        for span in self.spans():
+            thread_names[span.thread_id] = span.thread_name
+            args = {key: value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+                    for key, value in span.args.items()}
+            if not span.success:
+                args["success"] = False
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1e6, 1),
+                "dur": round(span.duration * 1e6, 1),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args
+            })
+        for thread_id, thread_name in thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                           "args": {"name": thread_name}})
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                       "args": {"name": f"gwombat {self.component}"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"component": self.component, "dropped_spans": self.dropped}}
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Write spans as a Chrome trace JSON file"""
+        output_file = Path(path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+def add_cli_arguments(parser: Any) -> None:
+    """Add --profile, --profile-limit and --trace to an argparse parser"""
+    parser.add_argument("--profile", action="store_true", help="Print a cProfile summary to stderr when finished")
+    parser.add_argument("--profile-limit", type=int, default=DEFAULT_PROFILE_LIMIT,
+                        help=f"Functions to list in the profile summary (default: {DEFAULT_PROFILE_LIMIT})")
+    parser.add_argument("--trace", metavar="FILE", help="Write timing spans as a Chrome trace JSON file")
+
+@contextmanager
+def cli_instrumentation(args: Any, tracer: Optional[Tracer] = None) -> Iterator[None]:
+    """
+    Apply --profile and --trace around a CLI action
+
+    Args:
+        args: Parsed arguments from a parser passed to add_cli_arguments()
+        tracer: Tracer whose spans --trace writes
+    """
+    profiler = None
+    if getattr(args, "profile", False):
+        # Imported here so that modules using Tracer don't pay for the profilers
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            import pstats
+            stats = pstats.Stats(profiler, stream=sys.stderr)
+            stats.sort_stats("cumulative").print_stats(getattr(args, "profile_limit", DEFAULT_PROFILE_LIMIT))
+
+        trace_path = getattr(args, "trace", None)
+        if trace_path and tracer is not None:
+            try:
+                tracer.write_chrome_trace(trace_path)
+                print(f"Trace written to {trace_path}", file=sys.stderr)
+            except OSError as e:
+                logger.error(f"Failed to write trace {trace_path}: {e}")
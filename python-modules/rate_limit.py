@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting for GWOMBAT
+Token bucket shared by Google API calls and GAM command execution
+"""
+
+import time
+import threading
+from typing import Optional
+
+class TokenBucket:
+    """
+    Thread-safe, adaptive token bucket rate limiter
+
+    Each request takes one token; tokens refill at ``rate`` per second up to
+    ``capacity``. When the caller reports throttling the rate is halved (down to
+    ``min_rate``), then recovers gradually on successful calls.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: Optional[float] = None):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.min_rate = float(min_rate) if min_rate else max(self.rate / 16, 0.1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, waiting until the bucket has refilled to cover them
+
+        The tokens are reserved at once and the bucket may go into debt, so
+        a cost larger than the capacity (a batch of sub-requests) waits as
+        long as that many single requests would, and later callers wait for
+        the debt to be paid off first.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= float(tokens)
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def penalize(self) -> None:
+        """Back off after a throttling response"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+    def reward(self) -> None:
+        """Recover towards the configured rate after a successful call"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Compliance Report Exporter for GWOMBAT
+Streaming export of SCuBA compliance reports in several formats
+
+Sections derived from the latest compliance state are small (one row per
+baseline) and come from a single ComplianceDashboard snapshot. The result
+history can be arbitrarily large, so it is read with fetchmany() and
+written record by record, keeping memory flat as history grows.
+
+Formats:
+    json          Indented JSON document (the historical report layout)
+    json-compact  Same document without whitespace
+    ndjson        One {"section": ..., ...} record per line
+    csv           One CSV file per tabular section, named <stem>_<section>.csv
+"""
+
+import csv
+import json
+import sqlite3
+import logging
+import tempfile
+from datetime import datetime
+from dataclasses import dataclass, asdict, is_dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Iterator, IO, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("json", "json-compact", "ndjson", "csv")
+
+# Rows fetched per round trip when streaming result history
+HISTORY_FETCH_SIZE = 500
+
+@dataclass
+class ExportFilter:
+    """Optional restrictions applied to an exported report"""
+    start_date: Optional[str] = None  # YYYY-MM-DD, inclusive
+    end_date: Optional[str] = None  # YYYY-MM-DD, inclusive
+    services: Optional[List[str]] = None
+
+    def matches_service(self, service_name: Optional[str]) -> bool:
+        return not self.services or service_name in self.services
+
+    def matches_date(self, timestamp: Optional[str]) -> bool:
+        """Check a stored timestamp against the date range"""
+        if not timestamp:
+            return not (self.start_date or self.end_date)
+        day = str(timestamp)[:10]
+        if self.start_date and day < self.start_date:
+            return False
+        if self.end_date and day > self.end_date:
+            return False
+        return True
+
+def _to_record(value: Any) -> Any:
+    """Convert dataclasses (and datetimes inside them) to JSON-friendly values"""
+    if is_dataclass(value):
+        return {key: _to_record(item) for key, item in asdict(value).items()}
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _to_record(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_record(item) for item in value]
+    return value
+
+def _write_csv_records(f: IO[str], records: Iterable[Dict[str, Any]]) -> None:
+    """
+    Write one section's records as CSV
+
+    The header is the union of every record's keys in first-seen order,
+    so a record with extra keys does not lose them. Records are spooled
+    to a temporary file while the header is collected, which keeps the
+    result history out of memory.
+    """
+    columns: Dict[str, None] = {}
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        for record in records:
+            columns.update(dict.fromkeys(record))
+            row = {key: json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+                   for key, value in record.items()}
+            spool.write(json.dumps(row, default=str) + "\n")
+
+        if not columns:
+            return
+        writer = csv.DictWriter(f, fieldnames=list(columns))
+        writer.writeheader()
+        spool.seek(0)
+        for line in spool:
+            writer.writerow(json.loads(line))
+
+class ComplianceReportExporter:
+    """
+    Write compliance reports section by section
+
+    Usage:
+        exporter = ComplianceReportExporter(dashboard, ExportFilter(services=["gmail"]))
+        exporter.export("./reports/scuba.ndjson", "ndjson", include_history=True)
+    """
+
+    def __init__(self, dashboard: Any, export_filter: Optional[ExportFilter] = None):
+        """
+        Initialize report exporter
+
+        Args:
+            dashboard: ComplianceDashboard providing snapshots and summaries
+            export_filter: Optional date range and service restrictions
+        """
+        self.dashboard = dashboard
+        self.filter = export_filter or ExportFilter()
+
+    def export(self, output_path: str, format: str = "json", include_history: bool = False) -> List[Path]:
+        """
+        Export the compliance report
+
+        Args:
+            output_path: Report file path (base path for csv)
+            format: One of EXPORT_FORMATS
+            include_history: Also export every stored result in the date range
+
+        Returns:
+            List of files written
+        """
+        format = format.lower()
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported output format: {format}")
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        snapshot = self._load_snapshot()
+
+        if format == "csv":
+            return self._write_csv(output_file, snapshot, include_history)
+
+        with open(output_file, "w") as f:
+            if format == "ndjson":
+                self._write_ndjson(f, snapshot, include_history)
+            else:
+                self._write_json(f, snapshot, include_history, compact=(format == "json-compact"))
+        return [output_file]
+
+    def _load_snapshot(self) -> Any:
+        """Load a dashboard snapshot restricted to the filtered services and dates"""
+        if self.filter.start_date:
+            # Trends cover the requested range rather than the default window
+            start = datetime.strptime(self.filter.start_date, "%Y-%m-%d")
+            snapshot = self.dashboard.load_snapshot(trend_days=max(1, (datetime.now() - start).days + 1))
+        else:
+            snapshot = self.dashboard.load_snapshot()
+
+        latest_results = [r for r in snapshot.latest_results if self.filter.matches_service(r["service_name"])]
+        baseline_ids = {r["baseline_id"] for r in latest_results}
+        remediation_items = snapshot.remediation_items
+        if self.filter.services:
+            remediation_items = [item for item in remediation_items if item.baseline_id in baseline_ids]
+
+        assessment_history = snapshot.assessment_history
+        if self.filter.start_date or self.filter.end_date:
+            assessment_history = [a for a in assessment_history
+                                  if self.filter.matches_date(a["assessment_start"])]
+
+        return replace(snapshot, latest_results=latest_results, remediation_items=remediation_items,
+                       assessment_history=assessment_history)
+
+    def _report_sections(self, snapshot: Any) -> List[Tuple[str, Any]]:
+        """Top-level report sections in the historical JSON layout"""
+        dashboard = self.dashboard
+        metadata = {
+            "report_generated": datetime.now().isoformat(),
+            "report_type": "SCuBA Compliance Report",
+            "gwombat_version": "3.0.0-hybrid"
+        }
+        filters = {key: value for key, value in asdict(self.filter).items() if value}
+        if filters:
+            metadata["filters"] = filters
+
+        return [
+            ("metadata", metadata),
+            ("executive_summary", dashboard.generate_executive_summary(snapshot)),
+            ("detailed_compliance", {
+                "overall_summary": dashboard.get_overall_compliance_summary(snapshot),
+                "service_breakdown": dashboard.get_service_compliance_breakdown(snapshot),
+                "critical_gaps": dashboard.get_critical_gaps_analysis(snapshot),
+                "trends": dashboard.get_compliance_trends(snapshot.trend_days, snapshot)
+            }),
+            ("remediation", {
+                "open_items": dashboard.get_remediation_items(status_filter="open", snapshot=snapshot),
+                "in_progress_items": dashboard.get_remediation_items(status_filter="in_progress", snapshot=snapshot),
+                "critical_priority": dashboard.get_remediation_items(priority_filter="critical", snapshot=snapshot)
+            })
+        ]
+
+    def _tabular_sections(self, snapshot: Any) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Report sections as flat record lists, for ndjson and csv"""
+        dashboard = self.dashboard
+        overall = dashboard.get_overall_compliance_summary(snapshot)
+        return [
+            ("overall_summary", [_to_record(overall)] if overall else []),
+            ("service_breakdown", _to_record(dashboard.get_service_compliance_breakdown(snapshot))),
+            ("critical_gaps", dashboard.get_critical_gaps_analysis(snapshot).get("critical_gaps", [])),
+            ("latest_results", snapshot.latest_results),
+            ("assessment_history", snapshot.assessment_history),
+            ("remediation_items", _to_record(snapshot.remediation_items))
+        ]
+
+    def iter_result_history(self) -> Iterator[Dict[str, Any]]:
+        """Stream stored compliance results matching the filter, oldest first"""
+        query = """
+            SELECT
+                r.id, b.service_name, r.baseline_id, r.assessment_date, r.compliance_status,
+                r.confidence_level, r.current_value, r.expected_value, r.gap_description,
+                r.risk_level, r.evidence_data, r.check_method, r.session_id
+            FROM scuba_compliance_results r
+            JOIN scuba_baselines b ON r.baseline_id = b.baseline_id
+            WHERE 1=1
+        """
+        params = []
+
+        if self.filter.start_date:
+            query += " AND r.assessment_date >= ?"
+            params.append(self.filter.start_date)
+
+        if self.filter.end_date:
+            query += " AND r.assessment_date < date(?, '+1 day')"
+            params.append(self.filter.end_date)
+
+        if self.filter.services:
+            query += f" AND b.service_name IN ({','.join('?' * len(self.filter.services))})"
+            params.extend(self.filter.services)
+
+        query += " ORDER BY r.assessment_date, r.id"
+
+        conn = sqlite3.connect(self.dashboard.db_path)
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(HISTORY_FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            conn.close()
+
+    def _write_json(self, f: IO[str], snapshot: Any, include_history: bool, compact: bool) -> None:
+        """Write the report as one JSON document, streaming the result history array"""
+        if compact:
+            dumps = lambda value: json.dumps(_to_record(value), separators=(",", ":"), default=str)
+            newline, indent = "", ""
+        else:
+            dumps = lambda value: json.dumps(_to_record(value), indent=2, default=str).replace("\n", "\n  ")
+            newline, indent = "\n", "  "
+
+        sections = self._report_sections(snapshot)
+        f.write("{" + newline)
+        for index, (name, value) in enumerate(sections):
+            separator = "," if index < len(sections) - 1 or include_history else ""
+            f.write(f"{indent}{json.dumps(name)}:{' ' if indent else ''}{dumps(value)}{separator}{newline}")
+
+        if include_history:
+            f.write(f"{indent}\"results_history\":{' ' if indent else ''}[")
+            item_indent = indent * 2
+            first = True
+            for record in self.iter_result_history():
+                item = json.dumps(record, separators=(",", ":") if compact else None, default=str)
+                f.write(("" if first else ",") + newline + item_indent + item)
+                first = False
+            f.write((newline + indent if not first else "") + "]" + newline)
+
+        f.write("}" + newline)
+
+    def _write_ndjson(self, f: IO[str], snapshot: Any, include_history: bool) -> None:
+        """Write one JSON object per line, tagged with its section name"""
+        def write(section: str, record: Dict[str, Any]) -> None:
+            f.write(json.dumps(dict(section=section, **record), separators=(",", ":"), default=str) + "\n")
+
+        metadata, executive_summary = self._report_sections(snapshot)[:2]
+        write(*metadata)
+        write(*executive_summary)
+        write("trends", self.dashboard.get_compliance_trends(snapshot.trend_days, snapshot))
+
+        for section, records in self._tabular_sections(snapshot):
+            for record in records:
+                write(section, record)
+
+        if include_history:
+            for record in self.iter_result_history():
+                write("results_history", record)
+
+    def _write_csv(self, output_file: Path, snapshot: Any, include_history: bool) -> List[Path]:
+        """Write one CSV file per tabular section next to output_file"""
+        stem = output_file.stem if output_file.suffix.lower() == ".csv" else output_file.name
+        sections = self._tabular_sections(snapshot)
+        if include_history:
+            sections.append(("results_history", self.iter_result_history()))
+
+        written = []
+        for section, records in sections:
+            section_file = output_file.with_name(f"{stem}_{section}.csv")
+            with open(section_file, "w", newline="") as f:
+                _write_csv_records(f, records)
+            written.append(section_file)
+
+        return written
@@ -9,15 +9,29 @@ configurable enable/disable controls.
 """
 
 import json
+import os
+import shlex
 import sqlite3
+import hashlib
 import logging
-import subprocess
-import yaml
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Callable
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    from .check_logic import CompiledCheck, ParseCache, compile_baseline_check
+    from .gam_runner import GamRunner, GamCommandError, split_command
+    from .instrumentation import Tracer, PERFORMANCE_METRICS_SQL, add_cli_arguments, cli_instrumentation
+except ImportError:
+    from check_logic import CompiledCheck, ParseCache, compile_baseline_check
+    from gam_runner import GamRunner, GamCommandError, split_command
+    from instrumentation import Tracer, PERFORMANCE_METRICS_SQL, add_cli_arguments, cli_instrumentation
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -77,6 +91,251 @@ class ScubaBaseline:
     remediation_steps: str
     reference_links: List[str]
     is_enabled: bool
+    # check_logic compiled at load time, or the reason it failed to compile
+    compiled_check: Optional[CompiledCheck] = field(default=None, repr=False, compare=False)
+    check_logic_error: Optional[str] = None
+
+class GamCommandCache:
+    """
+    Per-assessment memoization of GAM command results
+    
+    Commands are keyed on their normalized form, so each distinct command runs
+    once per assessment no matter how many baselines share it. Concurrent
+    callers for the same command wait for the in-flight execution. Successful
+    results can optionally be persisted to ``cache_dir`` and reused by later
+    assessments for ``ttl_seconds``.
+    """
+    
+    def __init__(self, runner: Callable[[str], Tuple[bool, str, str]], gam_path: str = "gam",
+                 cache_dir: Optional[Path] = None, ttl_seconds: int = 0):
+        self._runner = runner
+        self.gam_path = gam_path
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.ttl_seconds = ttl_seconds
+        self._results: Dict[str, Tuple[bool, str, str]] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"executions": 0, "memory_hits": 0, "disk_hits": 0}
+
+    def normalize(self, command: str) -> str:
+        """
+        Normalize a command: tokenize it as GamRunner does and drop the GAM executable
+
+        Tokens are re-quoted, so whitespace inside a quoted argument stays
+        significant while whitespace between arguments does not.
+        """
+        try:
+            stages = split_command(command)
+        except GamCommandError:
+            # GamRunner rejects it; key on the raw text so the error is cached once
+            return command.strip()
+        if stages[0] and stages[0][0] in (self.gam_path, "gam"):
+            stages[0] = stages[0][1:]
+        return " | ".join(" ".join(shlex.quote(token) for token in stage) for stage in stages)
+
+    def run(self, command: str) -> Tuple[bool, str, str]:
+        """Return the result for command, executing it only if not already cached"""
+        key = self.normalize(command)
+        
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            if key in self._results:
+                with self._lock:
+                    self.stats["memory_hits"] += 1
+                return self._results[key]
+            
+            result = self._load_from_disk(key)
+            if result is not None:
+                with self._lock:
+                    self.stats["disk_hits"] += 1
+            else:
+                result = self._runner(command)
+                with self._lock:
+                    self.stats["executions"] += 1
+                if result[0]:
+                    self._save_to_disk(key, result)
+            
+            self._results[key] = result
+            return result
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[bool, str, str]]:
+        """Load a cached result from disk if present and not expired"""
+        if not self.cache_dir or self.ttl_seconds <= 0:
+            return None
+        
+        try:
+            with open(self._disk_path(key), 'r') as f:
+                entry = json.load(f)
+            if entry.get("command") != key or time.time() - entry["stored_at"] > self.ttl_seconds:
+                return None
+            return (True, entry["stdout"], entry["stderr"])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable GAM cache entry for '{key}': {e}")
+            return None
+
+    def _save_to_disk(self, key: str, result: Tuple[bool, str, str]) -> None:
+        """Persist a successful result to the disk cache"""
+        if not self.cache_dir or self.ttl_seconds <= 0:
+            return
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    "command": key,
+                    "stored_at": time.time(),
+                    "stdout": result[1],
+                    "stderr": result[2]
+                }, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write GAM cache entry for '{key}': {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return cache statistics for the current assessment"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["distinct_commands"] = len(self._results)
+        return stats
+
+class AssessmentStore:
+    """
+    Assessment-scoped persistence for SCuBA results
+    
+    Holds a single WAL-mode connection for the duration of an assessment,
+    preloads service enablement from scuba_feature_config once, and buffers
+    compliance results so they are written with executemany in one
+    transaction per ``flush_size`` rows instead of one commit per baseline.
+    """
+    
+    RESULT_INSERT_SQL = """
+        INSERT INTO scuba_compliance_results (
+            baseline_id, assessment_date, compliance_status, confidence_level,
+            current_value, expected_value, gap_description, risk_level,
+            evidence_data, check_method, session_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    def __init__(self, db_path: Path, session_id: str, flush_size: int = 500,
+                 tracer: Optional[Tracer] = None):
+        self.db_path = db_path
+        self.session_id = session_id
+        self.flush_size = max(1, flush_size)
+        self.tracer = tracer or Tracer("scuba")
+        self.conn: Optional[sqlite3.Connection] = None
+        self._service_enabled: Dict[str, bool] = {}
+        self._pending: List[Tuple] = []
+        self._lock = threading.Lock()
+        self.rows_written = 0
+
+    def __enter__(self) -> "AssessmentStore":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Open the connection and preload service configuration"""
+        with self.tracer.span("open_store", "db"):
+            self._open()
+
+    def _open(self) -> None:
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        
+        try:
+            cursor = self.conn.execute("""
+                SELECT feature_name, is_enabled FROM scuba_feature_config
+                WHERE feature_category = 'service'
+            """)
+            self._service_enabled = {name: bool(enabled) for name, enabled in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error preloading service configuration: {e}")
+            self._service_enabled = {}
+
+    def is_service_enabled(self, service_name: str) -> bool:
+        """Check service enablement from the preloaded configuration"""
+        return self._service_enabled.get(service_name, False)
+
+    @staticmethod
+    def result_row(result: ComplianceResult, session_id: str) -> Tuple:
+        """Convert a ComplianceResult to a scuba_compliance_results row"""
+        return (
+            result.baseline_id,
+            result.assessment_date.isoformat(),
+            result.compliance_status.value,
+            result.confidence_level,
+            result.current_value,
+            result.expected_value,
+            result.gap_description,
+            result.risk_level,
+            json.dumps(result.evidence_data),
+            result.check_method,
+            session_id
+        )
+
+    def add_result(self, result: ComplianceResult) -> None:
+        """Buffer a result, flushing once flush_size rows are pending"""
+        with self._lock:
+            self._pending.append(self.result_row(result, self.session_id))
+            should_flush = len(self._pending) >= self.flush_size
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending results in a single transaction"""
+        with self._lock:
+            if not self._pending or self.conn is None:
+                return
+            rows, self._pending = self._pending, []
+            with self.tracer.span("flush_results", "db", rows=len(rows)):
+                try:
+                    with self.conn:
+                        self.conn.executemany(self.RESULT_INSERT_SQL, rows)
+                    self.rows_written += len(rows)
+                except Exception as e:
+                    logger.error(f"Failed to save {len(rows)} compliance results: {e}")
+
+    def latest_results(self) -> Dict[str, Dict[str, Any]]:
+        """Return the latest stored result row for every baseline, keyed by baseline_id"""
+        with self._lock, self.tracer.span("latest_results", "db"):
+            self.conn.row_factory = sqlite3.Row
+            try:
+                rows = self.conn.execute("SELECT * FROM scuba_latest_results").fetchall()
+            finally:
+                self.conn.row_factory = None
+        return {row['baseline_id']: dict(row) for row in rows}
+
+    def execute(self, sql: str, params: Tuple = ()) -> None:
+        """Flush pending results, then run a single write statement in its own transaction"""
+        self.execute_statements([(sql, params)])
+
+    def execute_statements(self, statements: List[Tuple[str, Tuple]]) -> None:
+        """Flush pending results, then run write statements together in one transaction"""
+        self.flush()
+        with self._lock, self.tracer.span("execute_statements", "db", statements=len(statements)):
+            with self.conn:
+                for sql, params in statements:
+                    self.conn.execute(sql, params)
+
+    def close(self) -> None:
+        """Flush pending results and close the connection"""
+        if self.conn is None:
+            return
+        self.flush()
+        self.conn.close()
+        self.conn = None
 
 class ScubaCompliance:
     """
@@ -86,26 +345,40 @@ class ScubaCompliance:
     with database integration and configurable assessment capabilities.
     """
     
-    def __init__(self, db_path: str = "./config/gwombat.db", gam_path: str = "gam"):
+    def __init__(self, db_path: str = "./config/gwombat.db", gam_path: str = "gam",
+                 tracer: Optional[Tracer] = None):
         """
         Initialize SCuBA compliance engine
         
         Args:
             db_path: Path to GWOMBAT SQLite database
             gam_path: Path to GAM executable
+            tracer: Span collector for timing data (one is created if omitted)
         """
         self.db_path = Path(db_path)
         self.gam_path = gam_path
+        self.tracer = tracer or Tracer("scuba")
         self.session_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_scuba_{id(self)}"
+        self.assessments_run = 0
         
         # Load configuration
         self._load_config()
         
         # Initialize database connection
-        self._init_database()
+        with self.tracer.span("init_database", "db"):
+            self._init_database()
         
         # Load baseline definitions
-        self.baselines = self._load_baselines()
+        with self.tracer.span("load_baselines", "db"):
+            self.baselines = self._load_baselines()
+        
+        # GAM process runner and output cache, both reset at the start of every assessment
+        self.gam_runner = self._new_gam_runner()
+        self.gam_cache = self._new_gam_cache()
+        
+        # Assessment-scoped persistence and parsed GAM output, only present while an assessment runs
+        self._store: Optional[AssessmentStore] = None
+        self._parse_cache: Optional[ParseCache] = None
         
         logger.info(f"SCuBA Compliance engine initialized with {len(self.baselines)} baselines")
 
@@ -115,29 +388,79 @@ class ScubaCompliance:
         self.config = {
             'api_timeout': 30,
             'max_retries': 3,
-            'batch_size': 10,
-            'parallel_checks': True
+            'batch_size': 10,  # Maximum baseline checks in flight at once
+            'parallel_checks': True,
+            'max_checks_per_service': 4,  # Per-service concurrency cap
+            'gam_cache_ttl': 0,  # Seconds to reuse GAM output across assessments (0 = off)
+            'gam_cache_dir': str(self.db_path.parent / "gam_cache"),
+            'result_flush_size': 500,  # Buffered result rows per write transaction
+            'incremental_ttl': 86400,  # Seconds a result may be carried forward (check_logic ttl_seconds overrides)
+            'max_gam_processes': 10,  # Maximum GAM processes running at once
+            'assessment_deadline': 1800  # Seconds an assessment may spend running GAM commands (0 = no limit)
         }
 
+    # Candidate schema locations, relative to this module
+    SCHEMA_FILES = (
+        Path("..") / "shared-config" / "scuba_compliance_schema.sql",
+        Path("..") / "scuba_compliance_schema.sql"
+    )
+
     def _init_database(self) -> None:
-        """Initialize database connection and ensure schema exists"""
+        """
+        Initialize database connection and ensure schema exists
+        
+        The schema script is versioned by its SHA-256 hash, recorded in
+        scuba_schema_version. When the recorded hash matches the file the
+        schema is current and initialization is a single read; the script
+        (and any migrations in it) only runs when the file changes.
+        """
         try:
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Initialize SCuBA schema if needed
-            schema_path = Path(__file__).parent.parent / "scuba_compliance_schema.sql"
-            if schema_path.exists():
-                with sqlite3.connect(self.db_path) as conn:
-                    with open(schema_path, 'r') as f:
-                        conn.executescript(f.read())
-                logger.info("SCuBA compliance database schema initialized")
-            else:
+            schema_path = next((Path(__file__).parent / candidate for candidate in self.SCHEMA_FILES
+                                if (Path(__file__).parent / candidate).exists()), None)
+            if schema_path is None:
                 logger.warning("SCuBA schema file not found - database may not be properly initialized")
+                return
+            
+            with open(schema_path, 'r') as f:
+                schema_sql = f.read()
+            schema_hash = hashlib.sha256(schema_sql.encode('utf-8')).hexdigest()
+            
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                if self._get_schema_hash(conn) == schema_hash:
+                    logger.debug("SCuBA compliance database schema is current")
+                    return
+                
+                # Apply the schema and record its version in one transaction
+                conn.executescript(f"""
+                    BEGIN IMMEDIATE;
+                    {schema_sql}
+                    ;
+                    INSERT OR REPLACE INTO scuba_schema_version (schema_name, schema_hash)
+                    VALUES ('scuba_compliance', '{schema_hash}');
+                    COMMIT;
+                """)
+                logger.info("SCuBA compliance database schema initialized")
+            finally:
+                conn.close()
                 
         except Exception as e:
             logger.error(f"Database initialization failed: {e}")
             raise
 
+    @staticmethod
+    def _get_schema_hash(conn: sqlite3.Connection) -> Optional[str]:
+        """Return the recorded SCuBA schema hash, or None if never recorded"""
+        try:
+            row = conn.execute(
+                "SELECT schema_hash FROM scuba_schema_version WHERE schema_name = 'scuba_compliance'"
+            ).fetchone()
+            return row[0] if row else None
+        except sqlite3.OperationalError:
+            return None
+
     def _load_baselines(self) -> List[ScubaBaseline]:
         """Load baseline definitions from database"""
         baselines = []
@@ -152,6 +475,13 @@ class ScubaCompliance:
                 """)
                 
                 for row in cursor.fetchall():
+                    check_logic, check_logic_error = {}, None
+                    if row['check_logic']:
+                        try:
+                            check_logic = json.loads(row['check_logic'])
+                        except ValueError as e:
+                            check_logic_error = f"check_logic is not valid JSON: {e}"
+                    
                     baseline = ScubaBaseline(
                         baseline_id=row['baseline_id'],
                         service_name=row['service_name'],
@@ -163,11 +493,17 @@ class ScubaCompliance:
                         gam_command=row['gam_command'],
                         api_endpoint=row['api_endpoint'],
                         expected_value=row['expected_value'],
-                        check_logic=json.loads(row['check_logic']) if row['check_logic'] else {},
+                        check_logic=check_logic,
                         remediation_steps=row['remediation_steps'],
                         reference_links=json.loads(row['reference_links']) if row['reference_links'] else [],
-                        is_enabled=bool(row['is_enabled'])
+                        is_enabled=bool(row['is_enabled']),
+                        check_logic_error=check_logic_error
                     )
+                    if check_logic_error is None:
+                        baseline.compiled_check, baseline.check_logic_error = compile_baseline_check(
+                            check_logic, baseline.expected_value)
+                    if baseline.check_logic_error:
+                        logger.error(f"Invalid check_logic for {baseline.baseline_id}: {baseline.check_logic_error}")
                     baselines.append(baseline)
                     
         except Exception as e:
@@ -176,8 +512,29 @@ class ScubaCompliance:
             
         return baselines
 
+    def _new_gam_runner(self, deadline_seconds: Optional[float] = None) -> GamRunner:
+        """Create a GAM runner using the current configuration"""
+        return GamRunner(
+            self.gam_path,
+            max_processes=int(self.config.get('max_gam_processes', 1)),
+            command_timeout=self.config['api_timeout'],
+            deadline_seconds=deadline_seconds
+        )
+
+    def _new_gam_cache(self) -> GamCommandCache:
+        """Create a fresh GAM command cache using the current configuration"""
+        return GamCommandCache(
+            self.execute_gam_command,
+            gam_path=self.gam_path,
+            cache_dir=self.config.get('gam_cache_dir'),
+            ttl_seconds=int(self.config.get('gam_cache_ttl', 0))
+        )
+
     def is_service_enabled(self, service_name: str) -> bool:
         """Check if compliance checking is enabled for a specific service"""
+        if self._store is not None:
+            return self._store.is_service_enabled(service_name)
+        
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.execute("""
@@ -196,34 +553,20 @@ class ScubaCompliance:
         """
         Execute GAM command safely and return results
         
+        Runs through the engine's GamRunner: arguments are split with shlex,
+        concurrent GAM processes are capped, and during an assessment the
+        assessment deadline applies.
+        
         Args:
             command: GAM command to execute
             
         Returns:
             Tuple of (success, stdout, stderr)
         """
-        try:
-            # Ensure GAM command is properly formatted
-            if not command.startswith(self.gam_path):
-                command = f"{self.gam_path} {command}"
-            
-            logger.debug(f"Executing GAM command: {command}")
-            
-            result = subprocess.run(
-                command.split(),
-                capture_output=True,
-                text=True,
-                timeout=self.config['api_timeout']
-            )
-            
-            return (result.returncode == 0, result.stdout, result.stderr)
-            
-        except subprocess.TimeoutExpired:
-            logger.error(f"GAM command timed out: {command}")
-            return (False, "", "Command timed out")
-        except Exception as e:
-            logger.error(f"GAM command execution failed: {e}")
-            return (False, "", str(e))
+        with self.tracer.span(command, "gam") as span_args:
+            success, stdout, stderr = self.gam_runner.run(command)
+            span_args["success"] = success
+        return (success, stdout, stderr)
 
     def check_baseline_compliance(self, baseline: ScubaBaseline) -> ComplianceResult:
         """
@@ -270,7 +613,7 @@ class ScubaCompliance:
         if not baseline.gam_command:
             return self._create_error_result(baseline, "No GAM command specified")
         
-        success, stdout, stderr = self.execute_gam_command(baseline.gam_command)
+        success, stdout, stderr = self.gam_cache.run(baseline.gam_command)
         
         if not success:
             return ComplianceResult(
@@ -348,34 +691,40 @@ class ScubaCompliance:
         """
         Evaluate compliance based on GAM output and baseline expectations
         
-        This is a simplified implementation - would be enhanced with specific
-        logic for each baseline type.
+        Uses the baseline's compiled check_logic rules; baselines without
+        rules fall back to matching expected_value against the output.
         """
-        current_value = gam_output.strip()
-        expected_value = baseline.expected_value
+        check = baseline.compiled_check
+        if check is None and baseline.check_logic_error is None:
+            # Baseline not loaded through _load_baselines
+            check, baseline.check_logic_error = compile_baseline_check(baseline.check_logic, baseline.expected_value)
+        if check is None:
+            return self._create_error_result(baseline, f"Invalid check_logic: {baseline.check_logic_error}")
+        
+        outcome = check.evaluate(gam_output, self._parse_cache)
         
-        # Simple compliance logic - this would be enhanced per baseline
-        if expected_value and expected_value.lower() in current_value.lower():
+        if outcome.compliant:
             compliance_status = ComplianceStatus.COMPLIANT
             gap_description = None
             risk_level = "low"
         else:
             compliance_status = ComplianceStatus.NON_COMPLIANT
-            gap_description = f"Expected '{expected_value}' but found '{current_value[:100]}...'"
+            gap_description = outcome.reason
             risk_level = baseline.criticality_level.value
 
         return ComplianceResult(
             baseline_id=baseline.baseline_id,
             service_name=baseline.service_name,
             compliance_status=compliance_status,
-            confidence_level="medium",
-            current_value=current_value[:500],  # Limit size
-            expected_value=expected_value,
+            confidence_level="high" if check.uses_rules else "medium",
+            current_value=outcome.current_value[:500],  # Limit size
+            expected_value=baseline.expected_value,
             gap_description=gap_description,
             risk_level=risk_level,
             evidence_data={
-                "gam_output": current_value[:1000],
-                "command": baseline.gam_command
+                "gam_output": gam_output.strip()[:1000],
+                "command": baseline.gam_command,
+                "evaluation": "check_logic" if check.uses_rules else "expected_value_match"
             },
             check_method="gam_command",
             assessment_date=datetime.now()
@@ -398,43 +747,40 @@ class ScubaCompliance:
         )
 
     def save_compliance_result(self, result: ComplianceResult) -> None:
-        """Save compliance result to database"""
+        """Save compliance result to database (buffered while an assessment is running)"""
+        if self._store is not None:
+            self._store.add_result(result)
+            return
+        
         try:
             with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO scuba_compliance_results (
-                        baseline_id, assessment_date, compliance_status, confidence_level,
-                        current_value, expected_value, gap_description, risk_level,
-                        evidence_data, check_method, session_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    result.baseline_id,
-                    result.assessment_date.isoformat(),
-                    result.compliance_status.value,
-                    result.confidence_level,
-                    result.current_value,
-                    result.expected_value,
-                    result.gap_description,
-                    result.risk_level,
-                    json.dumps(result.evidence_data),
-                    result.check_method,
-                    self.session_id
-                ))
+                conn.execute(AssessmentStore.RESULT_INSERT_SQL,
+                             AssessmentStore.result_row(result, self.session_id))
                 conn.commit()
                 
         except Exception as e:
             logger.error(f"Failed to save compliance result: {e}")
 
-    def run_full_assessment(self, services: Optional[List[str]] = None) -> Dict[str, Any]:
+    def run_full_assessment(self, services: Optional[List[str]] = None,
+                            incremental: bool = False) -> Dict[str, Any]:
         """
         Run full compliance assessment for specified services
         
         Args:
             services: List of service names to assess, or None for all enabled services
+            incremental: Only re-check baselines whose inputs changed or whose
+                latest result expired; carry the rest forward
             
         Returns:
             Assessment summary with results and statistics
         """
+        # Long-lived engines (e.g. in the bridge daemon) need a new session
+        # per assessment, since the session doubles as the assessment_id
+        self.assessments_run += 1
+        if self.assessments_run > 1:
+            self.session_id = (f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_scuba_{id(self)}"
+                               f"_{self.assessments_run}")
+        
         logger.info(f"Starting full SCuBA compliance assessment (Session: {self.session_id})")
         
         # Filter baselines by services if specified
@@ -442,34 +788,244 @@ class ScubaCompliance:
         if services:
             baselines_to_check = [b for b in self.baselines if b.service_name in services]
         
-        results = []
         assessment_start = datetime.now()
+        assessment_clock = time.perf_counter()
+        trace_mark = self.tracer.mark()
+        runner = self._new_gam_runner(deadline_seconds=self.config.get('assessment_deadline') or None)
+        self.gam_runner = runner
+        self.gam_cache = self._new_gam_cache()
         
-        # Process each baseline
-        for baseline in baselines_to_check:
+        # One connection for the whole assessment; results are written in batches
+        store = AssessmentStore(self.db_path, self.session_id,
+                                flush_size=int(self.config.get('result_flush_size', 500)),
+                                tracer=self.tracer)
+        with store:
+            self._store = store
+            self._parse_cache = {}
             try:
-                result = self.check_baseline_compliance(baseline)
-                self.save_compliance_result(result)
-                results.append(result)
+                fingerprints = {b.baseline_id: self._baseline_fingerprint(b) for b in baselines_to_check}
+                carried_forward = {}
+                if incremental:
+                    carried_forward, recheck_reasons = self._plan_incremental_assessment(
+                        baselines_to_check, fingerprints)
+                
+                # Check baselines (concurrently if enabled); results keep baseline order
+                check_phase_start = time.perf_counter()
+                timed_results = self._execute_baseline_checks(
+                    [b for b in baselines_to_check if b.baseline_id not in carried_forward])
+                check_phase_seconds = time.perf_counter() - check_phase_start
+                
+                checked = {result.baseline_id: result for result, _ in timed_results}
+                results = []
+                for baseline in baselines_to_check:
+                    result = carried_forward.get(baseline.baseline_id) or checked[baseline.baseline_id]
+                    result.evidence_data.setdefault("input_fingerprint", fingerprints[baseline.baseline_id])
+                    self.save_compliance_result(result)
+                    results.append(result)
                 
-            except Exception as e:
-                logger.error(f"Error checking baseline {baseline.baseline_id}: {e}")
-                error_result = self._create_error_result(baseline, str(e))
-                self.save_compliance_result(error_result)
-                results.append(error_result)
+                assessment_end = datetime.now()
+                duration = (assessment_end - assessment_start).total_seconds()
+                self.tracer.add_span(self.session_id, "assessment", assessment_clock,
+                                     time.perf_counter() - assessment_clock, args={"baselines": len(results)})
+                
+                # Calculate summary statistics
+                summary = self._calculate_assessment_summary(results, assessment_start, assessment_end)
+                if results:
+                    summary["assessment_type"] = "incremental" if incremental else "full"
+                    summary["execution"] = self._calculate_execution_stats(timed_results, check_phase_seconds)
+                    summary["gam_cache"] = self.gam_cache.get_stats()
+                    summary["gam_runner"] = runner.get_stats()
+                    summary["timing"] = self.tracer.summary(trace_mark)
+                    if incremental:
+                        summary["incremental"] = {
+                            "rechecked": len(timed_results),
+                            "carried_forward": len(carried_forward),
+                            "recheck_reasons": recheck_reasons
+                        }
+                
+                # Save assessment history, span timings and GAM latency histograms
+                self._save_assessment_history(summary, duration)
+                self._save_performance_metrics(runner, trace_mark)
+            finally:
+                self._store = None
+                self._parse_cache = None
+                # Kill GAM processes left behind by an interrupted assessment
+                runner.cancel()
+                self.gam_runner = self._new_gam_runner()
+        
+        logger.info(f"SCuBA assessment completed in {duration:.1f}s - {summary['overall_compliance_percentage']:.1f}% compliant")
+        
+        return summary
 
-        assessment_end = datetime.now()
-        duration = (assessment_end - assessment_start).total_seconds()
+    def _baseline_fingerprint(self, baseline: ScubaBaseline) -> str:
+        """
+        Fingerprint the inputs of a baseline check
         
-        # Calculate summary statistics
-        summary = self._calculate_assessment_summary(results, assessment_start, assessment_end)
+        Covers the baseline definition fields that affect the check and the
+        service's enablement in scuba_feature_config, so editing either one
+        invalidates results carried forward by incremental assessments.
+        """
+        inputs = {
+            "compliance_check_type": baseline.compliance_check_type.value,
+            "criticality_level": baseline.criticality_level.value,
+            "gam_command": baseline.gam_command,
+            "api_endpoint": baseline.api_endpoint,
+            "expected_value": baseline.expected_value,
+            "check_logic": baseline.check_logic,
+            "service_enabled": self.is_service_enabled(baseline.service_name)
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _plan_incremental_assessment(self, baselines: List[ScubaBaseline],
+                                     fingerprints: Dict[str, str]) -> Tuple[Dict[str, ComplianceResult], Dict[str, int]]:
+        """
+        Decide which baselines an incremental assessment can carry forward
         
-        # Save assessment history
-        self._save_assessment_history(summary, duration)
+        A baseline is re-checked when it has no previous result, its input
+        fingerprint changed, its previous check failed, or the previous check
+        is older than its TTL (``ttl_seconds`` in check_logic, otherwise the
+        ``incremental_ttl`` setting).
         
-        logger.info(f"SCuBA assessment completed in {duration:.1f}s - {summary['overall_compliance_percentage']:.1f}% compliant")
+        Returns:
+            Tuple of (carried-forward results by baseline_id, re-check reason counts)
+        """
+        latest = self._store.latest_results() if self._store is not None else {}
+        now = datetime.now()
+        carried_forward = {}
+        reasons: Dict[str, int] = {}
         
-        return summary
+        for baseline in baselines:
+            previous = latest.get(baseline.baseline_id)
+            evidence = {}
+            if previous and previous['evidence_data']:
+                try:
+                    evidence = json.loads(previous['evidence_data'])
+                except ValueError:
+                    evidence = {}
+            
+            # TTL runs from the last real check, not from the last carry-forward
+            checked_at = evidence.get("checked_at") or (previous['assessment_date'] if previous else None)
+            ttl = int(baseline.check_logic.get('ttl_seconds', self.config.get('incremental_ttl', 0)))
+            
+            if previous is None:
+                reason = "no_previous_result"
+            elif evidence.get("input_fingerprint") != fingerprints[baseline.baseline_id]:
+                reason = "inputs_changed"
+            elif previous['compliance_status'] == ComplianceStatus.UNABLE_TO_CHECK.value:
+                reason = "previous_check_failed"
+            elif not checked_at or (now - datetime.fromisoformat(str(checked_at))).total_seconds() > ttl:
+                reason = "expired"
+            else:
+                reason = None
+            
+            if reason:
+                reasons[reason] = reasons.get(reason, 0) + 1
+                continue
+            
+            evidence.update({
+                "carried_forward": True,
+                "carried_forward_from": previous['result_id'],
+                "checked_at": str(checked_at)
+            })
+            carried_forward[baseline.baseline_id] = ComplianceResult(
+                baseline_id=baseline.baseline_id,
+                service_name=baseline.service_name,
+                compliance_status=ComplianceStatus(previous['compliance_status']),
+                confidence_level=previous['confidence_level'],
+                current_value=previous['current_value'],
+                expected_value=previous['expected_value'],
+                gap_description=previous['gap_description'],
+                risk_level=previous['risk_level'],
+                evidence_data=evidence,
+                check_method="carried_forward",
+                assessment_date=now
+            )
+        
+        logger.info(f"Incremental assessment: {len(carried_forward)} baselines carried forward, "
+                    f"{len(baselines) - len(carried_forward)} to re-check")
+        return carried_forward, reasons
+
+    def _execute_baseline_checks(self, baselines: List[ScubaBaseline]) -> List[Tuple[ComplianceResult, float]]:
+        """
+        Check baselines with bounded concurrency
+        
+        Up to ``batch_size`` checks run at once, and no more than
+        ``max_checks_per_service`` of them for the same service. Results are
+        returned in the same order as ``baselines``.
+        
+        Returns:
+            List of (result, check duration in seconds) tuples
+        """
+        max_workers = max(1, int(self.config.get('batch_size', 1)))
+        if not self.config.get('parallel_checks') or max_workers == 1 or len(baselines) <= 1:
+            return [self._timed_baseline_check(baseline) for baseline in baselines]
+        
+        per_service = max(1, int(self.config.get('max_checks_per_service', max_workers)))
+        
+        # Baselines are loaded grouped by service. Each service gets its own
+        # queue, and a baseline is only submitted while its service is below
+        # the cap, so pool threads never sit blocked on another service's limit.
+        queues: "OrderedDict[str, deque]" = OrderedDict()
+        for index, baseline in enumerate(baselines):
+            queues.setdefault(baseline.service_name, deque()).append(index)
+        running = {service_name: 0 for service_name in queues}
+        results: List[Optional[Tuple[ComplianceResult, float]]] = [None] * len(baselines)
+        
+        logger.debug(f"Checking {len(baselines)} baselines with {max_workers} workers "
+                     f"({per_service} per service)")
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scuba-check") as executor:
+            futures = {}
+            
+            def dispatch() -> None:
+                # Round-robin over services with queued baselines and a free slot
+                while len(futures) < max_workers:
+                    ready = [name for name, queue in queues.items() if queue and running[name] < per_service]
+                    if not ready:
+                        return
+                    for service_name in ready:
+                        if len(futures) >= max_workers:
+                            return
+                        index = queues[service_name].popleft()
+                        running[service_name] += 1
+                        futures[executor.submit(self._timed_baseline_check, baselines[index])] = index
+            
+            dispatch()
+            while futures:
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures.pop(future)
+                    running[baselines[index].service_name] -= 1
+                    results[index] = future.result()
+                dispatch()
+        return results
+
+    def _timed_baseline_check(self, baseline: ScubaBaseline) -> Tuple[ComplianceResult, float]:
+        """Check a single baseline, converting failures to error results"""
+        check_start = time.perf_counter()
+        try:
+            result = self.check_baseline_compliance(baseline)
+        except Exception as e:
+            logger.error(f"Error checking baseline {baseline.baseline_id}: {e}")
+            result = self._create_error_result(baseline, str(e))
+        check_seconds = time.perf_counter() - check_start
+        self.tracer.add_span(baseline.baseline_id, "baseline_check", check_start, check_seconds,
+                             args={"service": baseline.service_name, "status": result.compliance_status.value})
+        return result, check_seconds
+
+    def _calculate_execution_stats(self, timed_results: List[Tuple[ComplianceResult, float]],
+                                   wall_clock_seconds: float) -> Dict[str, Any]:
+        """Calculate wall-clock speedup of the check phase over sequential execution"""
+        cumulative_seconds = sum(check_seconds for _, check_seconds in timed_results)
+        parallel = bool(self.config.get('parallel_checks')) and int(self.config.get('batch_size', 1)) > 1
+        
+        return {
+            "mode": "parallel" if parallel else "sequential",
+            "max_workers": int(self.config.get('batch_size', 1)) if parallel else 1,
+            "max_checks_per_service": self.config.get('max_checks_per_service') if parallel else 1,
+            "wall_clock_seconds": round(wall_clock_seconds, 3),
+            "cumulative_check_seconds": round(cumulative_seconds, 3),
+            "speedup": round(cumulative_seconds / wall_clock_seconds, 2) if wall_clock_seconds > 0 else 1.0
+        }
 
     def _calculate_assessment_summary(self, results: List[ComplianceResult], 
                                     start_time: datetime, end_time: datetime) -> Dict[str, Any]:
@@ -510,37 +1066,146 @@ class ScubaCompliance:
             "manual_review_items": status_counts.get("manual_review", 0)
         }
 
+    # Recompute the day, week and month trend rollup buckets containing one
+    # assessment_history row (same aggregation as the schema's backfill)
+    TREND_ROLLUP_SQL = """
+        WITH assessment AS (
+            SELECT assessment_start FROM scuba_assessment_history WHERE assessment_id = ?
+        ),
+        buckets AS (
+            SELECT 'day' AS granularity, date(assessment_start) AS bucket_start,
+                   date(assessment_start, '+1 day') AS bucket_end
+            FROM assessment
+            UNION
+            SELECT 'week', date(assessment_start, 'weekday 0', '-6 days'),
+                   date(assessment_start, 'weekday 0', '+1 day')
+            FROM assessment
+            UNION
+            SELECT 'month', date(assessment_start, 'start of month'),
+                   date(assessment_start, 'start of month', '+1 month')
+            FROM assessment
+        )
+        INSERT OR REPLACE INTO scuba_trend_rollups (
+            granularity, bucket_start, bucket_end, assessment_count,
+            sum_compliance_percentage, min_compliance_percentage, max_compliance_percentage,
+            first_compliance_percentage, last_compliance_percentage,
+            sum_critical_findings, max_critical_findings, first_critical_findings, last_critical_findings,
+            first_assessment, last_assessment
+        )
+        SELECT
+            b.granularity, b.bucket_start, b.bucket_end, COUNT(*),
+            SUM(h.overall_compliance_percentage), MIN(h.overall_compliance_percentage),
+            MAX(h.overall_compliance_percentage),
+            (SELECT overall_compliance_percentage FROM scuba_assessment_history
+             WHERE assessment_start >= b.bucket_start AND assessment_start < b.bucket_end
+             ORDER BY assessment_start, id LIMIT 1),
+            (SELECT overall_compliance_percentage FROM scuba_assessment_history
+             WHERE assessment_start >= b.bucket_start AND assessment_start < b.bucket_end
+             ORDER BY assessment_start DESC, id DESC LIMIT 1),
+            SUM(h.critical_findings), MAX(h.critical_findings),
+            (SELECT critical_findings FROM scuba_assessment_history
+             WHERE assessment_start >= b.bucket_start AND assessment_start < b.bucket_end
+             ORDER BY assessment_start, id LIMIT 1),
+            (SELECT critical_findings FROM scuba_assessment_history
+             WHERE assessment_start >= b.bucket_start AND assessment_start < b.bucket_end
+             ORDER BY assessment_start DESC, id DESC LIMIT 1),
+            MIN(h.assessment_start), MAX(h.assessment_start)
+        FROM buckets b
+        JOIN scuba_assessment_history h
+            ON h.assessment_start >= b.bucket_start AND h.assessment_start < b.bucket_end
+        GROUP BY b.granularity, b.bucket_start, b.bucket_end
+    """
+
     def _save_assessment_history(self, summary: Dict[str, Any], duration: float) -> None:
-        """Save assessment summary to database"""
+        """Save assessment summary to database and update its trend rollups"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO scuba_assessment_history (
-                        assessment_id, assessment_name, assessment_type, services_assessed,
-                        baselines_assessed, overall_compliance_percentage, critical_findings,
-                        high_findings, medium_findings, low_findings, assessment_duration_seconds,
-                        started_by, session_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    summary["assessment_id"],
-                    f"SCuBA Assessment {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-                    "full",
-                    json.dumps(summary["services_assessed"]),
-                    summary["total_baselines_assessed"],
-                    summary["overall_compliance_percentage"],
-                    summary["criticality_breakdown"].get("critical", 0),
-                    summary["criticality_breakdown"].get("high", 0),
-                    summary["criticality_breakdown"].get("medium", 0),
-                    summary["criticality_breakdown"].get("low", 0),
-                    duration,
-                    "python_module",
-                    self.session_id
-                ))
-                conn.commit()
+            sql = """
+                INSERT INTO scuba_assessment_history (
+                    assessment_id, assessment_name, assessment_type, services_assessed,
+                    baselines_assessed, overall_compliance_percentage, critical_findings,
+                    high_findings, medium_findings, low_findings, assessment_duration_seconds,
+                    started_by, session_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+            params = (
+                summary["assessment_id"],
+                f"SCuBA Assessment {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+                summary.get("assessment_type", "full"),
+                json.dumps(summary["services_assessed"]),
+                summary["total_baselines_assessed"],
+                summary["overall_compliance_percentage"],
+                summary["criticality_breakdown"].get("critical", 0),
+                summary["criticality_breakdown"].get("high", 0),
+                summary["criticality_breakdown"].get("medium", 0),
+                summary["criticality_breakdown"].get("low", 0),
+                duration,
+                "python_module",
+                self.session_id
+            )
+            
+            statements = [(sql, params), (self.TREND_ROLLUP_SQL, (summary["assessment_id"],))]
+            
+            if self._store is not None:
+                self._store.execute_statements(statements)
+            else:
+                with sqlite3.connect(self.db_path) as conn:
+                    for statement, statement_params in statements:
+                        conn.execute(statement, statement_params)
+                    conn.commit()
                 
         except Exception as e:
             logger.error(f"Failed to save assessment history: {e}")
 
+    def _save_performance_metrics(self, runner: GamRunner, trace_mark: int = 0) -> None:
+        """
+        Record the assessment's timing data in performance_metrics
+        
+        Writes span totals (assessment, per-baseline checks, GAM and database
+        time) recorded since trace_mark, and the runner's per-command GAM
+        latency and exit-code histograms.
+        """
+        try:
+            rows = self.tracer.metric_rows(self.session_id, since=trace_mark) + runner.metric_rows(self.session_id)
+            statements = [(PERFORMANCE_METRICS_SQL, row) for row in rows]
+            if not statements:
+                return
+            
+            if self._store is not None:
+                self._store.execute_statements(statements)
+            else:
+                with sqlite3.connect(self.db_path) as conn:
+                    for statement, statement_params in statements:
+                        conn.execute(statement, statement_params)
+                    conn.commit()
+                
+        except Exception as e:
+            logger.error(f"Failed to save performance metrics: {e}")
+
+def print_assessment_results(results: Dict[str, Any], output: str = "table") -> None:
+    """Print an assessment summary as JSON or a table"""
+    if output == "json":
+        print(json.dumps(results, indent=2))
+    else:
+        # Table output
+        print("\n🔐 SCuBA Compliance Assessment Results")
+        print("=" * 50)
+        print(f"Assessment ID: {results['assessment_id']}")
+        print(f"Overall Compliance: {results['overall_compliance_percentage']:.1f}%")
+        print(f"Baselines Assessed: {results['total_baselines_assessed']}")
+        print(f"Services: {', '.join(results['services_assessed'])}")
+        print(f"Critical Findings: {results['critical_findings']}")
+        print(f"Manual Review Items: {results['manual_review_items']}")
+        if results.get('execution'):
+            execution = results['execution']
+            print(f"Check Time: {execution['wall_clock_seconds']:.1f}s "
+                  f"({execution['mode']}, {execution['speedup']:.1f}x speedup)")
+        if results.get('gam_runner', {}).get('deadline_exceeded'):
+            print(f"Deadline Exceeded: {results['gam_runner']['deadline_exceeded']} GAM commands cancelled or skipped")
+        if results.get('incremental'):
+            incremental = results['incremental']
+            print(f"Incremental: {incremental['rechecked']} re-checked, "
+                  f"{incremental['carried_forward']} carried forward")
+
 def main():
     """Command-line interface for SCuBA compliance module"""
     import argparse
@@ -550,32 +1215,44 @@ def main():
     parser.add_argument("--gam-path", default="gam", help="Path to GAM executable")
     parser.add_argument("--services", nargs="*", help="Services to assess (default: all enabled)")
     parser.add_argument("--output", choices=["json", "table"], default="table", help="Output format")
+    parser.add_argument("--workers", type=int, help="Maximum concurrent baseline checks (default: batch_size)")
+    parser.add_argument("--sequential", action="store_true", help="Check baselines one at a time")
+    parser.add_argument("--gam-cache-ttl", type=int, help="Reuse GAM output from previous assessments for this many seconds")
+    parser.add_argument("--incremental", action="store_true",
+                       help="Only re-check baselines whose inputs changed or whose results expired")
+    parser.add_argument("--incremental-ttl", type=int, help="Seconds a result may be carried forward (default: 86400)")
+    parser.add_argument("--max-gam-processes", type=int, help="Maximum GAM processes running at once (default: 10)")
+    parser.add_argument("--deadline", type=int, help="Seconds the assessment may spend running GAM commands (0 = no limit, default: 1800)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    add_cli_arguments(parser)
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    # Initialize compliance engine
-    scuba = ScubaCompliance(args.db_path, args.gam_path)
-    
-    # Run assessment
-    results = scuba.run_full_assessment(args.services)
-    
-    # Output results
-    if args.output == "json":
-        print(json.dumps(results, indent=2))
-    else:
-        # Table output
-        print("\n🔐 SCuBA Compliance Assessment Results")
-        print("=" * 50)
-        print(f"Assessment ID: {results['assessment_id']}")
-        print(f"Overall Compliance: {results['overall_compliance_percentage']:.1f}%")
-        print(f"Baselines Assessed: {results['total_baselines_assessed']}")
-        print(f"Services: {', '.join(results['services_assessed'])}")
-        print(f"Critical Findings: {results['critical_findings']}")
-        print(f"Manual Review Items: {results['manual_review_items']}")
+    tracer = Tracer("scuba")
+    with cli_instrumentation(args, tracer):
+        # Initialize compliance engine
+        scuba = ScubaCompliance(args.db_path, args.gam_path, tracer=tracer)
+        if args.workers:
+            scuba.config['batch_size'] = args.workers
+        if args.sequential:
+            scuba.config['parallel_checks'] = False
+        if args.gam_cache_ttl is not None:
+            scuba.config['gam_cache_ttl'] = args.gam_cache_ttl
+        if args.incremental_ttl is not None:
+            scuba.config['incremental_ttl'] = args.incremental_ttl
+        if args.max_gam_processes:
+            scuba.config['max_gam_processes'] = args.max_gam_processes
+        if args.deadline is not None:
+            scuba.config['assessment_deadline'] = args.deadline
+        
+        # Run assessment
+        results = scuba.run_full_assessment(args.services, incremental=args.incremental)
+        
+        # Output results
+        print_assessment_results(results, args.output)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
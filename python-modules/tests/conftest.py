@@ -0,0 +1,6 @@
+"""Make the python-modules directory importable as top-level modules, as the bash bridge runs them"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
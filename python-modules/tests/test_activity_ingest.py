@@ -0,0 +1,33 @@
+"""Tests for activity timestamps and event ids"""
+
+from datetime import datetime
+
+import pytest
+
+from activity_ingest import event_rows, normalize_time, IngestStats
+from gam_output import parse_timestamp
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-06-01T12:00:00.000Z", "2024-06-01 12:00:00"),
+    ("2024-06-01T12:00:00+02:00", "2024-06-01 10:00:00"),
+    ("2024-06-01T22:30:00-05:00", "2024-06-02 03:30:00"),
+    ("2024-06-01T01:00:00+0530", "2024-05-31 19:30:00"),
+    ("2024-06-01 12:00:00", "2024-06-01 12:00:00"),
+])
+def test_normalize_time_converts_offsets_to_utc(value, expected):
+    assert normalize_time(value) == expected
+
+def test_parse_timestamp_drops_offsets_by_default():
+    # The bash-compatible callers compare GAM times with local cutoffs as text
+    assert parse_timestamp("2024-06-01T12:00:00+02:00") == datetime(2024, 6, 1, 12, 0, 0)
+    assert parse_timestamp("2024-06-01T12:00:00+02:00", to_utc=True) == datetime(2024, 6, 1, 10, 0, 0)
+
+def _login(time):
+    return {"id.time": time, "id.uniqueQualifier": "-42", "actor.email": "alice@example.edu",
+            "ipAddress": "10.0.0.1", "name": "login_success"}
+
+def test_event_id_is_the_same_in_any_time_zone():
+    events = [next(event_rows("login", [_login(time)], "test", IngestStats(application="login")))
+              for time in ("2024-06-01T10:00:00.000Z", "2024-06-01T12:00:00+02:00")]
+    assert events[0].event_id == events[1].event_id
+    assert events[0].event_time == events[1].event_time == "2024-06-01 10:00:00"
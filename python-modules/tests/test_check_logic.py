@@ -0,0 +1,138 @@
+"""Tests for the check_logic rule engine"""
+
+import re
+import json
+
+import pytest
+
+from check_logic import CompiledCheck, CheckLogicError, compile_baseline_check, parse_output
+
+USERS_CSV = (
+    "primaryEmail,isEnforcedIn2Sv,orgUnitPath,loginCount,name.familyName\n"
+    "alice@example.edu,True,/Staff,12,Smith\n"
+    "bob@example.edu,False,/Students,3,Jones\n"
+)
+
+def _check(rule, output_format="csv", rows="all"):
+    return CompiledCheck.compile({"format": output_format, "rows": rows, "rule": rule})
+
+def _single(field, op, value=None, **extra):
+    rule = dict({"field": field, "op": op}, **extra)
+    if value is not None:
+        rule["value"] = value
+    return rule
+
+@pytest.mark.parametrize("rule, alice, bob", [
+    (_single("isEnforcedIn2Sv", "eq", True), True, False),
+    (_single("isEnforcedIn2Sv", "ne", True), False, True),
+    (_single("orgUnitPath", "in", ["/staff", "/Faculty"]), True, False),
+    (_single("orgUnitPath", "not_in", ["/Staff"]), False, True),
+    (_single("primaryEmail", "contains", "ALICE"), True, False),
+    (_single("primaryEmail", "not_contains", "alice"), False, True),
+    (_single("primaryEmail", "regex", "^b.*@example\\.edu$"), False, True),
+    (_single("loginCount", "gt", 3), True, False),
+    (_single("loginCount", "ge", 3), True, True),
+    (_single("loginCount", "lt", 12), False, True),
+    (_single("loginCount", "le", 3), False, True),
+    (_single("orgUnitPath", "exists"), True, True),
+    (_single("missingColumn", "exists", False), True, True),
+])
+def test_operators(rule, alice, bob):
+    check = _check(rule)
+    assert check.evaluate(USERS_CSV.splitlines()[0] + "\n" + USERS_CSV.splitlines()[1]).compliant is alice
+    assert check.evaluate(USERS_CSV.splitlines()[0] + "\n" + USERS_CSV.splitlines()[2]).compliant is bob
+
+def test_case_sensitive_comparison():
+    check = _check(_single("orgUnitPath", "eq", "/staff", case_sensitive=True))
+    assert not check.evaluate(USERS_CSV.splitlines()[0] + "\n" + USERS_CSV.splitlines()[1]).compliant
+
+def test_numeric_operator_ignores_non_numeric_values():
+    check = _check(_single("orgUnitPath", "gt", 1))
+    assert not check.evaluate(USERS_CSV).compliant
+
+@pytest.mark.parametrize("rows, compliant", [("all", False), ("any", True), ("none", False)])
+def test_rows_quantifiers(rows, compliant):
+    outcome = _check(_single("isEnforcedIn2Sv", "eq", True), rows=rows).evaluate(USERS_CSV)
+    assert outcome.compliant is compliant
+    assert outcome.reason is None if compliant else outcome.reason
+
+def test_rows_none_passes_when_no_record_matches():
+    check = _check(_single("primaryEmail", "regex", "@gmail\\.com$"), rows="none")
+    assert check.evaluate(USERS_CSV).compliant
+
+def test_rows_all_reports_failing_count():
+    outcome = _check(_single("isEnforcedIn2Sv", "eq", True)).evaluate(USERS_CSV)
+    assert outcome.reason == "1 of 2 records do not satisfy check_logic"
+    assert json.loads(outcome.current_value)["sample"]["primaryEmail"] == "bob@example.edu"
+
+def test_rule_tree():
+    rule = {"all": [
+        _single("isEnforcedIn2Sv", "eq", True),
+        {"any": [_single("orgUnitPath", "eq", "/Staff"), _single("orgUnitPath", "eq", "/Faculty")]},
+        {"not": _single("primaryEmail", "contains", "gmail")}
+    ]}
+    assert _check(rule, rows="any").evaluate(USERS_CSV).compliant
+    assert not _check(rule).evaluate(USERS_CSV).compliant
+
+def test_dotted_paths_in_json():
+    output = json.dumps([
+        {"primaryEmail": "alice@example.edu", "name": {"familyName": "Smith"},
+         "emails": [{"address": "alice@example.edu", "primary": True}]}
+    ])
+    assert _check(_single("name.familyName", "eq", "smith"), "json").evaluate(output).compliant
+    assert _check(_single("emails.0.primary", "eq", True), "json").evaluate(output).compliant
+    assert not _check(_single("emails.1.primary", "exists"), "json").evaluate(output).compliant
+    assert not _check(_single("name.givenName.first", "exists"), "json").evaluate(output).compliant
+
+def test_dotted_csv_column_names_are_matched_exactly():
+    assert _check(_single("name.familyName", "in", ["Smith", "Jones"])).evaluate(USERS_CSV).compliant
+
+def test_key_value_and_lines_formats():
+    settings = "Forwarding: disabled\nSharing = restricted\n"
+    assert _check(_single("Forwarding", "in", ["restricted", "disabled"]), "key_value").evaluate(settings).compliant
+    assert _check(_single("Sharing", "eq", "restricted"), "key_value").evaluate(settings).compliant
+    assert _check(_single("line", "contains", "sharing"), "lines", rows="any").evaluate(settings).compliant
+
+def test_empty_output_is_not_compliant():
+    outcome = _check(_single("isEnforcedIn2Sv", "eq", True)).evaluate("")
+    assert not outcome.compliant
+    assert outcome.reason == "GAM output contained no records"
+
+def test_expected_value_substring_without_rule():
+    check = CompiledCheck.compile(None, "Restricted")
+    assert not check.uses_rules
+    assert check.evaluate("Sharing: restricted to domain").compliant
+    assert not check.evaluate("Sharing: public").compliant
+
+@pytest.mark.parametrize("check_logic, message", [
+    (["rule"], "check_logic must be a JSON object"),
+    ({"format": "xml"}, "Unknown output format: xml"),
+    ({"rows": "most"}, "Unknown rows quantifier: most"),
+    ({"rule": "isEnforcedIn2Sv"}, "Rule must be an object"),
+    ({"rule": {"op": "eq", "value": True}}, "Rule is missing 'field'"),
+    ({"rule": _single("orgUnitPath", "between", 1)}, "Unknown operator: between"),
+    ({"rule": _single("orgUnitPath", "in", "/Staff")}, "'in' requires a list value"),
+    ({"rule": _single("primaryEmail", "regex", "([")}, "Invalid regex"),
+    ({"rule": _single("loginCount", "gt", "many")}, "'gt' requires a numeric value"),
+    ({"rule": {"all": [_single("loginCount", "lt", 1), {"not": _single("x", "nope")}]}}, "Unknown operator: nope"),
+])
+def test_compile_errors(check_logic, message):
+    with pytest.raises(CheckLogicError, match=re.escape(message)):
+        CompiledCheck.compile(check_logic)
+    check, error = compile_baseline_check(check_logic, None)
+    assert check is None and message in error
+
+def test_parse_cache_is_scoped_to_the_caller():
+    cache = {}
+    first = parse_output("csv", USERS_CSV, cache)
+    assert parse_output("csv", USERS_CSV, cache) is first
+    assert len(cache) == 1
+
+    # Without a cache nothing is kept between calls
+    assert parse_output("csv", USERS_CSV) is not parse_output("csv", USERS_CSV)
+
+def test_evaluate_fills_the_given_cache_only():
+    cache = {}
+    _check(_single("isEnforcedIn2Sv", "eq", True)).evaluate(USERS_CSV, cache)
+    CompiledCheck.compile(None, "alice").evaluate(USERS_CSV, cache)
+    assert {key[0] for key in cache} == {"csv", "lowercase"}
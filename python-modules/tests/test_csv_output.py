@@ -0,0 +1,55 @@
+"""Tests for CSV writers whose records do not all share the same columns"""
+
+import io
+import csv
+import json
+
+from gam_output import _write_csv, iter_records
+from report_exporter import _write_csv_records
+
+def _formatjson(*objects):
+    """GAM "print users formatjson" output: a JSON column holding each object"""
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(["primaryEmail", "JSON"])
+    for obj in objects:
+        writer.writerow([obj["primaryEmail"], json.dumps(obj)])
+    return text.getvalue()
+
+FORMATJSON = _formatjson(
+    {"primaryEmail": "a@example.edu", "name": {"givenName": "Ada"}},
+    {"primaryEmail": "b@example.edu", "name": {"givenName": "Bo", "familyName": "Li"}, "suspended": True},
+)
+
+def _rows(text):
+    return list(csv.DictReader(io.StringIO(text)))
+
+def test_gam_csv_header_is_union_of_sparse_columns():
+    out = io.StringIO()
+    assert _write_csv(iter_records(io.StringIO(FORMATJSON), "csv"), out) == 2
+    rows = _rows(out.getvalue())
+    assert list(rows[0]) == ["primaryEmail", "name.givenName", "name.familyName", "suspended"]
+    assert rows[0]["name.familyName"] == ""
+    assert rows[1]["name.familyName"] == "Li"
+    assert rows[1]["suspended"] == "True"
+
+def test_gam_csv_explicit_fields():
+    out = io.StringIO()
+    _write_csv(iter_records(io.StringIO(FORMATJSON), "csv"), out, ["primaryEmail", "suspended"])
+    assert out.getvalue().splitlines() == ["primaryEmail,suspended", "a@example.edu,", "b@example.edu,True"]
+
+def test_gam_csv_empty_input_writes_nothing():
+    out = io.StringIO()
+    assert _write_csv(iter([]), out) == 0
+    assert out.getvalue() == ""
+
+def test_report_csv_header_is_union_of_record_keys():
+    out = io.StringIO()
+    _write_csv_records(out, [
+        {"service": "gmail", "score": 90.5},
+        {"service": "drive", "score": 70.0, "gaps": ["DRIVE-1"], "critical": False},
+    ])
+    rows = _rows(out.getvalue())
+    assert list(rows[0]) == ["service", "score", "gaps", "critical"]
+    assert rows[0]["gaps"] == ""
+    assert rows[1] == {"service": "drive", "score": "70.0", "gaps": '["DRIVE-1"]', "critical": "False"}
@@ -0,0 +1,40 @@
+"""Tests for GamCommandCache command normalization"""
+
+from scuba_compliance import GamCommandCache
+
+def _cache():
+    calls = []
+
+    def runner(command):
+        calls.append(command)
+        return (True, f"output {len(calls)}", "")
+
+    return GamCommandCache(runner, gam_path="/opt/gam/gam"), calls
+
+def test_whitespace_between_arguments_is_ignored():
+    cache, calls = _cache()
+    assert cache.normalize("gam  print users   query 'isSuspended=False'") == \
+        cache.normalize("/opt/gam/gam print users query isSuspended=False")
+    cache.run("gam print users")
+    cache.run("print  users")
+    assert len(calls) == 1
+
+def test_quoted_whitespace_is_significant():
+    cache, calls = _cache()
+    first = cache.run('gam print users query "name:\'Ann  Lee\'"')
+    second = cache.run('gam print users query "name:\'Ann Lee\'"')
+    assert first != second
+    assert len(calls) == 2
+
+def test_quoting_style_does_not_matter():
+    cache, _ = _cache()
+    assert cache.normalize('gam info ou "/Staff/IT Team"') == cache.normalize("gam info ou '/Staff/IT Team'")
+    assert cache.normalize("gam info ou '/Staff/IT Team'") != cache.normalize("gam info ou /Staff/IT Team")
+
+def test_pipelines_are_normalized_per_stage():
+    cache, _ = _cache()
+    assert cache.normalize("gam print users|grep  -c True") == "print users | grep -c True"
+
+def test_malformed_command_is_keyed_on_its_text():
+    cache, _ = _cache()
+    assert cache.normalize(" gam print users query 'unbalanced ") == "gam print users query 'unbalanced"
@@ -0,0 +1,65 @@
+"""Tests for snapshot collector time budgets"""
+
+import time
+import threading
+
+from gws_api import GoogleWorkspaceAPI
+
+class _Page:
+    """Stand-in for an HttpRequest that takes a while to answer"""
+
+    def __init__(self, pages_fetched, delay):
+        self.pages_fetched = pages_fetched
+        self.delay = delay
+
+    def execute(self, http=None):
+        time.sleep(self.delay)
+        self.pages_fetched.append(threading.current_thread().name)
+        return {}
+
+def _api(tmp_path):
+    return GoogleWorkspaceAPI(str(tmp_path / "test.db"), str(tmp_path / "missing.json"),
+                              rate_limits={'admin': 1e6})
+
+def _paging_collector(api, pages_fetched, pages=100, delay=0.05):
+    def collect():
+        for _ in range(pages):
+            api._execute(_Page(pages_fetched, delay), 'admin')
+        return {'pages': pages}
+    return collect
+
+def test_collector_stops_at_its_deadline(tmp_path):
+    api = _api(tmp_path)
+    slow_pages, fast_pages = [], []
+    collectors = {'slow': _paging_collector(api, slow_pages),
+                  'fast': _paging_collector(api, fast_pages, pages=2)}
+
+    started = time.monotonic()
+    results, timings = api._run_collectors(collectors, concurrent=True, collector_timeout=0.3)
+    elapsed = time.monotonic() - started
+    pages_at_return = len(slow_pages)
+    time.sleep(0.2)
+
+    assert elapsed < 0.5
+    assert timings['slow']['status'] == 'timeout' and results['slow'] is None
+    assert timings['fast']['status'] == 'ok' and results['fast'] == {'pages': 2}
+    # Nothing keeps running after the snapshot moves on
+    assert len(slow_pages) == pages_at_return
+
+def test_sequential_collectors_each_get_their_own_budget(tmp_path):
+    api = _api(tmp_path)
+    pages = []
+    collectors = {'first': _paging_collector(api, pages), 'second': _paging_collector(api, pages, pages=2)}
+
+    results, timings = api._run_collectors(collectors, concurrent=False, collector_timeout=0.2)
+
+    assert timings['first']['status'] == 'timeout'
+    assert results['second'] == {'pages': 2}
+
+def test_requests_outside_collectors_have_no_deadline(tmp_path):
+    api = _api(tmp_path)
+    pages = []
+    api._run_collectors({'quick': _paging_collector(api, pages, pages=1)}, concurrent=True, collector_timeout=0.1)
+    time.sleep(0.15)
+    _paging_collector(api, pages, pages=3, delay=0.0)()
+    assert len(pages) == 4
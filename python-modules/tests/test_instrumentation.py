@@ -0,0 +1,31 @@
+"""Tests for span collection in long-lived processes"""
+
+from types import SimpleNamespace
+
+from instrumentation import Tracer
+from bridge_daemon import BridgeWorker
+
+def test_clear_resets_spans_and_marks():
+    tracer = Tracer("test", max_spans=3)
+    for index in range(5):
+        tracer.add_span(f"span{index}", "db", 0.0, 0.1)
+    assert (tracer.mark(), tracer.dropped) == (3, 2)
+
+    tracer.clear()
+    mark = tracer.mark()
+    tracer.add_span("after", "db", 0.0, 0.1)
+
+    assert (mark, tracer.dropped) == (0, 0)
+    assert [span.name for span in tracer.spans(mark)] == ["after"]
+
+def test_bridge_worker_clears_warm_tracers_after_each_request(tmp_path):
+    worker = BridgeWorker(str(tmp_path / "test.db"))
+    worker._scuba = SimpleNamespace(tracer=Tracer("scuba"))
+    worker._gws_api = SimpleNamespace(tracer=Tracer("gws_api"))
+
+    for _ in range(3):
+        worker._scuba.tracer.add_span("assessment", "assessment", 0.0, 1.0)
+        worker._gws_api.tracer.add_span("snapshot", "collector", 0.0, 1.0)
+        assert worker.handle({"action": "ping"})["ok"]
+        assert worker._scuba.tracer.mark() == 0
+        assert worker._gws_api.tracer.mark() == 0
@@ -0,0 +1,62 @@
+"""Tests for the token bucket shared by Google API calls and GAM commands"""
+
+import time
+import threading
+
+import pytest
+
+from rate_limit import TokenBucket
+from gws_api import GoogleWorkspaceAPI
+
+def test_cost_above_capacity_is_paced_at_the_configured_rate():
+    bucket = TokenBucket(25)
+    bucket.acquire(25)  # Drain the initial burst
+
+    started = time.monotonic()
+    waited = bucket.acquire(100)
+    elapsed = time.monotonic() - started
+
+    assert waited == pytest.approx(4.0, abs=0.1)
+    assert elapsed == pytest.approx(4.0, abs=0.2)
+
+def test_burst_up_to_capacity_does_not_wait():
+    bucket = TokenBucket(10)
+    assert sum(bucket.acquire() for _ in range(10)) == 0.0
+
+def test_debt_delays_later_callers():
+    bucket = TokenBucket(20)
+    bucket.acquire(20)
+    bucket._tokens -= 10  # As if another caller had just reserved a batch of 10
+
+    assert bucket.acquire() == pytest.approx(11 / 20, abs=0.05)
+
+def test_concurrent_callers_share_the_rate():
+    bucket = TokenBucket(50)
+    bucket.acquire(50)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire, args=(5,)) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - started == pytest.approx(1.0, abs=0.2)
+
+def test_penalize_and_reward():
+    bucket = TokenBucket(16)
+    bucket.penalize()
+    assert bucket.rate == 8
+    for _ in range(100):
+        bucket.reward()
+    assert bucket.rate == bucket.max_rate
+
+def test_clients_with_different_rates_do_not_share_limiters(tmp_path):
+    custom = GoogleWorkspaceAPI(str(tmp_path / "test.db"), rate_limits={'admin': 1e9})
+    default = GoogleWorkspaceAPI(str(tmp_path / "test.db"))
+    same = GoogleWorkspaceAPI(str(tmp_path / "test.db"), rate_limits={'admin': 1e9})
+
+    assert custom.rate_limiters['admin'].max_rate == 1e9
+    assert default.rate_limiters['admin'].max_rate == GoogleWorkspaceAPI.RATE_LIMITS['admin']
+    assert same.rate_limiters['admin'] is custom.rate_limiters['admin']
+    assert default.rate_limiters['reports'] is custom.rate_limiters['reports']
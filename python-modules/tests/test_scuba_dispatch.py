@@ -0,0 +1,52 @@
+"""Tests for the bounded, per-service parallel baseline checks"""
+
+import time
+import threading
+from collections import Counter
+from types import SimpleNamespace
+
+from scuba_compliance import ScubaCompliance
+
+class _Engine:
+    """Just enough of ScubaCompliance for _execute_baseline_checks"""
+
+    def __init__(self, batch_size, per_service):
+        self.config = {"parallel_checks": True, "batch_size": batch_size, "max_checks_per_service": per_service}
+        self._lock = threading.Lock()
+        self.running = Counter()
+        self.peak_total = 0
+        self.peak_per_service = Counter()
+
+    def _timed_baseline_check(self, baseline):
+        with self._lock:
+            self.running[baseline.service_name] += 1
+            self.peak_total = max(self.peak_total, sum(self.running.values()))
+            self.peak_per_service[baseline.service_name] = max(self.peak_per_service[baseline.service_name],
+                                                               self.running[baseline.service_name])
+        time.sleep(0.02)
+        with self._lock:
+            self.running[baseline.service_name] -= 1
+        return baseline.baseline_id, 0.02
+
+def _baselines(services, per_service):
+    # Grouped by service, as load_baselines orders them
+    return [SimpleNamespace(service_name=service, baseline_id=f"{service}.{n}")
+            for service in services for n in range(per_service)]
+
+def test_uses_all_workers_across_services():
+    engine = _Engine(batch_size=10, per_service=4)
+    baselines = _baselines(["calendar", "drive", "gmail", "meet"], 12)
+
+    results = ScubaCompliance._execute_baseline_checks(engine, baselines)
+
+    assert results == [(b.baseline_id, 0.02) for b in baselines]
+    assert engine.peak_total == 10
+    assert max(engine.peak_per_service.values()) == 4
+
+def test_single_service_is_capped():
+    engine = _Engine(batch_size=10, per_service=3)
+    baselines = _baselines(["gmail"], 9)
+
+    ScubaCompliance._execute_baseline_checks(engine, baselines)
+
+    assert engine.peak_total == 3
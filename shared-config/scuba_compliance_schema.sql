@@ -1,6 +1,16 @@
 -- SCuBA Compliance Module Schema for GWOMBAT
 -- Based on CISA's Secure Cloud Business Applications (SCuBA) Security Baselines
 -- Supports 9 Google Workspace services with configurable enable/disable controls
+--
+-- ScubaCompliance applies this file only when its SHA-256 hash differs from the
+-- one recorded in scuba_schema_version, so every statement must be idempotent.
+
+-- Applied schema version (hash of this file), written by ScubaCompliance._init_database
+CREATE TABLE IF NOT EXISTS scuba_schema_version (
+    schema_name TEXT PRIMARY KEY,
+    schema_hash TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
 
 -- Main compliance baselines definition
 CREATE TABLE IF NOT EXISTS scuba_baselines (
@@ -35,7 +45,25 @@ CREATE TABLE IF NOT EXISTS scuba_compliance_results (
     gap_description TEXT, -- Description of the compliance gap
     risk_level TEXT DEFAULT 'medium', -- 'low', 'medium', 'high', 'critical'
     evidence_data TEXT, -- JSON with detailed evidence (logs, API responses, etc.)
-    check_method TEXT, -- How this was checked ('gam_command', 'api_call', 'log_analysis', 'manual')
+    check_method TEXT, -- How this was checked ('gam_command', 'api_call', 'log_analysis', 'manual', 'carried_forward')
+    session_id TEXT,
+    FOREIGN KEY (baseline_id) REFERENCES scuba_baselines(baseline_id)
+);
+
+-- Latest result per baseline, maintained by the triggers below so readers
+-- never have to scan the full scuba_compliance_results history
+CREATE TABLE IF NOT EXISTS scuba_latest_results (
+    baseline_id TEXT PRIMARY KEY,
+    result_id INTEGER NOT NULL, -- scuba_compliance_results.id of the latest result
+    assessment_date TIMESTAMP,
+    compliance_status TEXT NOT NULL,
+    confidence_level TEXT,
+    current_value TEXT,
+    expected_value TEXT,
+    gap_description TEXT,
+    risk_level TEXT,
+    evidence_data TEXT,
+    check_method TEXT,
     session_id TEXT,
     FOREIGN KEY (baseline_id) REFERENCES scuba_baselines(baseline_id)
 );
@@ -93,7 +121,7 @@ CREATE TABLE IF NOT EXISTS scuba_assessment_history (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     assessment_id TEXT UNIQUE NOT NULL,
     assessment_name TEXT,
-    assessment_type TEXT DEFAULT 'full', -- 'full', 'partial', 'service_specific', 'baseline_specific'
+    assessment_type TEXT DEFAULT 'full', -- 'full', 'incremental', 'partial', 'service_specific', 'baseline_specific'
     services_assessed TEXT, -- JSON array of services included
     baselines_assessed INTEGER DEFAULT 0,
     overall_compliance_percentage REAL DEFAULT 0.0,
@@ -108,6 +136,27 @@ CREATE TABLE IF NOT EXISTS scuba_assessment_history (
     session_id TEXT
 );
 
+-- Assessment history pre-aggregated per day, week (starting Monday) and month
+-- for long-range trend charts; maintained by ScubaCompliance after each assessment
+CREATE TABLE IF NOT EXISTS scuba_trend_rollups (
+    granularity TEXT NOT NULL, -- 'day', 'week', 'month'
+    bucket_start DATE NOT NULL,
+    bucket_end DATE NOT NULL, -- Exclusive
+    assessment_count INTEGER DEFAULT 0,
+    sum_compliance_percentage REAL DEFAULT 0.0,
+    min_compliance_percentage REAL,
+    max_compliance_percentage REAL,
+    first_compliance_percentage REAL,
+    last_compliance_percentage REAL,
+    sum_critical_findings INTEGER DEFAULT 0,
+    max_critical_findings INTEGER,
+    first_critical_findings INTEGER,
+    last_critical_findings INTEGER,
+    first_assessment TIMESTAMP,
+    last_assessment TIMESTAMP,
+    PRIMARY KEY (granularity, bucket_start)
+);
+
 -- Configuration for enabling/disabling compliance features
 CREATE TABLE IF NOT EXISTS scuba_feature_config (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -122,11 +171,35 @@ CREATE TABLE IF NOT EXISTS scuba_feature_config (
     UNIQUE(feature_category, feature_name)
 );
 
+-- Performance metrics (same definition as dashboard_schema.sql, which may not have
+-- been applied to this database); ScubaCompliance records per-command GAM latency
+-- and exit-code histograms here as gam_command, gam_latency_bucket and gam_exit_code rows
+CREATE TABLE IF NOT EXISTS performance_metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation_type TEXT NOT NULL,
+    operation_name TEXT,
+    duration_seconds REAL NOT NULL,
+    items_processed INTEGER DEFAULT 0,
+    throughput_per_second REAL,
+    memory_usage_mb REAL,
+    session_id TEXT,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    success INTEGER DEFAULT 1 -- 1 for success, 0 for failure
+);
+
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_operation ON performance_metrics(operation_type);
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_timestamp ON performance_metrics(timestamp);
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_scuba_baselines_service ON scuba_baselines(service_name);
 CREATE INDEX IF NOT EXISTS idx_scuba_baselines_enabled ON scuba_baselines(is_enabled);
 CREATE INDEX IF NOT EXISTS idx_scuba_baselines_criticality ON scuba_baselines(criticality_level);
-CREATE INDEX IF NOT EXISTS idx_scuba_compliance_results_baseline ON scuba_compliance_results(baseline_id);
+-- Baseline ids are unique so re-applying this file cannot duplicate the seed rows
+-- below; drop copies left behind by earlier re-runs, keeping the original row
+DELETE FROM scuba_baselines WHERE id NOT IN (SELECT MIN(id) FROM scuba_baselines GROUP BY baseline_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_scuba_baselines_baseline_id ON scuba_baselines(baseline_id);
+DROP INDEX IF EXISTS idx_scuba_compliance_results_baseline; -- Superseded by the composite index below
+CREATE INDEX IF NOT EXISTS idx_scuba_compliance_results_baseline_date ON scuba_compliance_results(baseline_id, assessment_date);
 CREATE INDEX IF NOT EXISTS idx_scuba_compliance_results_status ON scuba_compliance_results(compliance_status);
 CREATE INDEX IF NOT EXISTS idx_scuba_compliance_results_date ON scuba_compliance_results(assessment_date);
 CREATE INDEX IF NOT EXISTS idx_scuba_service_compliance_service ON scuba_service_compliance(service_name);
@@ -135,6 +208,113 @@ CREATE INDEX IF NOT EXISTS idx_scuba_remediation_status ON scuba_remediation_ite
 CREATE INDEX IF NOT EXISTS idx_scuba_remediation_priority ON scuba_remediation_items(remediation_priority);
 CREATE INDEX IF NOT EXISTS idx_scuba_assessment_history_date ON scuba_assessment_history(assessment_start);
 CREATE INDEX IF NOT EXISTS idx_scuba_feature_config_enabled ON scuba_feature_config(is_enabled);
+CREATE INDEX IF NOT EXISTS idx_scuba_latest_results_status ON scuba_latest_results(compliance_status, risk_level);
+
+-- Keep scuba_latest_results in step with scuba_compliance_results. A new row
+-- replaces the stored one unless that one is newer (ties go to the higher id).
+DROP TRIGGER IF EXISTS trg_scuba_latest_results_insert;
+CREATE TRIGGER trg_scuba_latest_results_insert
+AFTER INSERT ON scuba_compliance_results
+FOR EACH ROW
+WHEN NOT EXISTS (
+    SELECT 1 FROM scuba_latest_results l
+    WHERE l.baseline_id = NEW.baseline_id
+    AND (l.assessment_date > NEW.assessment_date
+         OR (l.assessment_date = NEW.assessment_date AND l.result_id > NEW.id))
+)
+BEGIN
+    INSERT OR REPLACE INTO scuba_latest_results (
+        baseline_id, result_id, assessment_date, compliance_status, confidence_level,
+        current_value, expected_value, gap_description, risk_level,
+        evidence_data, check_method, session_id
+    ) VALUES (
+        NEW.baseline_id, NEW.id, NEW.assessment_date, NEW.compliance_status, NEW.confidence_level,
+        NEW.current_value, NEW.expected_value, NEW.gap_description, NEW.risk_level,
+        NEW.evidence_data, NEW.check_method, NEW.session_id
+    );
+END;
+
+-- Pruning history: fall back to the newest remaining result for the baseline
+DROP TRIGGER IF EXISTS trg_scuba_latest_results_delete;
+CREATE TRIGGER trg_scuba_latest_results_delete
+AFTER DELETE ON scuba_compliance_results
+FOR EACH ROW
+WHEN EXISTS (SELECT 1 FROM scuba_latest_results WHERE result_id = OLD.id)
+BEGIN
+    DELETE FROM scuba_latest_results WHERE result_id = OLD.id;
+    INSERT INTO scuba_latest_results (
+        baseline_id, result_id, assessment_date, compliance_status, confidence_level,
+        current_value, expected_value, gap_description, risk_level,
+        evidence_data, check_method, session_id
+    )
+    SELECT baseline_id, id, assessment_date, compliance_status, confidence_level,
+           current_value, expected_value, gap_description, risk_level,
+           evidence_data, check_method, session_id
+    FROM scuba_compliance_results
+    WHERE baseline_id = OLD.baseline_id
+    ORDER BY assessment_date DESC, id DESC
+    LIMIT 1;
+END;
+
+-- Backfill from existing history (no-op once the triggers are in place)
+INSERT OR REPLACE INTO scuba_latest_results (
+    baseline_id, result_id, assessment_date, compliance_status, confidence_level,
+    current_value, expected_value, gap_description, risk_level,
+    evidence_data, check_method, session_id
+)
+SELECT r.baseline_id, r.id, r.assessment_date, r.compliance_status, r.confidence_level,
+       r.current_value, r.expected_value, r.gap_description, r.risk_level,
+       r.evidence_data, r.check_method, r.session_id
+FROM scuba_compliance_results r
+WHERE r.id = (
+    SELECT r2.id FROM scuba_compliance_results r2
+    WHERE r2.baseline_id = r.baseline_id
+    ORDER BY r2.assessment_date DESC, r2.id DESC
+    LIMIT 1
+);
+
+-- Backfill trend rollups from existing assessment history
+WITH buckets AS (
+    SELECT DISTINCT 'day' AS granularity, date(assessment_start) AS bucket_start,
+           date(assessment_start, '+1 day') AS bucket_end
+    FROM scuba_assessment_history
+    UNION
+    SELECT DISTINCT 'week', date(assessment_start, 'weekday 0', '-6 days'),
+           date(assessment_start, 'weekday 0', '+1 day')
+    FROM scuba_assessment_history
+    UNION
+    SELECT DISTINCT 'month', date(assessment_start, 'start of month'),
+           date(assessment_start, 'start of month', '+1 month')
+    FROM scuba_assessment_history
+)
+INSERT OR REPLACE INTO scuba_trend_rollups (
+    granularity, bucket_start, bucket_end, assessment_count,
+    sum_compliance_percentage, min_compliance_percentage, max_compliance_percentage,
+    first_compliance_percentage, last_compliance_percentage,
+    sum_critical_findings, max_critical_findings, first_critical_findings, last_critical_findings,
+    first_assessment, last_assessment
+)
+SELECT
+    b.granularity, b.bucket_start, b.bucket_end, COUNT(*),
+    SUM(h.overall_compliance_percentage), MIN(h.overall_compliance_percentage), MAX(h.overall_compliance_percentage),
+    (SELECT overall_compliance_percentage FROM scuba_assessment_history
+     WHERE assessment_start >= b.bucket_start AND assessment_start < b.bucket_end
+     ORDER BY assessment_start, id LIMIT 1),
+    (SELECT overall_compliance_percentage FROM scuba_assessment_history
+     WHERE assessment_start >= b.bucket_start AND assessment_start < b.bucket_end
+     ORDER BY assessment_start DESC, id DESC LIMIT 1),
+    SUM(h.critical_findings), MAX(h.critical_findings),
+    (SELECT critical_findings FROM scuba_assessment_history
+     WHERE assessment_start >= b.bucket_start AND assessment_start < b.bucket_end
+     ORDER BY assessment_start, id LIMIT 1),
+    (SELECT critical_findings FROM scuba_assessment_history
+     WHERE assessment_start >= b.bucket_start AND assessment_start < b.bucket_end
+     ORDER BY assessment_start DESC, id DESC LIMIT 1),
+    MIN(h.assessment_start), MAX(h.assessment_start)
+FROM buckets b
+JOIN scuba_assessment_history h
+    ON h.assessment_start >= b.bucket_start AND h.assessment_start < b.bucket_end
+GROUP BY b.granularity, b.bucket_start, b.bucket_end;
 
 -- Views for compliance reporting
 CREATE VIEW IF NOT EXISTS scuba_compliance_overview AS
@@ -150,7 +330,9 @@ FROM scuba_baselines
 GROUP BY service_name
 ORDER BY service_name;
 
-CREATE VIEW IF NOT EXISTS scuba_latest_compliance AS
+-- Recreated so databases carrying the old history-scanning definition pick up this one
+DROP VIEW IF EXISTS scuba_latest_compliance;
+CREATE VIEW scuba_latest_compliance AS
 SELECT 
     b.service_name,
     b.baseline_id,
@@ -160,14 +342,11 @@ SELECT
     r.confidence_level,
     r.risk_level,
     r.gap_description,
+    r.current_value,
+    r.expected_value,
     r.assessment_date
 FROM scuba_baselines b
-LEFT JOIN scuba_compliance_results r ON b.baseline_id = r.baseline_id
-LEFT JOIN (
-    SELECT baseline_id, MAX(assessment_date) as latest_date
-    FROM scuba_compliance_results 
-    GROUP BY baseline_id
-) latest ON r.baseline_id = latest.baseline_id AND r.assessment_date = latest.latest_date
+LEFT JOIN scuba_latest_results r ON b.baseline_id = r.baseline_id
 WHERE b.is_enabled = 1
 ORDER BY b.service_name, b.criticality_level DESC, b.baseline_id;
 
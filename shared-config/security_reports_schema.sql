@@ -4,6 +4,7 @@
 -- Login activity tracking
 CREATE TABLE IF NOT EXISTS login_activities (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT, -- Stable hash of the report event, so re-fetched events are ignored
     user_email TEXT NOT NULL,
     login_time TIMESTAMP,
     login_type TEXT, -- 'successful', 'failed', 'suspicious'
@@ -22,6 +23,7 @@ CREATE TABLE IF NOT EXISTS login_activities (
 -- Admin activity monitoring
 CREATE TABLE IF NOT EXISTS admin_activities (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT, -- Stable hash of the report event, so re-fetched events are ignored
     admin_email TEXT NOT NULL,
     activity_time TIMESTAMP,
     activity_type TEXT, -- 'user_create', 'user_suspend', 'settings_change', 'privilege_grant', etc.
@@ -35,6 +37,45 @@ CREATE TABLE IF NOT EXISTS admin_activities (
     scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Drive audit activity (views, downloads, sharing changes)
+CREATE TABLE IF NOT EXISTS drive_activities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT,
+    user_email TEXT NOT NULL,
+    activity_time TIMESTAMP,
+    event_name TEXT, -- 'view', 'download', 'change_user_access', etc.
+    doc_id TEXT,
+    doc_title TEXT,
+    visibility TEXT, -- 'private', 'shared_internally', 'people_with_link', 'public_on_the_web', etc.
+    ip_address TEXT,
+    session_id TEXT,
+    scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- OAuth token activity (authorize, revoke)
+CREATE TABLE IF NOT EXISTS token_activities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT,
+    user_email TEXT NOT NULL,
+    activity_time TIMESTAMP,
+    event_name TEXT, -- 'authorize', 'revoke', 'request'
+    app_name TEXT,
+    client_id TEXT,
+    scopes TEXT,
+    ip_address TEXT,
+    session_id TEXT,
+    scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- High-water mark per activity report, so scans only fetch newer events
+CREATE TABLE IF NOT EXISTS activity_ingest_state (
+    application TEXT PRIMARY KEY, -- 'login', 'admin', 'drive', 'token'
+    last_event_time TIMESTAMP, -- Newest ingested event time (UTC)
+    events_ingested INTEGER DEFAULT 0,
+    last_scan_time TIMESTAMP,
+    session_id TEXT
+);
+
 -- Security compliance tracking
 CREATE TABLE IF NOT EXISTS security_compliance (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -160,10 +201,20 @@ CREATE INDEX IF NOT EXISTS idx_login_activities_user ON login_activities(user_em
 CREATE INDEX IF NOT EXISTS idx_login_activities_time ON login_activities(login_time);
 CREATE INDEX IF NOT EXISTS idx_login_activities_type ON login_activities(login_type);
 CREATE INDEX IF NOT EXISTS idx_login_activities_suspicious ON login_activities(is_suspicious);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_login_activities_event ON login_activities(event_id);
 
 CREATE INDEX IF NOT EXISTS idx_admin_activities_admin ON admin_activities(admin_email);
 CREATE INDEX IF NOT EXISTS idx_admin_activities_time ON admin_activities(activity_time);
 CREATE INDEX IF NOT EXISTS idx_admin_activities_type ON admin_activities(activity_type);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_admin_activities_event ON admin_activities(event_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_drive_activities_event ON drive_activities(event_id);
+CREATE INDEX IF NOT EXISTS idx_drive_activities_user ON drive_activities(user_email);
+CREATE INDEX IF NOT EXISTS idx_drive_activities_time ON drive_activities(activity_time);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_token_activities_event ON token_activities(event_id);
+CREATE INDEX IF NOT EXISTS idx_token_activities_user ON token_activities(user_email);
+CREATE INDEX IF NOT EXISTS idx_token_activities_time ON token_activities(activity_time);
 
 CREATE INDEX IF NOT EXISTS idx_security_compliance_user ON security_compliance(user_email);
 CREATE INDEX IF NOT EXISTS idx_security_compliance_type ON security_compliance(compliance_type);
@@ -23,6 +23,37 @@ WHITE='\033[1;37m'
 GRAY='\033[0;37m'
 NC='\033[0m' # No Color
 
+# Streaming parser for GAM CSV/JSON output
+GAM_OUTPUT_PARSER="${GAM_OUTPUT_PARSER:-$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)/python-modules/gam_output.py}"
+
+# Count records in GAM CSV output on stdin
+# Optional arguments FIELD CUTOFF count only records whose FIELD timestamp is before CUTOFF or never set
+count_gam_records() {
+    local field="$1"
+    local cutoff="$2"
+    
+    if command -v python3 >/dev/null 2>&1 && [[ -f "$GAM_OUTPUT_PARSER" ]]; then
+        if [[ -n "$field" ]]; then
+            python3 "$GAM_OUTPUT_PARSER" count --older-than "$field" "$cutoff"
+        else
+            python3 "$GAM_OUTPUT_PARSER" count
+        fi
+    elif [[ -n "$field" ]]; then
+        # Fallback: assumes FIELD is the second column and no quoted commas
+        tail -n +2 | awk -F, -v cutoff="$cutoff" '
+        {
+            last_login = $2
+            if (last_login == "" || last_login == "Never" || last_login < cutoff) {
+                count++
+            }
+        }
+        END { print count + 0 }
+        '
+    else
+        tail -n +2 | wc -l
+    fi
+}
+
 # Initialize dashboard database
 init_dashboard_db() {
     if [[ -f "../dashboard_schema.sql" ]]; then
@@ -119,19 +150,8 @@ scan_extended_statistics() {
     if users_data=$($GAM print users fields primaryEmail,lastLoginTime 2>/dev/null); then
         local cutoff_date=$(date -d "30 days ago" "+%Y-%m-%dT%H:%M:%S")
         
-        # Count users with no recent login
-        inactive_count=$(echo "$users_data" | tail -n +2 | awk -F, -v cutoff="$cutoff_date" '
-        {
-            # Extract last login time (field 2)
-            last_login = $2
-            
-            # If no login time or login time is before cutoff, count as inactive
-            if (last_login == "" || last_login < cutoff) {
-                count++
-            }
-        }
-        END { print count + 0 }
-        ')
+        # Count users with no recent login (no login time, "Never", or before cutoff)
+        inactive_count=$(echo "$users_data" | count_gam_records lastLoginTime "$cutoff_date")
         
         log_dashboard "Found $inactive_count inactive users (30+ days)" "INFO" "extended_scan"
     else
@@ -162,7 +182,7 @@ scan_extended_statistics() {
     # This is a complex query that may take time for large domains
     # We'll use a sample-based approach for performance
     if external_sharing_data=$($GAM config csv_output_row_filter "permissions.*.emailAddress:regex:^(?!.*@${DOMAIN:-your-domain.edu})" print filelist fields id,permissions.emailAddress 2>/dev/null); then
-        external_sharing_count=$(echo "$external_sharing_data" | tail -n +2 | wc -l)
+        external_sharing_count=$(echo "$external_sharing_data" | count_gam_records)
         log_dashboard "Found $external_sharing_count files with external sharing" "INFO" "extended_scan"
     else
         log_dashboard "Failed to scan external sharing (using fallback method)" "WARNING" "extended_scan"
@@ -190,7 +210,7 @@ scan_extended_statistics() {
     local admin_users_count=0
     
     if admin_data=$($GAM print admins 2>/dev/null); then
-        admin_users_count=$(echo "$admin_data" | tail -n +2 | wc -l)
+        admin_users_count=$(echo "$admin_data" | count_gam_records)
         log_dashboard "Found $admin_users_count admin users" "INFO" "extended_scan"
     else
         log_dashboard "Failed to scan admin users" "WARNING" "extended_scan"
@@ -200,7 +220,7 @@ scan_extended_statistics() {
     log_dashboard "Scanning groups count" "DEBUG" "extended_scan"
     local groups_count=0
     
-    if groups_count=$($GAM print groups 2>/dev/null | tail -n +2 | wc -l); then
+    if groups_count=$($GAM print groups 2>/dev/null | count_gam_records); then
         log_dashboard "Found $groups_count groups" "INFO" "extended_scan"
     else
         log_dashboard "Failed to scan groups" "WARNING" "extended_scan"
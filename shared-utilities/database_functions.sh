@@ -13,6 +13,14 @@ DB_FILE="${SCRIPTPATH}/local-config/gwombat.db"
 # SECURITY: Menu database is read-only (chmod 444) to prevent tampering and SQL injection
 MENU_DB_FILE="${SCRIPTPATH}/shared-config/menu.db"
 DB_SCHEMA_FILE="${SCRIPTPATH}/shared-config/database_schema.sql"
+# Streaming parser for GAM CSV/JSON output (handles quoted commas in names and OU paths)
+GAM_OUTPUT_PARSER="${GAM_OUTPUT_PARSER:-$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)/python-modules/gam_output.py}"
+# Bulk suspended-account stage sync (one GAM listing, one transaction)
+ACCOUNT_SYNC="${ACCOUNT_SYNC:-$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)/python-modules/account_sync.py}"
+# Parallel, resumable list verification (worker count and GAM rate cap below)
+BULK_VERIFY="${BULK_VERIFY:-$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)/python-modules/bulk_verify.py}"
+BULK_VERIFY_WORKERS="${BULK_VERIFY_WORKERS:-4}"
+BULK_VERIFY_RATE="${BULK_VERIFY_RATE:-5}"
 
 # Color definitions (fallback if not defined elsewhere)
 if [[ -z "$RED" ]]; then
@@ -702,6 +710,17 @@ bulk_verify_list() {
     echo -e "${BLUE}=== Bulk Verification: $list_name (Stage: $expected_stage) ===${NC}"
     echo ""
     
+    # Parallel verification: several accounts at once under a GAM rate cap,
+    # results written in batches and progress checkpointed so an interrupted
+    # run resumes where it stopped
+    if command -v python3 >/dev/null 2>&1 && [[ -f "$BULK_VERIFY" ]]; then
+        local verify_args=(--list "$1" --stage "$expected_stage" --db-path "$DB_FILE" --gam-path "$GAM"
+                           --workers "$BULK_VERIFY_WORKERS" --rate-limit "$BULK_VERIFY_RATE")
+        [[ -n "$SESSION_ID" ]] && verify_args+=(--session-id "$SESSION_ID")
+        python3 "$BULK_VERIFY" "${verify_args[@]}"
+        return $?
+    fi
+    
     # Get all accounts in list
     local accounts=($(secure_sqlite_query "$DB_FILE" "SELECT a.email FROM accounts a JOIN account_list_memberships alm ON a.id = alm.account_id JOIN account_lists l ON alm.list_id = l.id WHERE l.name = '%s';" "$list_name"))
     
@@ -818,6 +837,27 @@ scan_suspended_accounts() {
         init_database || return 1
     fi
     
+    # Bulk stage sync: parse the listing once, classify OUs in memory and write
+    # only the accounts whose stage or details changed, in one transaction
+    if command -v python3 >/dev/null 2>&1 && [[ -f "$ACCOUNT_SYNC" ]]; then
+        echo -e "${CYAN}Querying GAM for all suspended users...${NC}"
+        local sync_args=(suspended --db-path "$DB_FILE" --gam-path "$GAM")
+        [[ -n "$SESSION_ID" ]] && sync_args+=(--session-id "$SESSION_ID")
+        [[ "$update_db" != "true" ]] && sync_args+=(--dry-run)
+        echo ""
+        
+        if ! python3 "$ACCOUNT_SYNC" "${sync_args[@]}"; then
+            echo -e "${RED}Failed to sync suspended accounts${NC}"
+            return 1
+        fi
+        
+        if [[ "$update_db" == "true" ]]; then
+            echo -e "${GREEN}✅ Database updated with discovered accounts${NC}"
+            log_info "Account scan completed: suspended accounts synced to their OU stages"
+        fi
+        return 0
+    fi
+    
     # Get all suspended users
     echo -e "${CYAN}Querying GAM for all suspended users...${NC}"
     local suspended_users=$($GAM print users query "isSuspended=true" fields primaryemail,familyname,givenname,orgunitpath 2>/dev/null)
@@ -837,21 +877,19 @@ scan_suspended_accounts() {
     echo -e "${CYAN}Analyzing organizational unit placements...${NC}"
     echo ""
     
-    # Process each line (skip header)
+    # Pure-bash fallback for hosts without python3 (account_sync.py handles the
+    # listing otherwise): split GAM's CSV on commas, skipping the header
     local line_count=0
     while IFS=',' read -r email family_name given_name ou_path; do
         ((line_count++))
         
-        # Skip header line
-        [[ $line_count -eq 1 ]] && continue
-        
         # Clean up fields
         email=$(echo "$email" | xargs)
         ou_path=$(echo "$ou_path" | xargs)
         
         [[ -z "$email" ]] && continue
         
-        # Determine stage based on OU path
+    # Determine stage based on OU path
         local stage=""
         local display_name="$given_name $family_name"
         
@@ -889,7 +927,7 @@ scan_suspended_accounts() {
         if (( line_count % 10 == 0 )); then
             echo -n "."
         fi
-    done <<< "$suspended_users"
+    done < <(printf '%s\n' "$suspended_users" | tail -n +2)
     
     echo ""
     echo ""
@@ -113,22 +113,32 @@ export_users_csv() {
     
     echo -e "${CYAN}Retrieving $description...${NC}"
     
-    # Execute GAM command and capture output
+    # Execute GAM command and capture output (stderr kept out of the CSV)
     local gam_output
-    if ! gam_output=$($gam_command 2>&1); then
+    local gam_errors=$(mktemp)
+    if ! gam_output=$($gam_command 2>"$gam_errors"); then
         echo -e "${RED}Error executing GAM command: $gam_command${NC}"
-        echo -e "${RED}GAM output: $gam_output${NC}"
+        echo -e "${RED}GAM output: $gam_output$(cat "$gam_errors")${NC}"
+        rm -f "$gam_errors"
         return 1
     fi
+    rm -f "$gam_errors"
     
     if [[ -z "$gam_output" ]]; then
         echo -e "${YELLOW}No users found for export type: $export_type${NC}"
         return 1
     fi
     
-    # Export to CSV
+    # Export to CSV, normalized by the GAM output parser when available
     local export_file="$EXPORT_DIR/$filename"
-    echo "$gam_output" > "$export_file"
+    local record_count
+    if command -v python3 >/dev/null 2>&1 && [[ -f "$GAM_OUTPUT_PARSER" ]] && \
+        echo "$gam_output" | python3 "$GAM_OUTPUT_PARSER" csv > "$export_file"; then
+        record_count=$(python3 "$GAM_OUTPUT_PARSER" --input "$export_file" count)
+    else
+        echo "$gam_output" > "$export_file"
+        record_count=$(echo "$gam_output" | tail -n +2 | wc -l)
+    fi
     
     # Add GWOMBAT metadata
     echo "" >> "$export_file"
@@ -138,7 +148,6 @@ export_users_csv() {
     echo "# GAM command: $gam_command" >> "$export_file"
     
     local file_size=$(du -h "$export_file" | cut -f1)
-    local record_count=$(echo "$gam_output" | wc -l)
     
     echo -e "${GREEN}✓ User export completed successfully${NC}"
     echo -e "  ${WHITE}File:${NC} $export_file"
@@ -14,6 +14,8 @@ SESSION_ID="${SESSION_ID:-$(date +%Y%m%d_%H%M%S)_$$}"
 PYTHON_MODULES_PATH="./python-modules"
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 GWOMBAT_DIR="$(dirname "$SCRIPT_DIR")"
+SCUBA_DAEMON_SOCKET="${SCUBA_DAEMON_SOCKET:-$(dirname "$DB_PATH")/scuba_bridge.sock}"
+SCUBA_DAEMON_LOG="${SCUBA_DAEMON_LOG:-$(dirname "$DB_PATH")/scuba_bridge.log}"
 
 # Color codes
 RED='\033[0;31m'
@@ -42,6 +44,67 @@ log_scuba() {
     " >/dev/null 2>&1
 }
 
+# Send a request to the persistent Python bridge daemon
+# Returns 3 when the daemon is not running so callers can fall back to a
+# one-shot python3 invocation
+scuba_daemon_call() {
+    local action="$1"
+    shift
+    
+    (cd "$GWOMBAT_DIR" && [[ -S "$SCUBA_DAEMON_SOCKET" ]]) || return 3
+    
+    (cd "$GWOMBAT_DIR" && python3 "$PYTHON_MODULES_PATH/bridge_daemon.py" call \
+        --socket "$SCUBA_DAEMON_SOCKET" --action "$action" "$@")
+}
+
+# Start the persistent Python bridge daemon in the background
+start_scuba_daemon() {
+    cd "$GWOMBAT_DIR" || return 1
+    
+    if python3 "$PYTHON_MODULES_PATH/bridge_daemon.py" status --socket "$SCUBA_DAEMON_SOCKET" >/dev/null 2>&1; then
+        echo -e "${YELLOW}SCuBA bridge daemon is already running${NC}"
+        return 0
+    fi
+    
+    echo -e "${CYAN}Starting SCuBA bridge daemon...${NC}"
+    mkdir -p "$(dirname "$SCUBA_DAEMON_LOG")"
+    nohup python3 "$PYTHON_MODULES_PATH/bridge_daemon.py" serve \
+        --socket "$SCUBA_DAEMON_SOCKET" \
+        --db-path "$DB_PATH" \
+        --gam-path "${GAM_PATH:-gam}" >>"$SCUBA_DAEMON_LOG" 2>&1 &
+    
+    # Wait for the socket to come up
+    local attempt
+    for attempt in 1 2 3 4 5 6 7 8 9 10; do
+        if [[ -S "$SCUBA_DAEMON_SOCKET" ]]; then
+            echo -e "${GREEN}✓ SCuBA bridge daemon started (socket: $SCUBA_DAEMON_SOCKET)${NC}"
+            log_scuba "SCuBA bridge daemon started" "INFO"
+            return 0
+        fi
+        sleep 0.5
+    done
+    
+    echo -e "${RED}✗ SCuBA bridge daemon failed to start - see $SCUBA_DAEMON_LOG${NC}"
+    return 1
+}
+
+# Stop the persistent Python bridge daemon
+stop_scuba_daemon() {
+    cd "$GWOMBAT_DIR" || return 1
+    
+    if python3 "$PYTHON_MODULES_PATH/bridge_daemon.py" stop --socket "$SCUBA_DAEMON_SOCKET"; then
+        log_scuba "SCuBA bridge daemon stopped" "INFO"
+    else
+        echo -e "${YELLOW}SCuBA bridge daemon is not running${NC}"
+    fi
+}
+
+# Show persistent Python bridge daemon status
+show_scuba_daemon_status() {
+    cd "$GWOMBAT_DIR" || return 1
+    python3 "$PYTHON_MODULES_PATH/bridge_daemon.py" status --socket "$SCUBA_DAEMON_SOCKET"
+}
+
 # Check if Python modules are available and functional
 check_python_environment() {
     echo -e "${CYAN}Checking Python environment for SCuBA compliance...${NC}"
@@ -149,11 +212,13 @@ toggle_scuba_compliance() {
 }
 
 # Run SCuBA compliance assessment
+# Usage: run_scuba_assessment [services] [table|json] [full|incremental]
 run_scuba_assessment() {
     local services="$1"
     local output_format="${2:-table}"
+    local assessment_mode="${3:-full}"
     
-    echo -e "${CYAN}Running SCuBA compliance assessment...${NC}"
+    echo -e "${CYAN}Running SCuBA compliance assessment ($assessment_mode)...${NC}"
     
     # Check if enabled
     if [[ "$(is_scuba_enabled)" == "false" ]]; then
@@ -171,6 +236,28 @@ run_scuba_assessment() {
     
     cd "$GWOMBAT_DIR" || return 1
     
+    # Use the warm bridge daemon if it is running
+    local daemon_args=(--output "$output_format")
+    if [[ -n "$services" ]]; then
+        daemon_args+=(--services $services)
+    fi
+    if [[ "$assessment_mode" == "incremental" ]]; then
+        daemon_args+=(--incremental)
+    fi
+    
+    scuba_daemon_call assess "${daemon_args[@]}"
+    local daemon_status=$?
+    if [[ $daemon_status -ne 3 ]]; then
+        if [[ $daemon_status -eq 0 ]]; then
+            echo -e "${GREEN}✓ SCuBA assessment completed successfully${NC}"
+            log_scuba "SCuBA assessment completed successfully (bridge daemon)" "INFO"
+            return 0
+        fi
+        echo -e "${RED}✗ SCuBA assessment failed${NC}"
+        log_scuba "SCuBA assessment failed (bridge daemon)" "ERROR"
+        return 1
+    fi
+    
     # Build command
     local cmd="python3 -m python-modules.scuba_compliance"
     cmd="$cmd --db-path '$DB_PATH'"
@@ -185,6 +272,10 @@ run_scuba_assessment() {
     
     cmd="$cmd --output $output_format"
     
+    if [[ "$assessment_mode" == "incremental" ]]; then
+        cmd="$cmd --incremental"
+    fi
+    
     echo "Executing: $cmd"
     log_scuba "Starting SCuBA assessment: $cmd" "INFO"
     
@@ -213,8 +304,15 @@ show_scuba_dashboard() {
     
     cd "$GWOMBAT_DIR" || return 1
     
-    # Run dashboard
-    if python3 -m python-modules.compliance_dashboard --db-path "$DB_PATH" --action dashboard; then
+    # Run dashboard (through the bridge daemon if running)
+    scuba_daemon_call dashboard
+    local daemon_status=$?
+    if [[ $daemon_status -eq 0 ]]; then
+        log_scuba "SCuBA dashboard displayed (bridge daemon)" "INFO"
+        return 0
+    fi
+    
+    if [[ $daemon_status -eq 3 ]] && python3 -m python-modules.compliance_dashboard --db-path "$DB_PATH" --action dashboard; then
         log_scuba "SCuBA dashboard displayed" "INFO"
         return 0
     else
@@ -225,14 +323,16 @@ show_scuba_dashboard() {
 }
 
 # Export SCuBA compliance report
+# Usage: export_scuba_report [output_path] [json|json-compact|ndjson|csv] [--start-date D] [--end-date D] [--services S...] [--include-history]
 export_scuba_report() {
     local output_path="$1"
     local format="${2:-json}"
+    local export_options=("${@:3}")
     
     echo -e "${CYAN}Exporting SCuBA compliance report...${NC}"
     
     if [[ -z "$output_path" ]]; then
-        output_path="./reports/scuba_compliance_$(date +%Y%m%d_%H%M%S).json"
+        output_path="./reports/scuba_compliance_$(date +%Y%m%d_%H%M%S).${format%-compact}"
     fi
     
     # Ensure output directory exists
@@ -240,7 +340,15 @@ export_scuba_report() {
     
     cd "$GWOMBAT_DIR" || return 1
     
-    if python3 -m python-modules.compliance_dashboard --db-path "$DB_PATH" --action export --output "$output_path" --format "$format"; then
+    # Export through the bridge daemon if running, otherwise one-shot
+    scuba_daemon_call export --path "$output_path" --format "$format" "${export_options[@]}"
+    local export_status=$?
+    if [[ $export_status -eq 3 ]]; then
+        python3 -m python-modules.compliance_dashboard --db-path "$DB_PATH" --action export --output "$output_path" --format "$format" "${export_options[@]}"
+        export_status=$?
+    fi
+    
+    if [[ $export_status -eq 0 ]]; then
         echo -e "${GREEN}✓ SCuBA compliance report exported to: $output_path${NC}"
         log_scuba "SCuBA report exported to $output_path" "INFO"
         return 0
@@ -593,14 +701,26 @@ case "${1:-menu}" in
     "assess")
         run_scuba_assessment "$2" "$3"
         ;;
+    "assess-incremental")
+        run_scuba_assessment "$2" "$3" incremental
+        ;;
     "dashboard")
         show_scuba_dashboard
         ;;
     "export")
-        export_scuba_report "$2" "$3"
+        export_scuba_report "${@:2}"
+        ;;
+    "daemon-start")
+        start_scuba_daemon
+        ;;
+    "daemon-stop")
+        stop_scuba_daemon
+        ;;
+    "daemon-status")
+        show_scuba_daemon_status
         ;;
     *)
-        echo "Usage: $0 {menu|status|check-python|setup-python|enable|disable|assess|dashboard|export}"
+        echo "Usage: $0 {menu|status|check-python|setup-python|enable|disable|assess|assess-incremental|dashboard|export|daemon-start|daemon-stop|daemon-status}"
         echo ""
         echo "Commands:"
         echo "  menu         - Show SCuBA compliance management menu"
@@ -610,8 +730,12 @@ case "${1:-menu}" in
         echo "  enable       - Enable SCuBA compliance"
         echo "  disable      - Disable SCuBA compliance"
         echo "  assess       - Run compliance assessment"
+        echo "  assess-incremental - Re-check only changed or expired baselines, carry the rest forward"
         echo "  dashboard    - Show compliance dashboard"
-        echo "  export       - Export compliance report"
+        echo "  export       - Export compliance report: export [path] [json|json-compact|ndjson|csv] [--start-date YYYY-MM-DD] [--end-date YYYY-MM-DD] [--services S...] [--include-history]"
+        echo "  daemon-start - Start persistent Python bridge daemon (faster menu actions)"
+        echo "  daemon-stop  - Stop persistent Python bridge daemon"
+        echo "  daemon-status - Show persistent Python bridge daemon status"
         exit 1
         ;;
 esac
\ No newline at end of file
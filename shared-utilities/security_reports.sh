@@ -13,6 +13,7 @@ DB_PATH="${DB_PATH:-./config/gwombat.db}"
 GAM="${GAM_PATH:-gam}"
 SESSION_ID="${SESSION_ID:-$(date +%Y%m%d_%H%M%S)_$$}"
 DOMAIN="${DOMAIN:-your-domain.edu}"
+ACTIVITY_INGEST="${ACTIVITY_INGEST:-$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)/python-modules/activity_ingest.py}"
 
 # Color codes
 RED='\033[0;31m'
@@ -74,73 +75,16 @@ scan_login_activities() {
     
     log_security "Starting login activities scan (${days_back} days)" "INFO" "login_scan"
     
-    # Mark old login activities as historical
-    execute_db "UPDATE login_activities SET status = 'historical' WHERE scan_time < datetime('now', '-${days_back} days');"
-    
     echo -e "${BLUE}📊 Scanning login activities for last ${days_back} days...${NC}"
     
-    # Get login reports from GAM7
-    local cutoff_date=$(date -d "${days_back} days ago" '+%Y-%m-%d')
-    local login_data
-    
-    # Use GAM7's advanced login reporting
-    if login_data=$($GAM report logins start "$cutoff_date" 2>/dev/null); then
-        echo "$login_data" | tail -n +2 | while IFS=',' read -r time user_email event_type ip_address user_agent; do
-            # Skip empty lines
-            [[ -z "$user_email" ]] && continue
-            
-            # Parse login time
-            local login_time=$(echo "$time" | sed 's/T/ /' | cut -d'.' -f1)
-            
-            # Determine login type
-            local login_type="successful"
-            local is_suspicious=0
-            local risk_score=0
-            
-            # Check for suspicious patterns
-            case "$event_type" in
-                *"login_failure"*|*"failed"*)
-                    login_type="failed"
-                    risk_score=30
-                    ;;
-                *"suspicious"*|*"unusual"*)
-                    login_type="suspicious"
-                    is_suspicious=1
-                    risk_score=70
-                    ;;
-            esac
-            
-            # Basic device type detection from user agent
-            local device_type="unknown"
-            case "$user_agent" in
-                *"Mobile"*|*"Android"*|*"iPhone"*) device_type="mobile" ;;
-                *"Windows"*|*"Macintosh"*|*"Linux"*) device_type="desktop" ;;
-            esac
-            
-            # Simple geographic risk assessment (this could be enhanced with IP geolocation)
-            if [[ "$ip_address" =~ ^(10\.|192\.168\.|172\.(1[6-9]|2[0-9]|3[0-1])\.) ]]; then
-                # Internal IP, lower risk
-                risk_score=$((risk_score - 10))
-            else
-                # External IP, slightly higher risk
-                risk_score=$((risk_score + 10))
-            fi
-            
-            # Ensure risk score is within bounds
-            [[ $risk_score -lt 0 ]] && risk_score=0
-            [[ $risk_score -gt 100 ]] && risk_score=100
-            
-            # Store login activity
-            execute_db "
-            INSERT INTO login_activities (
-                user_email, login_time, login_type, ip_address, user_agent,
-                device_type, is_suspicious, risk_score, session_id
-            ) VALUES (
-                '$user_email', '$login_time', '$login_type', '$ip_address',
-                '$(echo "$user_agent" | tr "'" "''")', '$device_type', $is_suspicious, $risk_score, '$SESSION_ID'
-            );"
-        done
-        
+    # Stream GAM7's login report into login_activities in batches, starting at the
+    # last ingested event (already stored events are skipped); risk scoring,
+    # device detection and the security_metrics update happen in the ingester
+    local total_logins=0 suspicious_logins=0 failed_logins=0
+    local ingest_counts
+    if ingest_counts=$(python3 "$ACTIVITY_INGEST" login --db-path "$DB_PATH" --session-id "$SESSION_ID" \
+            --days-back "$days_back" --gam-path "$GAM"); then
+        IFS=$'\t' read -r total_logins suspicious_logins failed_logins <<< "$ingest_counts"
         log_security "Login activities scan completed" "INFO" "login_scan"
     else
         log_security "Failed to retrieve login reports from GAM" "WARNING" "login_scan"
@@ -150,21 +94,8 @@ scan_login_activities() {
     local end_time=$(date +%s)
     local duration=$((end_time - start_time))
     
-    # Update metrics
-    local total_logins=$(execute_db "SELECT COUNT(*) FROM login_activities WHERE session_id = '$SESSION_ID';")
-    local suspicious_logins=$(execute_db "SELECT COUNT(*) FROM login_activities WHERE is_suspicious = 1 AND session_id = '$SESSION_ID';")
-    local failed_logins=$(execute_db "SELECT COUNT(*) FROM login_activities WHERE login_type = 'failed' AND session_id = '$SESSION_ID';")
-    
-    execute_db "
-    INSERT OR REPLACE INTO security_metrics (metric_name, metric_value, metric_category, session_id, status)
-    VALUES 
-        ('Total Logins Scanned', $total_logins, 'authentication', '$SESSION_ID', 'current'),
-        ('Suspicious Logins (${days_back}d)', $suspicious_logins, 'authentication', '$SESSION_ID', 'current'),
-        ('Failed Logins (${days_back}d)', $failed_logins, 'authentication', '$SESSION_ID', 'current');
-    "
-    
     echo -e "${GREEN}✓ Login activities scan completed${NC}"
-    echo "  Total logins: $total_logins"
+    echo "  New logins: $total_logins"
     echo "  Suspicious: $suspicious_logins"
     echo "  Failed: $failed_logins"
     echo "  Duration: ${duration}s"
@@ -179,52 +110,13 @@ scan_admin_activities() {
     
     echo -e "${BLUE}🔐 Scanning admin activities for last ${days_back} days...${NC}"
     
-    # Get admin activity reports from GAM7
-    local cutoff_date=$(date -d "${days_back} days ago" '+%Y-%m-%d')
-    local admin_data
-    
-    # Use GAM7's admin audit reporting
-    if admin_data=$($GAM report admin start "$cutoff_date" 2>/dev/null); then
-        echo "$admin_data" | tail -n +2 | while IFS=',' read -r time admin_email event_name target_user ip_address; do
-            # Skip empty lines
-            [[ -z "$admin_email" ]] && continue
-            
-            # Parse activity time
-            local activity_time=$(echo "$time" | sed 's/T/ /' | cut -d'.' -f1)
-            
-            # Categorize admin activities
-            local activity_type="unknown"
-            case "$event_name" in
-                *"CREATE_USER"*|*"user_create"*) activity_type="user_create" ;;
-                *"SUSPEND_USER"*|*"user_suspend"*) activity_type="user_suspend" ;;
-                *"DELETE_USER"*|*"user_delete"*) activity_type="user_delete" ;;
-                *"GRANT_ADMIN"*|*"admin_grant"*) activity_type="privilege_grant" ;;
-                *"REVOKE_ADMIN"*|*"admin_revoke"*) activity_type="privilege_revoke" ;;
-                *"SETTINGS"*|*"settings"*) activity_type="settings_change" ;;
-                *"GROUP"*|*"group"*) activity_type="group_management" ;;
-                *"OU"*|*"org_unit"*) activity_type="ou_management" ;;
-                *) activity_type="other" ;;
-            esac
-            
-            # Determine privilege level (this could be enhanced with actual role checking)
-            local privilege_level="admin"
-            if [[ "$event_name" == *"SUPER_ADMIN"* ]]; then
-                privilege_level="super_admin"
-            fi
-            
-            # Store admin activity
-            execute_db "
-            INSERT INTO admin_activities (
-                admin_email, activity_time, activity_type, target_user, 
-                ip_address, privilege_level, session_id,
-                action_details
-            ) VALUES (
-                '$admin_email', '$activity_time', '$activity_type', 
-                '$(echo "$target_user" | tr "'" "''")' || '', '$ip_address', '$privilege_level', '$SESSION_ID',
-                json_object('event_name', '$event_name', 'raw_data', '$(echo "$time,$admin_email,$event_name,$target_user,$ip_address" | tr "'" "''")')
-            );"
-        done
-        
+    # Stream GAM7's admin audit report into admin_activities in batches, starting
+    # at the last ingested event
+    local total_admin_actions=0 privilege_changes=0
+    local ingest_counts
+    if ingest_counts=$(python3 "$ACTIVITY_INGEST" admin --db-path "$DB_PATH" --session-id "$SESSION_ID" \
+            --days-back "$days_back" --gam-path "$GAM"); then
+        IFS=$'\t' read -r total_admin_actions privilege_changes <<< "$ingest_counts"
         log_security "Admin activities scan completed" "INFO" "admin_scan"
     else
         log_security "Failed to retrieve admin reports from GAM" "WARNING" "admin_scan"
@@ -234,19 +126,8 @@ scan_admin_activities() {
     local end_time=$(date +%s)
     local duration=$((end_time - start_time))
     
-    # Update metrics
-    local total_admin_actions=$(execute_db "SELECT COUNT(*) FROM admin_activities WHERE session_id = '$SESSION_ID';")
-    local privilege_changes=$(execute_db "SELECT COUNT(*) FROM admin_activities WHERE activity_type IN ('privilege_grant', 'privilege_revoke') AND session_id = '$SESSION_ID';")
-    
-    execute_db "
-    INSERT OR REPLACE INTO security_metrics (metric_name, metric_value, metric_category, session_id, status)
-    VALUES 
-        ('Admin Actions (${days_back}d)', $total_admin_actions, 'admin', '$SESSION_ID', 'current'),
-        ('Privilege Changes (${days_back}d)', $privilege_changes, 'admin', '$SESSION_ID', 'current');
-    "
-    
     echo -e "${GREEN}✓ Admin activities scan completed${NC}"
-    echo "  Total admin actions: $total_admin_actions"
+    echo "  New admin actions: $total_admin_actions"
     echo "  Privilege changes: $privilege_changes"
     echo "  Duration: ${duration}s"
 }
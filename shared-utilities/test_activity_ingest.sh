@@ -0,0 +1,104 @@
+#!/bin/bash
+# Test incremental activity ingestion (python-modules/activity_ingest.py)
+#
+# Runs the ingester against a stub GAM that lists login events newest first,
+# as GAM and the Reports API do, and checks that:
+# - a scan whose source fails part way does not advance the high-water mark,
+#   so the next scan still fetches the older events
+# - an event gets the same id whether it comes from GAM or the Reports API
+#
+# Usage: ./shared-utilities/test_activity_ingest.sh
+
+failures=0
+
+echo "=== ACTIVITY INGESTION TESTING ==="
+
+cd "$(dirname "${BASH_SOURCE[0]}")/.." || exit 1
+INGEST="python-modules/activity_ingest.py"
+
+work_dir=$(mktemp -d)
+trap 'rm -rf "$work_dir"' EXIT
+db="$work_dir/test.db"
+
+pass() { echo "  ✓ $1"; }
+fail() { echo "  ❌ $1"; failures=$((failures + 1)); }
+
+# Stub GAM: four login events, newest first. With $work_dir/fail present it
+# prints the two newest and exits with an error, like a quota failure mid-report.
+cat > "$work_dir/gam" <<EOF
+#!/bin/bash
+echo "id.time,id.uniqueQualifier,id.applicationName,actor.email,ipAddress,name"
+echo "$(date -u -d '1 hour ago' +%Y-%m-%dT%H:%M:%S.000Z),101,login,alice@example.edu,10.0.0.1,login_success"
+echo "$(date -u -d '2 hours ago' +%Y-%m-%dT%H:%M:%S.000Z),102,login,bob@example.edu,10.0.0.2,login_success"
+if [[ -f "$work_dir/fail" ]]; then
+    echo "ERROR: 429: Quota exceeded" >&2
+    exit 1
+fi
+echo "$(date -u -d '2 days ago' +%Y-%m-%dT%H:%M:%S.000Z),103,login,carol@example.edu,203.0.113.7,login_failure"
+echo "$(date -u -d '3 days ago' +%Y-%m-%dT%H:%M:%S.000Z),104,login,dave@example.edu,10.0.0.4,login_success"
+EOF
+chmod +x "$work_dir/gam"
+
+json_field() {
+    python3 -c "import json, sys; print(json.load(sys.stdin).get('$1'))"
+}
+
+echo ""
+echo "Testing a source that fails part way..."
+touch "$work_dir/fail"
+# One event per batch, so the events before the failure are committed
+if python3 "$INGEST" login --db-path "$db" --gam-path "$work_dir/gam" --days-back 7 --batch-size 1 \
+        --output json >/dev/null 2>&1; then
+    fail "Failed GAM run reported success"
+else
+    pass "Failed GAM run reported an error"
+fi
+
+stored=$(sqlite3 "$db" "SELECT COUNT(*) FROM login_activities;")
+[[ "$stored" == "2" ]] && pass "Events read before the failure were stored" || fail "Expected 2 stored events, found $stored"
+
+mark=$(sqlite3 "$db" "SELECT last_event_time FROM activity_ingest_state WHERE application = 'login';")
+[[ -z "$mark" ]] && pass "High-water mark not advanced by the failed scan" || fail "High-water mark advanced to $mark"
+
+echo ""
+echo "Testing the scan after the failure..."
+rm -f "$work_dir/fail"
+result=$(python3 "$INGEST" login --db-path "$db" --gam-path "$work_dir/gam" --days-back 7 --output json 2>/dev/null)
+fetched_since=$(echo "$result" | json_field fetched_since)
+window_start=$(date -u -d '6 days ago' '+%Y-%m-%d %H:%M:%S')
+[[ "$fetched_since" < "$window_start" ]] && pass "Fetched the whole window ($fetched_since)" \
+    || fail "Fetched only from $fetched_since - older events would be lost"
+
+inserted=$(echo "$result" | json_field inserted)
+duplicates=$(echo "$result" | json_field duplicates)
+[[ "$inserted" == "2" && "$duplicates" == "2" ]] && pass "Inserted the 2 missing events, skipped 2 duplicates" \
+    || fail "Expected 2 inserted / 2 duplicates, got $inserted / $duplicates"
+
+mark=$(sqlite3 "$db" "SELECT last_event_time FROM activity_ingest_state WHERE application = 'login';")
+[[ -n "$mark" ]] && pass "High-water mark advanced to $mark" || fail "High-water mark not set after a successful scan"
+
+echo ""
+echo "Testing event ids across GAM and the Reports API..."
+same_id=$(cd python-modules && python3 -c "
+from activity_ingest import event_rows, IngestStats
+api = {'id': {'time': '2024-06-01T10:00:00.000Z', 'uniqueQualifier': '-42', 'applicationName': 'login'},
+       'actor': {'email': 'alice@example.edu', 'profileId': '7'}, 'ipAddress': '10.0.0.1',
+       'events': [{'name': 'login_success', 'parameters': [{'name': 'login_type', 'value': 'google_password'}]}]}
+gam = {'id.time': '2024-06-01T10:00:00Z', 'id.uniqueQualifier': '-42', 'id.applicationName': 'login',
+       'actor.email': 'alice@example.edu', 'actor.profileId': '7', 'ipAddress': '10.0.0.1',
+       'name': 'login_success', 'login_type': 'google_password'}
+ids = [next(event_rows('login', [record], 'test', IngestStats(application='login'))).event_id for record in (api, gam)]
+print(ids[0] == ids[1])
+" 2>&1)
+[[ "$same_id" == "True" ]] && pass "Same event_id from both sources" || fail "Different event_id per source: $same_id"
+
+echo ""
+if [[ $failures -eq 0 ]]; then
+    echo "✓ All activity ingestion checks passed"
+else
+    echo "❌ $failures activity ingestion check(s) failed"
+fi
+
+echo ""
+echo "=== ACTIVITY INGESTION TESTING COMPLETED ==="
+[[ $failures -eq 0 ]]
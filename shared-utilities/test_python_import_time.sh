@@ -0,0 +1,72 @@
+#!/bin/bash
+# Test Python module import cost for the bash bridge
+#
+# Every bridge action starts a fresh python3 process, so importing a module
+# must stay cheap. Fails if a module pulls in heavy optional dependencies at
+# import time or if its cumulative import time (python3 -X importtime)
+# exceeds the budget.
+#
+# Usage: ./shared-utilities/test_python_import_time.sh [budget_ms]
+
+IMPORT_BUDGET_MS="${1:-${IMPORT_BUDGET_MS:-150}}"
+HEAVY_MODULES="rich yaml googleapiclient google_auth_oauthlib pandas numpy"
+failures=0
+
+echo "=== PYTHON IMPORT TIME TESTING ==="
+echo "Budget: ${IMPORT_BUDGET_MS}ms cumulative per module"
+
+cd "$(dirname "${BASH_SOURCE[0]}")/.." || exit 1
+
+for module in python-modules python-modules.compliance_dashboard python-modules.scuba_compliance python-modules.gws_api python-modules.report_exporter python-modules.check_logic python-modules.gam_output python-modules.gam_runner python-modules.instrumentation python-modules.activity_ingest python-modules.account_sync python-modules.rate_limit python-modules.bulk_verify; do
+    echo ""
+    echo "Testing $module..."
+
+    # __import__ goes through the C import path, which -X importtime reports on
+    import_log=$(python3 -X importtime -c "__import__('$module')" 2>&1)
+    if [[ $? -ne 0 ]]; then
+        echo "  ❌ Import failed: $(echo "$import_log" | tail -1)"
+        failures=$((failures + 1))
+        continue
+    fi
+
+    cumulative_us=$(echo "$import_log" | awk -F'|' -v mod="$module" '
+        { name = $3; gsub(/^[ \t]+|[ \t]+$/, "", name) }
+        name == mod { gsub(/[ \t]/, "", $2); print $2 }' | tail -1)
+
+    if [[ -z "$cumulative_us" ]]; then
+        echo "  ⚠️  No import timing found for $module"
+    else
+        cumulative_ms=$((cumulative_us / 1000))
+        if [[ $cumulative_ms -le $IMPORT_BUDGET_MS ]]; then
+            echo "  ✓ Imported in ${cumulative_ms}ms"
+        else
+            echo "  ❌ Import took ${cumulative_ms}ms (budget ${IMPORT_BUDGET_MS}ms)"
+            failures=$((failures + 1))
+        fi
+    fi
+
+    # Heavy optional dependencies must only be imported when actually used
+    heavy_loaded=$(python3 -c "
+import sys
+__import__('$module')
+loaded = sorted(set(name.split('.')[0] for name in sys.modules) & set('$HEAVY_MODULES'.split()))
+print(' '.join(loaded))
+" 2>/dev/null)
+    if [[ -z "$heavy_loaded" ]]; then
+        echo "  ✓ No heavy dependencies imported"
+    else
+        echo "  ❌ Heavy dependencies imported at module load: $heavy_loaded"
+        failures=$((failures + 1))
+    fi
+done
+
+echo ""
+if [[ $failures -eq 0 ]]; then
+    echo "✓ All modules within import budget"
+else
+    echo "❌ $failures import budget check(s) failed"
+fi
+
+echo ""
+echo "=== PYTHON IMPORT TIME TESTING COMPLETED ==="
+[[ $failures -eq 0 ]]